@@ -1,28 +1,62 @@
 """Initialisierung der Schulferien und Feiertags-Integration."""
 
 import logging
+from .brueckentage import async_lade_brueckentage
+from .cache import async_hole_cache
 from .const import DOMAIN
+from .coordinator import async_hole_coordinator, async_gib_coordinator_frei
+from .ics import async_registriere_ics_view, async_sichere_ics_token
+from .services import async_entferne_dienste, async_registriere_dienste
 
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORMS = ["sensor", "binary_sensor", "calendar"]
+
 async def async_setup_entry(hass, entry):
     """Set up Schulferien from a config entry."""
     _LOGGER.debug("Setting up Schulferien entry: %s", entry.title)
 
-    # Registriere den Binary Sensor zusätzlich
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "binary_sensor"])
+    # Brückentage laden, unveränderte Dateien kommen aus dem Zwischenspeicher
+    brueckentage = await async_lade_brueckentage(hass)
+
+    # Gemeinsamen Coordinator für (Land, Region, Sprache) holen oder anlegen
+    cache = await async_hole_cache(hass)
+    coordinator = async_hole_coordinator(hass, entry, brueckentage, cache)
+
+    # Mit gespeicherten Daten sofort starten und im Hintergrund revalidieren
+    if coordinator.async_lade_aus_cache():
+        hass.async_create_task(coordinator.async_refresh())
+    else:
+        await coordinator.async_refresh()
+
+    # Sensoren, Binärsensoren und Kalender einrichten
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    async_registriere_dienste(hass)
+    # iCalendar-Feed unter /api/schulferien/<entry_id>/<token>.ics
+    async_sichere_ics_token(hass, entry)
+    async_registriere_ics_view(hass)
+    entry.async_on_unload(entry.add_update_listener(async_optionen_geaendert))
 
     return True
 
+async def async_optionen_geaendert(hass, entry):
+    """Übernimmt geänderte Optionen, nur eine längere Vorausschau löst einen Abruf aus.
+
+    Teilen sich mehrere Entries einen Standort, gilt jeweils die umfassendere
+    Einstellung aller Entries, siehe fuehre_optionen_zusammen.
+    """
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is not None:
+        coordinator.async_setze_eintrag_optionen(entry.entry_id, entry.options)
+
 async def async_unload_entry(hass, entry):
     """Unload a config entry."""
     _LOGGER.debug("Unloading Schulferien entry: %s", entry.title)
 
-    # Lade sowohl Sensor als auch Binary Sensor
-    unload_sensors = await hass.config_entries.async_forward_entry_unload(entry, "sensor")
-    unload_binary_sensors = await hass.config_entries.async_forward_entry_unload(
-        entry, "binary_sensor"
-    )
-
-    # Beide müssen erfolgreich sein
-    return unload_sensors and unload_binary_sensors
+    # Alle Plattformen müssen erfolgreich entladen werden
+    if await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        async_gib_coordinator_frei(hass, entry)
+        async_entferne_dienste(hass)
+        return True
+    return False
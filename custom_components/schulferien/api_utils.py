@@ -1,24 +1,217 @@
 """API-Hilfsfunktionen für die Schulferien-Integration."""
 
+import asyncio
+import codecs
+import json
 import logging
-from datetime import datetime
+import random
+import sys
+import time
+from contextlib import nullcontext
+from datetime import date, datetime
 import aiohttp
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from yarl import URL
+
+from .const import (
+    BRUECKENTAG_NAME,
+    DOMAIN,
+    SCHUTZSCHALTER_PAUSE,
+    SCHUTZSCHALTER_SCHWELLE,
+    STREAM_BLOCKGROESSE,
+    WIEDERHOLUNG_BASIS,
+    WIEDERHOLUNG_MAXIMUM,
+    WIEDERHOLUNG_VERSUCHE,
+)
+from .ferien_index import Zeitraum
+from .messwerte import ABRUF
 
 _LOGGER = logging.getLogger(__name__)
 
 # Timeout-Konfiguration
 DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5, sock_read=5)
 
+# Felder eines API-Eintrags, die die Integration auswertet
+BENOETIGTE_FELDER = ("id", "startDate", "endDate", "name", "nationwide", "subdivisions")
+
+
+class VerbindungsZaehler:
+    """Zählt HTTP-Anfragen und dafür neu aufgebaute Verbindungen einer Session.
+
+    Liegt die Zahl der Verbindungen deutlich unter der Zahl der Anfragen,
+    werden Verbindungen (inklusive TLS-Handshake) aus dem Pool wiederverwendet.
+    """
+
+    def __init__(self):
+        """Initialisiert die Zähler und die zugehörige aiohttp TraceConfig."""
+        self.anfragen = 0
+        self.verbindungen = 0
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._bei_anfrage)
+        self.trace_config.on_connection_create_end.append(self._bei_verbindung)
+
+    async def _bei_anfrage(self, _session, _kontext, _parameter):
+        """Zählt eine gestartete Anfrage."""
+        self.anfragen += 1
+
+    async def _bei_verbindung(self, _session, _kontext, _parameter):
+        """Zählt eine neu aufgebaute Verbindung."""
+        self.verbindungen += 1
+
+    def als_dict(self):
+        """Gibt die Zählerstände zurück."""
+        return {
+            "anfragen": self.anfragen,
+            "verbindungen": self.verbindungen,
+            "wiederverwendet": max(self.anfragen - self.verbindungen, 0),
+        }
+
+
+def async_hole_session(hass) -> aiohttp.ClientSession:
+    """Gibt die integrationsweite Session auf dem Verbindungspool von Home Assistant zurück.
+
+    Die Session nutzt denselben Connector wie async_get_clientsession(hass),
+    sodass Keep-Alive-Verbindungen über alle Abrufe hinweg wiederverwendet
+    werden. Eine eigene Session ist nur nötig, um den VerbindungsZaehler
+    als TraceConfig einzuhängen.
+    """
+    domain_daten = hass.data.setdefault(DOMAIN, {})
+    session = domain_daten.get("session")
+    if session is None:
+        zaehler = VerbindungsZaehler()
+        session = async_create_clientsession(
+            hass,
+            auto_cleanup=False,
+            timeout=DEFAULT_TIMEOUT,
+            trace_configs=[zaehler.trace_config],
+        )
+        domain_daten["session"] = session
+        domain_daten["verbindungen"] = zaehler
+    return session
+
+
+class Schutzschalter:
+    """Circuit Breaker für einen API-Host.
+
+    Nach SCHUTZSCHALTER_SCHWELLE Fehlern in Folge öffnet der Schalter und
+    blockiert alle Anfragen an den Host. Nach SCHUTZSCHALTER_PAUSE Sekunden
+    ist er halboffen: genau eine Anfrage darf als Probe durch, alle weiteren
+    werden abgewiesen, bis die Probe gemeldet ist. Erfolg schließt den
+    Schalter wieder, ein erneuter Fehler öffnet ihn sofort.
+    """
+
+    GESCHLOSSEN = "geschlossen"
+    OFFEN = "offen"
+    HALBOFFEN = "halboffen"
+
+    def __init__(self, host, schwelle=SCHUTZSCHALTER_SCHWELLE, pause=SCHUTZSCHALTER_PAUSE):
+        """Initialisiert den Schutzschalter im geschlossenen Zustand."""
+        self.host = host
+        self._schwelle = schwelle
+        self._pause = pause
+        self.fehler_in_folge = 0
+        self._geoeffnet_um = None
+        self._probe_laeuft = False
+
+    @property
+    def zustand(self):
+        """Gibt den aktuellen Zustand des Schutzschalters zurück."""
+        if self._geoeffnet_um is None:
+            return self.GESCHLOSSEN
+        if time.monotonic() - self._geoeffnet_um >= self._pause:
+            return self.HALBOFFEN
+        return self.OFFEN
+
+    def erlaubt(self):
+        """Prüft, ob eine Anfrage an den Host gestellt werden darf.
+
+        Im halboffenen Zustand wird nur die erste Anfrage als Probe
+        zugelassen. Ihr Ergebnis muss mit melde_erfolg, melde_fehler oder
+        gib_probe_frei gemeldet werden.
+        """
+        zustand = self.zustand
+        if zustand == self.OFFEN:
+            return False
+        if zustand == self.HALBOFFEN:
+            if self._probe_laeuft:
+                return False
+            self._probe_laeuft = True
+        return True
+
+    def gib_probe_frei(self):
+        """Beendet eine Probe, deren Ergebnis nichts über den Host aussagt (z.B. 404, Abbruch)."""
+        self._probe_laeuft = False
+
+    def melde_erfolg(self):
+        """Schließt den Schutzschalter nach einer erfolgreichen Anfrage."""
+        if self._geoeffnet_um is not None:
+            _LOGGER.info("Schutzschalter für %s wieder geschlossen.", self.host)
+        self.fehler_in_folge = 0
+        self._geoeffnet_um = None
+        self._probe_laeuft = False
+
+    def melde_fehler(self):
+        """Zählt einen Fehler und öffnet den Schutzschalter bei Bedarf."""
+        self._probe_laeuft = False
+        self.fehler_in_folge += 1
+        if self.zustand == self.HALBOFFEN or self.fehler_in_folge >= self._schwelle:
+            if self._geoeffnet_um is None:
+                _LOGGER.warning(
+                    "Schutzschalter für %s geöffnet nach %d Fehlern in Folge.",
+                    self.host, self.fehler_in_folge,
+                )
+            self._geoeffnet_um = time.monotonic()
+
+
+def async_hole_schutzschalter(hass, api_url) -> Schutzschalter:
+    """Gibt den gemeinsamen Schutzschalter für den Host der URL zurück."""
+    host = URL(api_url).host
+    alle = hass.data.setdefault(DOMAIN, {}).setdefault("schutzschalter", {})
+    if host not in alle:
+        alle[host] = Schutzschalter(host)
+    return alle[host]
+
+
+def berechne_wartezeit(versuch, basis=WIEDERHOLUNG_BASIS, maximum=WIEDERHOLUNG_MAXIMUM):
+    """Gibt die Wartezeit vor dem nächsten Versuch zurück (Full Jitter)."""
+    return random.uniform(0, min(maximum, basis * 2 ** (versuch - 1)))
+
+
+def async_gib_session_frei(hass):
+    """Löst die integrationsweite Session vom Verbindungspool."""
+    session = hass.data.get(DOMAIN, {}).pop("session", None)
+    if session is not None:
+        session.detach()
+
+
 async def fetch_data(
-    api_url: str, api_parameter: dict, session: aiohttp.ClientSession = None
+    api_url: str,
+    api_parameter: dict,
+    session: aiohttp.ClientSession = None,
+    cache=None,
+    schutzschalter: Schutzschalter = None,
+    versuche: int = WIEDERHOLUNG_VERSUCHE,
+    messwerte=None,
+    bedingt: bool = True,
 ) -> dict:
     """
     Ruft Daten von der API ab.
 
+    Liegt im Cache bereits eine Antwort für dieselbe Anfrage, wird sie mit
+    If-None-Match / If-Modified-Since revalidiert. Ein 304 gilt als Cache-Treffer.
+    Netzwerk-, Timeout- und Serverfehler werden mit exponentiell wachsender,
+    zufällig gestreuter Wartezeit wiederholt, solange der Schutzschalter es erlaubt.
+
     Args:
         api_url (str): API-URL.
         api_parameter (dict): Anfrageparameter.
-        session (aiohttp.ClientSession, optional): Bestehende Session.
+        session (aiohttp.ClientSession): Session aus async_hole_session.
+        cache (AntwortCache, optional): Persistenter Antwort-Cache.
+        schutzschalter (Schutzschalter, optional): Circuit Breaker des Hosts.
+        versuche (int): Maximale Anzahl an Versuchen.
+        messwerte (Messwerte, optional): Erfasst Laufzeit, Bytes und Cache-Treffer.
+        bedingt (bool): Ohne bedingte Anfrage wird die Antwort immer vollständig
+            geladen und geparst, der Cache wird danach trotzdem aktualisiert.
 
     Returns:
         dict: Die empfangenen JSON-Daten oder leeres Dict bei Fehlern.
@@ -26,56 +219,277 @@ async def fetch_data(
     if not isinstance(api_url, str) or not api_url:
         raise ValueError(f"Ungültige API-URL: {api_url}")
 
-    close_session = False
     if session is None:
-        session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
-        close_session = True
+        raise ValueError("Keine Session für den API-Aufruf übergeben.")
 
-    try:
-        async with session.get(
-            api_url,
-            params=api_parameter,
-            headers={"Accept": "application/json"}
-        ) as response:
-            response.raise_for_status()
-            return await response.json()
-    
-    except aiohttp.ClientResponseError as error:
-        _LOGGER.error(
-            "API Fehler: Status %s, URL: %s, Nachricht: %s",
-            error.status, error.request_info.url, error.message
+    messung = nullcontext() if messwerte is None else messwerte.messe(ABRUF)
+    with messung:
+        return await _fetch_mit_wiederholung(
+            api_url, api_parameter, session, cache, schutzschalter, versuche, messwerte, bedingt
         )
-    except aiohttp.ClientConnectionError as error:
-        _LOGGER.error("Verbindungsfehler zur API: %s", error)
-    except aiohttp.ClientTimeout as error:
-        _LOGGER.error("API-Anfrage hat zu lange gedauert: %s", error)
-    except aiohttp.ClientError as error:
-        _LOGGER.error("Allgemeiner Client-Fehler beim API-Aufruf: %s", error)
-    except ValueError as error:
-        _LOGGER.error("Fehler beim Parsen der API-Antwort: %s", error)
-    finally:
-        if close_session:
-            await session.close()
-            _LOGGER.debug("Die API-Session wurde geschlossen.")
+
+
+async def _fetch_mit_wiederholung(
+    api_url, api_parameter, session, cache, schutzschalter, versuche, messwerte, bedingt
+):
+    """Wiederholt _fetch_einmal nach Fehlern, siehe fetch_data."""
+    for versuch in range(1, versuche + 1):
+        if schutzschalter is not None and not schutzschalter.erlaubt():
+            _LOGGER.warning(
+                "Schutzschalter für %s ist offen, Anfrage an %s übersprungen.",
+                schutzschalter.host, api_url,
+            )
+            return {}
+
+        wiederholbar = True
+        try:
+            daten = await _fetch_einmal(
+                api_url, api_parameter, session, cache, messwerte, bedingt
+            )
+        except asyncio.CancelledError:
+            # Abgebrochen (z.B. vom Hedging): eine laufende Probe darf nicht hängen bleiben
+            if schutzschalter is not None:
+                schutzschalter.gib_probe_frei()
+            raise
+        except aiohttp.ClientResponseError as error:
+            _LOGGER.error(
+                "API Fehler: Status %s, URL: %s, Nachricht: %s",
+                error.status, error.request_info.url, error.message
+            )
+            wiederholbar = error.status >= 500 or error.status == 429
+        except aiohttp.ClientConnectionError as error:
+            _LOGGER.error("Verbindungsfehler zur API: %s", error)
+        except asyncio.TimeoutError as error:
+            _LOGGER.error("API-Anfrage hat zu lange gedauert: %s", error)
+        except aiohttp.ClientError as error:
+            _LOGGER.error("Allgemeiner Client-Fehler beim API-Aufruf: %s", error)
+        except ValueError as error:
+            _LOGGER.error("Fehler beim Parsen der API-Antwort: %s", error)
+            wiederholbar = False
+        else:
+            if schutzschalter is not None:
+                schutzschalter.melde_erfolg()
+            return daten
+
+        if schutzschalter is not None:
+            # Nur Netzwerkfehler, Timeouts, 5xx und 429 sprechen gegen den Host,
+            # ein 4xx oder eine unlesbare Antwort betrifft nur diese Anfrage
+            if wiederholbar:
+                schutzschalter.melde_fehler()
+            else:
+                schutzschalter.gib_probe_frei()
+        if not wiederholbar or versuch == versuche:
+            break
+
+        wartezeit = berechne_wartezeit(versuch)
+        _LOGGER.debug(
+            "Versuch %d/%d für %s fehlgeschlagen, neuer Versuch in %.1f s",
+            versuch, versuche, api_url, wartezeit,
+        )
+        await asyncio.sleep(wartezeit)
 
     return {}
 
-def parse_daten(json_daten, brueckentage=None, typ="ferien"):
+
+async def _fetch_einmal(api_url, api_parameter, session, cache, messwerte=None, bedingt=True):
+    """Führt eine einzelne (bedingte) Anfrage aus und wirft Fehler weiter."""
+    headers = {"Accept": "application/json"}
+    eintrag = cache.hole(api_url, api_parameter) if cache and bedingt else None
+    if eintrag:
+        if eintrag.get("etag"):
+            headers["If-None-Match"] = eintrag["etag"]
+        if eintrag.get("last_modified"):
+            headers["If-Modified-Since"] = eintrag["last_modified"]
+
+    async with session.get(
+        api_url,
+        params=api_parameter,
+        headers=headers,
+        timeout=DEFAULT_TIMEOUT,
+    ) as response:
+        if response.status == 304 and eintrag:
+            _LOGGER.debug("Daten unverändert (304), verwende Cache für %s", api_url)
+            if messwerte is not None:
+                messwerte.melde_cache(treffer=True)
+            cache.speichere(
+                api_url,
+                api_parameter,
+                eintrag["daten"],
+                etag=eintrag.get("etag"),
+                last_modified=eintrag.get("last_modified"),
+            )
+            return eintrag["daten"]
+
+        response.raise_for_status()
+        if messwerte is not None and cache:
+            messwerte.melde_cache(treffer=False)
+        daten = await lese_json(response, messwerte=messwerte)
+        if cache and daten:
+            cache.speichere(
+                api_url,
+                api_parameter,
+                daten,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return daten
+
+class JsonListenLeser:
+    """Parst ein JSON-Array blockweise und gibt fertige Elemente sofort zurück.
+
+    Jedes Element wird direkt nach dem Parsen durch ``umwandeln`` geschickt,
+    sodass weder der vollständige Text noch der vollständige Objektbaum der
+    Antwort gleichzeitig im Speicher liegen. Ist das Dokument kein Array
+    (z.B. ein Fehlerobjekt), wird es am Ende vollständig geparst und in
+    ``wert`` abgelegt.
     """
-    Verarbeitet die JSON-Daten und fügt Brückentage oder Feiertage hinzu.
 
-    Args:
-        json_daten (dict): JSON-Daten von der API.
-        brueckentage (list, optional): Brückentage.
-        typ (str): Datentyp ("ferien" oder "feiertage").
+    _START = "start"
+    _ELEMENT = "element"
+    _ELEMENT_ODER_ENDE = "element_oder_ende"
+    _TRENNER = "trenner"
+    _ENDE = "ende"
+    _KEIN_ARRAY = "kein_array"
+    # Zeichen, die eine Zahl innerhalb des Arrays abschließen
+    _NACH_ZAHL = " \t\r\n,]"
 
-    Returns:
-        list: Verarbeitete Daten.
+    def __init__(self, umwandeln=None):
+        """Initialisiert den Leser mit einer optionalen Umwandlung pro Element."""
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._umwandeln = umwandeln
+        self._puffer = ""
+        self._zustand = self._START
+        self.wert = None
+
+    def fuettere(self, block):
+        """Verarbeitet einen Block Bytes und gibt alle darin abgeschlossenen Elemente zurück."""
+        self._puffer += self._utf8.decode(block)
+        return self._verarbeite(final=False)
+
+    def beende(self):
+        """Verarbeitet den Rest der Antwort.
+
+        Raises:
+            ValueError: Wenn das Dokument unvollständig oder ungültig ist.
+        """
+        self._puffer += self._utf8.decode(b"", final=True)
+        elemente = self._verarbeite(final=True)
+        if self._zustand == self._KEIN_ARRAY:
+            self.wert = json.loads(self._puffer)
+        elif self._zustand not in (self._ENDE, self._START):
+            raise ValueError("Unvollständiges JSON-Array erhalten.")
+        self._puffer = ""
+        return elemente
+
+    def _verarbeite(self, final):
+        """Parst so viele Elemente wie möglich aus dem Puffer."""
+        puffer = self._puffer
+        laenge = len(puffer)
+        position = 0
+        elemente = []
+        while self._zustand != self._KEIN_ARRAY:
+            while position < laenge and puffer[position] in " \t\r\n":
+                position += 1
+            if position >= laenge:
+                break
+            zeichen = puffer[position]
+
+            if self._zustand == self._START:
+                if zeichen != "[":
+                    self._zustand = self._KEIN_ARRAY
+                    break
+                self._zustand = self._ELEMENT_ODER_ENDE
+                position += 1
+            elif self._zustand == self._TRENNER:
+                if zeichen == ",":
+                    self._zustand = self._ELEMENT
+                elif zeichen == "]":
+                    self._zustand = self._ENDE
+                else:
+                    raise ValueError(f"Unerwartetes Zeichen {zeichen!r} im JSON-Array.")
+                position += 1
+            elif self._zustand == self._ENDE:
+                raise ValueError("Unerwartete Daten nach dem JSON-Array.")
+            elif self._zustand == self._ELEMENT_ODER_ENDE and zeichen == "]":
+                self._zustand = self._ENDE
+                position += 1
+            else:
+                try:
+                    element, ende = self._decoder.raw_decode(puffer, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                if not final and (ende >= laenge or (
+                    isinstance(element, (int, float)) and puffer[ende] not in self._NACH_ZAHL
+                )):
+                    # Eine Zahl ist erst vor einem Trennzeichen vollständig,
+                    # "123." oder "1e" am Blockende gehen im nächsten Block weiter
+                    break
+                if self._umwandeln is not None:
+                    element = self._umwandeln(element)
+                elemente.append(element)
+                self._zustand = self._TRENNER
+                position = ende
+
+        if self._zustand != self._KEIN_ARRAY:
+            self._puffer = puffer[position:]
+        return elemente
+
+
+def verschlanke_eintrag(eintrag):
+    """Reduziert einen API-Eintrag auf die Felder in BENOETIGTE_FELDER.
+
+    Vom Namen bleibt nur die erste Übersetzung, die parse_daten verwendet.
+    Häufig wiederholte Werte (Datumsangaben, Codes) werden interniert.
+    """
+    if not isinstance(eintrag, dict):
+        return eintrag
+    schlank = {feld: eintrag[feld] for feld in BENOETIGTE_FELDER if feld in eintrag}
+    for feld in ("startDate", "endDate"):
+        if isinstance(schlank.get(feld), str):
+            schlank[feld] = sys.intern(schlank[feld])
+    if isinstance(schlank.get("name"), list):
+        schlank["name"] = schlank["name"][:1]
+    if isinstance(schlank.get("subdivisions"), list):
+        schlank["subdivisions"] = [
+            {"code": sys.intern(unterteilung["code"])}
+            for unterteilung in schlank["subdivisions"]
+            if isinstance(unterteilung, dict) and isinstance(unterteilung.get("code"), str)
+        ]
+    return schlank
+
+
+async def lese_json(response, blockgroesse=STREAM_BLOCKGROESSE, messwerte=None):
+    """Liest eine JSON-Antwort blockweise statt mit response.json().
+
+    Arrays werden Element für Element geparst und auf BENOETIGTE_FELDER
+    reduziert, andere Dokumente unverändert zurückgegeben. Mit messwerte
+    werden die empfangenen Bytes gezählt.
+    """
+    leser = JsonListenLeser(verschlanke_eintrag)
+    eintraege = []
+    async for block in response.content.iter_chunked(blockgroesse):
+        if messwerte is not None:
+            messwerte.zaehle_bytes(len(block))
+        eintraege.extend(leser.fuettere(block))
+    eintraege.extend(leser.beende())
+    if leser.wert is not None:
+        return leser.wert
+    return eintraege
+
+
+def iter_daten(json_daten, brueckentage=None, typ="ferien"):
+    """Wie parse_daten, liefert die Zeiträume aber einzeln.
+
+    So kann z.B. der FerienIndex direkt befüllt werden, ohne vorher eine
+    zusätzliche Liste aufzubauen.
     """
     if not isinstance(json_daten, list):
         raise ValueError("Ungültige JSON-Datenstruktur erhalten.")
 
-    liste = []
+    anzahl = 0
     try:
         for eintrag in json_daten:
             if "startDate" not in eintrag or "endDate" not in eintrag:
@@ -83,27 +497,45 @@ def parse_daten(json_daten, brueckentage=None, typ="ferien"):
                 continue
 
             name = eintrag.get("name", [{"text": "Unbekannt"}])[0]["text"]
-            liste.append({
-                "name": name,
-                "start_datum": datetime.fromisoformat(eintrag["startDate"]).date(),
-                "end_datum": datetime.fromisoformat(eintrag["endDate"]).date(),
-            })
+            anzahl += 1
+            yield Zeitraum(
+                name,
+                datetime.fromisoformat(eintrag["startDate"]).date(),
+                datetime.fromisoformat(eintrag["endDate"]).date(),
+            )
 
         if typ == "ferien" and brueckentage:
             for tag in brueckentage:
-                try:
-                    datum = datetime.strptime(tag, "%d.%m.%Y").date()
-                    liste.append({
-                        "name": "Brückentag",
-                        "start_datum": datum,
-                        "end_datum": datum,
-                    })
-                except ValueError:
-                    _LOGGER.warning("Ungültiges Brückentagsformat: %s", tag)
-
-        _LOGGER.debug("JSON-Daten verarbeitet: %d Einträge", len(liste))
-        return liste
+                if isinstance(tag, date):
+                    datum = tag
+                else:
+                    try:
+                        datum = datetime.strptime(tag, "%d.%m.%Y").date()
+                    except ValueError:
+                        _LOGGER.warning("Ungültiges Brückentagsformat: %s", tag)
+                        continue
+                anzahl += 1
+                yield Zeitraum(BRUECKENTAG_NAME, datum, datum)
+
+        _LOGGER.debug("JSON-Daten verarbeitet: %d Einträge", anzahl)
 
     except (KeyError, ValueError, IndexError, TypeError) as error:
         _LOGGER.error("Fehler beim Verarbeiten der JSON-Daten: %s", error)
         raise RuntimeError("Ungültige JSON-Daten erhalten.") from error
+
+
+def parse_daten(json_daten, brueckentage=None, typ="ferien"):
+    """
+    Verarbeitet die JSON-Daten und fügt Brückentage oder Feiertage hinzu.
+
+    Args:
+        json_daten (dict): JSON-Daten von der API.
+        brueckentage (list, optional): Brückentage als date oder "TT.MM.JJJJ".
+        typ (str): Datentyp ("ferien" oder "feiertage").
+
+    Returns:
+        list: Zeitraum-Objekte, Brückentage als eintägige Zeiträume.
+    """
+    if not isinstance(json_daten, list):
+        raise ValueError("Ungültige JSON-Datenstruktur erhalten.")
+    return list(iter_daten(json_daten, brueckentage, typ))
@@ -0,0 +1,36 @@
+"""Zwischengespeicherte Statusattribute für die Sensoren des gemeinsamen Coordinators."""
+
+from homeassistant.util import dt as dt_util
+
+
+class ZwischengespeicherteAttribute:
+    """Mixin, das extra_state_attributes nur bei Bedarf neu aufbaut.
+
+    Die Attribute werden neu aufgebaut, wenn sich Datenstand, Tag oder
+    Zustand des Schutzschalters geändert haben oder verwerfe_attribute
+    aufgerufen wurde. Die Klasse braucht ein Attribut coordinator und
+    implementiert _baue_attribute(heute).
+    """
+
+    # Gemeinsamer SchulferienCoordinator, wird von der Sensorklasse gesetzt
+    coordinator = None
+    _attribute = None
+    _attribute_schluessel = None
+
+    @property
+    def extra_state_attributes(self):
+        """Gibt zusätzliche Statusattribute des Sensors zurück."""
+        heute = dt_util.now().date()
+        schluessel = (self.coordinator.datenversion, heute, self.coordinator.api_zustand)
+        if schluessel != self._attribute_schluessel:
+            self._attribute = self._baue_attribute(heute)
+            self._attribute_schluessel = schluessel
+        return self._attribute
+
+    def verwerfe_attribute(self):
+        """Erzwingt den Neuaufbau der Attribute beim nächsten Zugriff."""
+        self._attribute_schluessel = None
+
+    def _baue_attribute(self, heute):
+        """Baut die Statusattribute für einen Tag auf."""
+        raise NotImplementedError
@@ -1,5 +1,11 @@
 import logging
+from datetime import timedelta
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorEntityDescription
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .tageskalender import SCHULFERIEN, FEIERTAG
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -13,16 +19,17 @@ SCHULFERIEN_FEIERTAG_BINARY_SENSOR = BinarySensorEntityDescription(
 class SchulferienFeiertagBinarySensor(BinarySensorEntity):
     """Kombinierter Binärsensor für Schulferien und Feiertage."""
 
-    def __init__(self, hass, config):
+    _attr_should_poll = False
+
+    # Abstand des betrachteten Tages zu heute
+    _tage_voraus = 0
+
+    def __init__(self, coordinator, config):
         """Initialisiert den kombinierten Binärsensor mit Konfigurationsdaten."""
         self.entity_description = SCHULFERIEN_FEIERTAG_BINARY_SENSOR
-        self._hass = hass
+        self.coordinator = coordinator
         self._unique_id = config.get("unique_id", "binary_sensor.schulferien_feiertage")
-        self._entity_ids = {
-            "schulferien": config["schulferien_entity_id"],
-            "feiertag": config["feiertag_entity_id"],
-        }
-        self._state = False
+        self._state = self._berechne_zustand()
 
     @property
     def unique_id(self):
@@ -34,15 +41,29 @@ class SchulferienFeiertagBinarySensor(BinarySensorEntity):
         """Gibt den aktuellen Zustand des Sensors zurück."""
         return self._state
 
-    async def async_update(self):
-        """Kombiniert die Zustände der Schulferien- und Feiertag-Sensoren."""
-        schulferien_state = self._hass.states.get(self._entity_ids["schulferien"])
-        feiertag_state = self._hass.states.get(self._entity_ids["feiertag"])
+    def _berechne_zustand(self):
+        """Prüft im Tageskalender, ob der Tag ein Ferien- oder Feiertag ist."""
+        datum = dt_util.now().date() + timedelta(days=self._tage_voraus)
+        return self.coordinator.data["tageskalender"].hat(datum, SCHULFERIEN | FEIERTAG)
 
-        self._state = (
-            (schulferien_state and schulferien_state.state == "ferientag") or
-            (feiertag_state and feiertag_state.state == "feiertag")
+    async def async_added_to_hass(self):
+        """Registriert den Sensor beim gemeinsamen Coordinator."""
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
         )
+        self._state = self._berechne_zustand()
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Schreibt den Zustand nur, wenn sich der kombinierte Wert geändert hat."""
+        zustand = self._berechne_zustand()
+        if zustand != self._state:
+            self._state = zustand
+            self.async_write_ha_state()
+
+    async def async_update(self):
+        """Berechnet den Zustand aus dem Tageskalender neu."""
+        self._state = self._berechne_zustand()
 
 
 # Neue EntityDescription für den morgigen Tag
@@ -52,58 +73,34 @@ SCHULFERIEN_FEIERTAG_MORGEN_BINARY_SENSOR = BinarySensorEntityDescription(
     translation_key="schulferien_feiertag_morgen",
 )
 
-class SchulferienFeiertagMorgenBinarySensor(BinarySensorEntity):
+class SchulferienFeiertagMorgenBinarySensor(SchulferienFeiertagBinarySensor):
     """Kombinierter Binärsensor für Schulferien und Feiertage am nächsten Tag."""
 
-    def __init__(self, hass, config):
+    _tage_voraus = 1
+
+    def __init__(self, coordinator, config):
         """Initialisiert den morgigen Binärsensor mit Konfigurationsdaten."""
+        super().__init__(coordinator, config)
         self.entity_description = SCHULFERIEN_FEIERTAG_MORGEN_BINARY_SENSOR
-        self._hass = hass
         self._unique_id = config.get("unique_id", "binary_sensor.schulferien_feiertage_morgen")
-        self._entity_ids = {
-            "schulferien": config["schulferien_entity_id"],
-            "feiertag": config["feiertag_entity_id"],
-        }
-        self._state = False
-
-    @property
-    def unique_id(self):
-        """Gibt die eindeutige ID des Sensors zurück."""
-        return self._unique_id
-
-    @property
-    def is_on(self):
-        """Gibt den aktuellen Zustand des Sensors zurück."""
-        return self._state
-
-    async def async_update(self):
-        """Kombiniert die morgigen Zustände der Schulferien- und Feiertag-Sensoren."""
-        schulferien_state = self._hass.states.get(self._entity_ids["schulferien"])
-        feiertag_state = self._hass.states.get(self._entity_ids["feiertag"])
-
-        self._state = (
-            (schulferien_state and schulferien_state.state == "ferientag") or
-            (feiertag_state and feiertag_state.state == "feiertag")
-        )
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Setze die kombinierten Binary Sensoren für Schulferien und Feiertage (heute und morgen) auf."""
     _LOGGER.debug("Initialisiere kombinierte Binärsensoren für Schulferien und Feiertage.")
 
+    # Gemeinsamer Coordinator aus __init__.async_setup_entry
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
     config_heute = {
-        "schulferien_entity_id": "sensor.schulferien",
-        "feiertag_entity_id": "sensor.feiertag",
         "unique_id": "binary_sensor.schulferien_feiertage"
     }
 
     config_morgen = {
-        "schulferien_entity_id": "sensor.schulferien_morgen",
-        "feiertag_entity_id": "sensor.feiertag_morgen",
         "unique_id": "binary_sensor.schulferien_feiertage_morgen"
     }
 
-    heute_sensor = SchulferienFeiertagBinarySensor(hass, config_heute)
-    morgen_sensor = SchulferienFeiertagMorgenBinarySensor(hass, config_morgen)
+    heute_sensor = SchulferienFeiertagBinarySensor(coordinator, config_heute)
+    morgen_sensor = SchulferienFeiertagMorgenBinarySensor(coordinator, config_morgen)
 
     async_add_entities([heute_sensor, morgen_sensor])
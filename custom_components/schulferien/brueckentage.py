@@ -0,0 +1,105 @@
+"""Laden der Brückentage aus bridge_days.yaml mit Zwischenspeicher nach Änderungszeit."""
+
+import logging
+import os
+from datetime import datetime
+
+import yaml
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Pfad relativ zum Konfigurationsverzeichnis von Home Assistant
+BRUECKENTAGE_DATEI = "custom_components/schulferien/bridge_days.yaml"
+
+# Markiert eine Datei, deren Änderungszeit noch nicht bekannt ist
+_UNBEKANNT = object()
+
+
+def lese_brueckentage(pfad):
+    """Liest und prüft die Brückentage einer YAML-Datei (blockierend).
+
+    Returns:
+        list: Sortierte, eindeutige date-Objekte. Ungültige Einträge werden
+            mit einer Warnung übersprungen, fehlende oder fehlerhafte
+            Dateien ergeben eine leere Liste.
+    """
+    try:
+        with open(pfad, "r", encoding="utf-8") as datei:
+            inhalt = datei.read()
+        konfiguration = yaml.safe_load(inhalt) if inhalt else None
+    except FileNotFoundError:
+        _LOGGER.warning("Die Datei bridge_days.yaml wurde nicht gefunden.")
+        return []
+    except yaml.YAMLError as error:
+        _LOGGER.error("Fehler beim Laden der Brückentage: %s", error)
+        return []
+
+    if not isinstance(konfiguration, dict):
+        return []
+
+    tage = set()
+    for eintrag in konfiguration.get("bridge_days") or []:
+        try:
+            tage.add(datetime.strptime(str(eintrag), "%d.%m.%Y").date())
+        except ValueError:
+            _LOGGER.warning("Ungültiges Brückentagsformat: %s", eintrag)
+    return sorted(tage)
+
+
+def _lese_bei_aenderung(pfad, bekannte_aenderung):
+    """Liest die Datei nur, wenn sich ihre Änderungszeit geändert hat (blockierend).
+
+    Returns:
+        tuple: (Änderungszeit oder None ohne Datei, Brückentage oder None,
+            wenn die Datei unverändert ist).
+    """
+    try:
+        aenderung = os.stat(pfad).st_mtime_ns
+    except FileNotFoundError:
+        aenderung = None
+    if aenderung == bekannte_aenderung:
+        return aenderung, None
+    return aenderung, lese_brueckentage(pfad)
+
+
+class BrueckentagLader:
+    """Gemeinsamer Lader für Brückentage, zwischengespeichert nach Pfad und Änderungszeit.
+
+    Dateizugriff und YAML-Parsen laufen im Executor. Solange sich die
+    Änderungszeit einer Datei nicht ändert, wird sie nicht erneut geparst.
+    """
+
+    def __init__(self, hass):
+        """Initialisiert den Lader."""
+        self._hass = hass
+        self._dateien = {}
+
+    async def async_lade(self, pfad):
+        """Gibt die Brückentage einer Datei zurück und liest sie nur bei Änderung neu."""
+        bekannt = self._dateien.get(pfad)
+        aenderung, tage = await self._hass.async_add_executor_job(
+            _lese_bei_aenderung, pfad, bekannt[0] if bekannt else _UNBEKANNT
+        )
+        if tage is None:
+            return bekannt[1]
+        _LOGGER.debug("Brückentage aus %s geladen: %d Tage", pfad, len(tage))
+        self._dateien[pfad] = (aenderung, tage)
+        return tage
+
+
+def async_hole_brueckentag_lader(hass):
+    """Gibt den integrationsweiten Brückentag-Lader zurück."""
+    domain_daten = hass.data.setdefault(DOMAIN, {})
+    lader = domain_daten.get("brueckentag_lader")
+    if lader is None:
+        lader = BrueckentagLader(hass)
+        domain_daten["brueckentag_lader"] = lader
+    return lader
+
+
+async def async_lade_brueckentage(hass):
+    """Lädt die Brückentage aus der bridge_days.yaml im Konfigurationsverzeichnis."""
+    lader = async_hole_brueckentag_lader(hass)
+    return await lader.async_lade(hass.config.path(BRUECKENTAGE_DATEI))
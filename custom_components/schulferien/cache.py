@@ -0,0 +1,155 @@
+"""Persistenter Antwort-Cache für die OpenHolidays-API."""
+
+import logging
+from urllib.parse import urlencode
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.api_cache"
+STORAGE_VERSION = 1
+
+# Verzögerung in Sekunden, mit der Änderungen gebündelt auf die Platte geschrieben werden
+SAVE_DELAY = 10
+
+# Parameter, die nur das Zeitfenster beschreiben und nicht den Datensatz selbst
+FENSTER_PARAMETER = ("validFrom", "validTo")
+
+
+class GespeicherteEintraege:
+    """Hält ein dict von Einträgen in einem Home Assistant Store.
+
+    Gemeinsame Grundlage von AntwortCache und KatalogCache: einmaliges Laden
+    beim ersten Zugriff und gebündeltes, verzögertes Schreiben.
+    """
+
+    def __init__(self, hass, storage_key, bezeichnung):
+        """Initialisiert die leeren Einträge für den Store unter storage_key."""
+        self._store = Store(hass, STORAGE_VERSION, storage_key)
+        self._bezeichnung = bezeichnung
+        self._eintraege = {}
+        self._geladen = False
+
+    async def async_laden(self):
+        """Lädt die gespeicherten Einträge einmalig von der Platte."""
+        if self._geladen:
+            return
+        gespeichert = await self._store.async_load()
+        if isinstance(gespeichert, dict):
+            self._eintraege = gespeichert.get("eintraege", {})
+        self._geladen = True
+        _LOGGER.debug("%s geladen: %d Einträge", self._bezeichnung, len(self._eintraege))
+
+    def _plane_speichern(self):
+        """Plant das Schreiben auf die Platte nach SAVE_DELAY Sekunden ein."""
+        self._store.async_delay_save(self._daten_zum_speichern, SAVE_DELAY)
+
+    def _daten_zum_speichern(self):
+        """Gibt die zu speichernden Daten zurück."""
+        return {"eintraege": self._eintraege}
+
+
+class AntwortCache(GespeicherteEintraege):
+    """Speichert API-Antworten samt ETag und Last-Modified über Neustarts hinweg.
+
+    Pro URL und Standort (Parameter ohne Zeitfenster) wird genau die letzte
+    Antwort aufbewahrt. Bedingte Anfragen werden nur gestellt, wenn die
+    gespeicherte Antwort zu exakt denselben Parametern gehört.
+    """
+
+    def __init__(self, hass):
+        """Initialisiert den Cache mit einem Home Assistant Store."""
+        super().__init__(hass, STORAGE_KEY, "API-Cache")
+
+    @staticmethod
+    def basis_schluessel(api_url, api_parameter):
+        """Erstellt den Schlüssel aus URL und Parametern ohne Zeitfenster."""
+        parameter = sorted(
+            (schluessel, wert)
+            for schluessel, wert in (api_parameter or {}).items()
+            if schluessel not in FENSTER_PARAMETER
+        )
+        return f"{api_url}?{urlencode(parameter)}"
+
+    def hole(self, api_url, api_parameter):
+        """Gibt die gespeicherte Antwort für exakt diese Anfrage zurück."""
+        eintrag = self._eintraege.get(self.basis_schluessel(api_url, api_parameter))
+        if eintrag and eintrag.get("parameter") == dict(api_parameter or {}):
+            return eintrag
+        return None
+
+    def hole_letzte(self, api_url, api_parameter):
+        """Gibt die zuletzt gespeicherte Antwort für URL und Standort zurück.
+
+        Das Zeitfenster darf dabei abweichen, z.B. nach einem Neustart am Folgetag.
+        """
+        return self._eintraege.get(self.basis_schluessel(api_url, api_parameter))
+
+    def speichere(self, api_url, api_parameter, daten, etag=None, last_modified=None):
+        """Speichert eine Antwort und plant das Schreiben auf die Platte ein."""
+        self._eintraege[self.basis_schluessel(api_url, api_parameter)] = {
+            "parameter": dict(api_parameter or {}),
+            "daten": daten,
+            "etag": etag,
+            "last_modified": last_modified,
+            "gespeichert": dt_util.now().isoformat(),
+        }
+        self._plane_speichern()
+
+    def verwerfe_vor(self, beginn):
+        """Entfernt alle Antworten, deren Zeitfenster vor beginn endet."""
+        beginn_text = beginn.isoformat()
+        veraltet = [
+            schluessel for schluessel, eintrag in self._eintraege.items()
+            if (eintrag.get("parameter") or {}).get("validTo", beginn_text) < beginn_text
+        ]
+        for schluessel in veraltet:
+            del self._eintraege[schluessel]
+        if veraltet:
+            _LOGGER.debug("%d veraltete Antworten aus dem API-Cache entfernt", len(veraltet))
+            self._plane_speichern()
+
+
+class AbschnittsCache:
+    """Sicht auf den AntwortCache, die einen Abschnitt des Zeitfensters getrennt ablegt.
+
+    Der AntwortCache hält pro URL und Standort nur eine Antwort. Für
+    Jahresabschnitte wird der Abschnitt an die URL des Schlüssels gehängt,
+    so dass jeder Abschnitt seine eigene Antwort samt ETag behält.
+    """
+
+    def __init__(self, cache, abschnitt):
+        """Initialisiert die Sicht für einen Abschnitt, z.B. "2025"."""
+        self._cache = cache
+        self._abschnitt = abschnitt
+
+    def _url(self, api_url):
+        """Gibt die URL zurück, unter der der Abschnitt gespeichert wird."""
+        return f"{api_url}#{self._abschnitt}"
+
+    def hole(self, api_url, api_parameter):
+        """Gibt die gespeicherte Antwort des Abschnitts für exakt diese Anfrage zurück."""
+        return self._cache.hole(self._url(api_url), api_parameter)
+
+    def hole_letzte(self, api_url, api_parameter):
+        """Gibt die zuletzt gespeicherte Antwort des Abschnitts zurück."""
+        return self._cache.hole_letzte(self._url(api_url), api_parameter)
+
+    def speichere(self, api_url, api_parameter, daten, etag=None, last_modified=None):
+        """Speichert die Antwort des Abschnitts."""
+        self._cache.speichere(self._url(api_url), api_parameter, daten, etag, last_modified)
+
+
+async def async_hole_cache(hass):
+    """Gibt den geladenen, integrationsweiten Antwort-Cache zurück."""
+    domain_daten = hass.data.setdefault(DOMAIN, {})
+    cache = domain_daten.get("cache")
+    if cache is None:
+        cache = AntwortCache(hass)
+        domain_daten["cache"] = cache
+    await cache.async_laden()
+    return cache
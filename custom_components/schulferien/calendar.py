@@ -0,0 +1,105 @@
+"""Kalender für Schulferien (inklusive Brückentage) und Feiertage."""
+
+import logging
+from datetime import timedelta
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.core import callback
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHULFERIEN_KALENDER = EntityDescription(
+    key="schulferien",
+    name="Schulferien",
+    translation_key="schulferien",
+)
+
+FEIERTAGE_KALENDER = EntityDescription(
+    key="feiertage",
+    name="Feiertage",
+    translation_key="feiertage",
+)
+
+
+def _als_termin(zeitraum):
+    """Wandelt einen Zeitraum in einen ganztägigen Termin mit exklusivem Ende um."""
+    return CalendarEvent(
+        start=zeitraum.start_datum,
+        end=zeitraum.end_datum + timedelta(days=1),
+        summary=zeitraum.name,
+    )
+
+
+class SchulferienKalender(CalendarEntity):
+    """Kalender über einen Index des gemeinsamen Coordinators.
+
+    Bereichsabfragen des Kalender-Panels werden per Binärsuche im
+    FerienIndex beantwortet, nicht durch Filtern aller Zeiträume.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(self, coordinator, description, index_schluessel, unique_id):
+        """Initialisiert den Kalender für den Index unter index_schluessel in coordinator.data."""
+        self.entity_description = description
+        self.coordinator = coordinator
+        self._index_schluessel = index_schluessel
+        self._attr_unique_id = unique_id
+
+    @property
+    def _index(self):
+        """Gibt den aktuellen Index des Coordinators zurück."""
+        return self.coordinator.data[self._index_schluessel]
+
+    @property
+    def event(self):
+        """Gibt den laufenden oder sonst den nächsten Zeitraum als Termin zurück."""
+        heute = dt_util.now().date()
+        zeitraum = self._index.finde(heute) or self._index.naechster_nach(heute)
+        return None if zeitraum is None else _als_termin(zeitraum)
+
+    async def async_get_events(self, hass, start_date, end_date):
+        """Gibt alle Termine zurück, die den Bereich von start_date bis end_date berühren.
+
+        end_date ist exklusiv, ein Ende um Mitternacht schließt den Tag also nicht ein.
+        """
+        start = dt_util.as_local(start_date).date()
+        ende = (dt_util.as_local(end_date) - timedelta(microseconds=1)).date()
+        if ende < start:
+            return []
+        return [_als_termin(zeitraum) for zeitraum in self._index.im_bereich(start, ende)]
+
+    async def async_added_to_hass(self):
+        """Registriert den Kalender beim gemeinsamen Coordinator."""
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Schreibt den Zustand nach neuen Daten oder einem Tageswechsel."""
+        self.async_write_ha_state()
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Richtet die Kalender für Schulferien und Feiertage ein."""
+    _LOGGER.debug("Initialisiere Kalender für Schulferien und Feiertage.")
+
+    # Gemeinsamer Coordinator aus __init__.async_setup_entry
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    # Pro Config Entry eindeutig, sonst verwirft Home Assistant die Kalender weiterer Entries
+    async_add_entities([
+        SchulferienKalender(
+            coordinator, SCHULFERIEN_KALENDER, "ferien_index",
+            f"calendar.schulferien_{entry.entry_id}",
+        ),
+        SchulferienKalender(
+            coordinator, FEIERTAGE_KALENDER, "feiertag_index",
+            f"calendar.feiertage_{entry.entry_id}",
+        ),
+    ])
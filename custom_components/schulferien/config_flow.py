@@ -3,12 +3,23 @@
 from __future__ import annotations
 
 import logging
-import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    MAXIMALE_LUECKE,
+    MAXIMALE_VORAUSSCHAU_JAHRE,
+    OPTION_BRUECKENTAGE_BERECHNEN,
+    OPTION_MAX_LUECKE,
+    OPTION_NUR_SCHULZEIT,
+    OPTION_VORAUSSCHAU_JAHRE,
+    STANDARD_MAX_LUECKE,
+    STANDARD_VORAUSSCHAU_JAHRE,
+)
+from .ics import ics_pfad
+from .katalog import async_hole_laender, async_hole_regionen, async_starte_regionen_vorabruf
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,6 +33,12 @@ class SchulferienFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         self.supported_countries = {}
         self.supported_regions = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Gibt den Options-Flow für einen Config Entry zurück."""
+        return SchulferienOptionsFlow(config_entry)
+
     def _get_hass_language(self, hass: HomeAssistant) -> str:
         """Holt den aktuellen Sprachcode aus der Home Assistant-Konfiguration und formatiert ihn."""
         language = hass.config.language[:2].upper()  # Ersten zwei Buchstaben groß, z.B. "DE"
@@ -29,53 +46,16 @@ class SchulferienFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         return language
 
     async def _fetch_supported_countries(self) -> dict:
-        """Holt die Liste der unterstützten Länder von der API."""
-        url = f"https://openholidaysapi.org/Countries?languageIsoCode={self.language_iso_code}"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    try:
-                        countries_data = await response.json()
-                        self.supported_countries = {
-                            country["isoCode"]: next(
-                                (name_entry["text"] for name_entry in country["name"]
-                                 if name_entry["language"] == self.language_iso_code),
-                                country["isoCode"]  # Fallback
-                            )
-                            for country in countries_data if "name" in country
-                        }
-                        return self.supported_countries
-                    except (KeyError, ValueError, TypeError) as e:
-                        _LOGGER.error("Fehler beim Verarbeiten der API-Antwort für Länder: %s", e)
-                else:
-                    _LOGGER.error("Fehler beim Abrufen der Länder: HTTP %s", response.status)
-        return {}
+        """Holt die Liste der unterstützten Länder aus dem Katalog oder von der API."""
+        self.supported_countries = await async_hole_laender(self.hass, self.language_iso_code)
+        return self.supported_countries
 
     async def _fetch_supported_regions(self, country_code: str) -> dict:
-        """Holt die Liste der Regionen basierend auf dem Land von der API."""
-        url = f"https://openholidaysapi.org/Subdivisions?countryIsoCode={country_code}&languageIsoCode={self.language_iso_code}"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    # Debugging: API-Antwort prüfen
-                    _LOGGER.debug("API-Antwort für Regionen: %s", await response.text())
-                    try:
-                        subdivisions_data = await response.json()
-                        self.supported_regions[country_code] = {
-                            subdivision["code"]: next(
-                                (name_entry["text"] for name_entry in subdivision["name"]
-                                if name_entry["language"] == self.language_iso_code),
-                                subdivision["code"]
-                            )
-                            for subdivision in subdivisions_data if "name" in subdivision
-                        }
-                        return self.supported_regions[country_code]
-                    except (KeyError, ValueError, TypeError) as e:
-                        _LOGGER.error("Fehler beim Verarbeiten der API-Antwort für Regionen: %s", e)
-                        return {}  # Fehlerbehandlung, falls die Antwort nicht wie erwartet ist
-                else:
-                    _LOGGER.error("Fehler beim Abrufen der Regionen: HTTP %s", response.status)
-                    return {}  # Rückgabe einer leeren Liste, wenn der HTTP-Status nicht 200 ist
+        """Holt die Regionen eines Landes aus dem Katalog oder von der API."""
+        self.supported_regions[country_code] = await async_hole_regionen(
+            self.hass, country_code, self.language_iso_code
+        )
+        return self.supported_regions[country_code]
 
     async def async_step_user(self, user_input=None):
         """Erster Schritt: Auswahl des Landes."""
@@ -94,6 +74,12 @@ class SchulferienFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             self.selected_country = user_input["country"]  # Speichern des Landes
             return await self.async_step_region()
 
+        # Während der Auswahl schon die Regionen des Home Assistant-Landes laden
+        if self.hass.config.country in countries:
+            await async_starte_regionen_vorabruf(
+                self.hass, self.hass.config.country, self.language_iso_code
+            )
+
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema(
@@ -123,9 +109,11 @@ class SchulferienFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             regions = {"DE-NS": "Keine Regionen"}
 
         if user_input is not None:
-            # Benutzer hat eine Region ausgewählt
-            self.selected_region = user_input["region"]  # Speichern der Region
-            return await self.async_step_finish()
+            if user_input["region"] in regions:
+                # Benutzer hat eine Region ausgewählt
+                self.selected_region = user_input["region"]  # Speichern der Region
+                return await self.async_step_finish()
+            errors["region"] = "ungültige_region"
 
         return self.async_show_form(
             step_id="region",
@@ -165,3 +153,45 @@ class SchulferienFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         except (vol.Invalid, KeyError) as e:
             _LOGGER.error("Fehler beim Erstellen des Eintrags: %s", e)
             return self.async_abort(reason="creation_failed")
+
+
+class SchulferienOptionsFlow(config_entries.OptionsFlow):
+    """Options-Flow für automatisch berechnete Brückentage und die Vorausschau."""
+
+    def __init__(self, config_entry):
+        """Initialisierung."""
+        self._config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Einziger Schritt: Brückentagsberechnung und Vorausschau einstellen."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        optionen = self._config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            # Adresse des Kalender-Abos samt Token, nur hier für den Nutzer sichtbar
+            description_placeholders={"ics_pfad": ics_pfad(self._config_entry)},
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        OPTION_BRUECKENTAGE_BERECHNEN,
+                        default=optionen.get(OPTION_BRUECKENTAGE_BERECHNEN, False),
+                    ): bool,
+                    vol.Required(
+                        OPTION_MAX_LUECKE,
+                        default=optionen.get(OPTION_MAX_LUECKE, STANDARD_MAX_LUECKE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAXIMALE_LUECKE)),
+                    vol.Required(
+                        OPTION_NUR_SCHULZEIT,
+                        default=optionen.get(OPTION_NUR_SCHULZEIT, False),
+                    ): bool,
+                    vol.Required(
+                        OPTION_VORAUSSCHAU_JAHRE,
+                        default=optionen.get(OPTION_VORAUSSCHAU_JAHRE, STANDARD_VORAUSSCHAU_JAHRE),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=MAXIMALE_VORAUSSCHAU_JAHRE)
+                    ),
+                }
+            ),
+        )
@@ -1,11 +1,90 @@
 """Konstanten für die Schulferien- und Feiertags-Integration."""
 
 DOMAIN = "schulferien"
-API_URL_FERIEN = "https://openholidaysapi.org/SchoolHolidays"
-API_FALLBACK_FERIEN = "https://openholidaysapi.org/Holidays/SchoolHolidays"
-API_URL_FEIERTAGE = "https://openholidaysapi.org/PublicHolidays"
-API_FALLBACK_FEIERTAGE = "https://openholidaysapi.org/Holidays/PublicHolidays"
+API_BASIS_URL = "https://openholidaysapi.org"
+API_URL_FERIEN = f"{API_BASIS_URL}/SchoolHolidays"
+API_FALLBACK_FERIEN = f"{API_BASIS_URL}/Holidays/SchoolHolidays"
+API_URL_FEIERTAGE = f"{API_BASIS_URL}/PublicHolidays"
+API_FALLBACK_FEIERTAGE = f"{API_BASIS_URL}/Holidays/PublicHolidays"
+API_URL_LAENDER = f"{API_BASIS_URL}/Countries"
+API_URL_REGIONEN = f"{API_BASIS_URL}/Subdivisions"
+
+# Name, unter dem Brückentage in der Ferienliste geführt werden
+BRUECKENTAG_NAME = "Brückentag"
+# Name für automatisch aus Feiertagen und Wochenenden berechnete Brückentage
+BRUECKENTAG_BERECHNET_NAME = "Brückentag (berechnet)"
 
 # Update-Konfiguration
 DAILY_UPDATE_HOUR = 3
 DAILY_UPDATE_MINUTE = 0
+
+# Nach so vielen Sekunden ohne Antwort wird parallel die Fallback-URL abgefragt.
+# None fragt die URLs nacheinander ab.
+HEDGE_VERZOEGERUNG = 2.0
+
+# Wiederholungen bei Netzwerk- und Serverfehlern (exponentiell mit Jitter)
+WIEDERHOLUNG_VERSUCHE = 3
+WIEDERHOLUNG_BASIS = 1.0
+WIEDERHOLUNG_MAXIMUM = 30.0
+
+# Schutzschalter pro Host: nach so vielen Fehlern in Folge wird für
+# SCHUTZSCHALTER_PAUSE Sekunden keine Anfrage mehr gestellt.
+SCHUTZSCHALTER_SCHWELLE = 5
+SCHUTZSCHALTER_PAUSE = 300
+
+# Blockgröße in Bytes, in der API-Antworten gelesen und geparst werden
+STREAM_BLOCKGROESSE = 16 * 1024
+
+# Ab so vielen Regionen desselben Landes (und derselben Sprache) wird das
+# ganze Land mit einer Anfrage abgerufen und lokal auf die Regionen verteilt.
+LANDESWEITER_ABRUF_AB = 2
+
+# Nach einem fehlgeschlagenen Update wird im Hintergrund nach so vielen
+# Sekunden erneut abgefragt, bis dahin bleiben die letzten Daten gültig.
+NACHHOLEN_INTERVALL = 1800
+
+# Länder- und Regionslisten für den Konfigurations-Flow gelten so viele
+# Sekunden, bevor sie erneut von der API geholt werden.
+KATALOG_GUELTIGKEIT = 7 * 24 * 3600
+
+# Optionen für automatisch berechnete Brückentage: Arbeitstage zwischen zwei
+# freien Tagen (Feiertag oder Wochenende), höchstens OPTION_MAX_LUECKE am
+# Stück. Lücken zwischen zwei Wochenenden sind immer 5 Tage lang, bis 4 Tage
+# grenzt eine Lücke also immer an einen Feiertag.
+OPTION_BRUECKENTAGE_BERECHNEN = "brueckentage_berechnen"
+OPTION_MAX_LUECKE = "brueckentage_max_luecke"
+OPTION_NUR_SCHULZEIT = "brueckentage_nur_schulzeit"
+STANDARD_MAX_LUECKE = 1
+MAXIMALE_LUECKE = 4
+
+# Gleitender Abruf: täglich wird nur das neu ins Fenster gerückte Ende
+# abgefragt. Alle REVALIDIERUNG_TAGE Tage werden zusätzlich die nächsten
+# NAHBEREICH_TAGE Tage erneut abgefragt.
+REVALIDIERUNG_TAGE = 7
+NAHBEREICH_TAGE = 60
+
+# Vorausschau in Jahren zu je 365 Tagen ab heute. Das Fenster wird in
+# Kalenderjahre aufgeteilt, von denen höchstens ABSCHNITTE_PARALLEL
+# gleichzeitig pro Standort abgefragt werden.
+OPTION_VORAUSSCHAU_JAHRE = "vorausschau_jahre"
+STANDARD_VORAUSSCHAU_JAHRE = 1
+MAXIMALE_VORAUSSCHAU_JAHRE = 5
+ABSCHNITTE_PARALLEL = 2
+
+# Cache-Control des iCalendar-Feeds. Kalender-Clients revalidieren danach
+# per If-None-Match und erhalten bei unveränderten Daten nur ein 304. Die
+# URL enthält ein Geheimnis, gemeinsame Proxys sollen sie nicht speichern.
+ICS_CACHE_CONTROL = "private, max-age=3600"
+
+# Schlüssel des zufälligen Tokens im Config Entry, ohne den der Feed nicht
+# ausgeliefert wird, und seine Länge in Bytes
+ICS_TOKEN = "ics_token"
+ICS_TOKEN_BYTES = 32
+
+# Obergrenzen der Eimer in Millisekunden für die Laufzeit-Histogramme
+# von Abruf, Parsen, Verarbeitung und Zustandsschreiben
+MESSWERTE_GRENZEN_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 10000)
+
+# Anzahl der Allokationsstellen, die der Dienst profile_refresh in die
+# Speicherauswertung schreibt
+PROFIL_ALLOKATIONEN = 25
@@ -0,0 +1,897 @@
+"""Gemeinsamer Datenabruf für die Schulferien- und Feiertagssensoren."""
+
+import asyncio
+import logging
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from itertools import chain
+
+import aiohttp
+from homeassistant.core import callback
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_time,
+    async_track_time_change,
+)
+from homeassistant.util import dt as dt_util
+
+from .api_utils import (
+    async_gib_session_frei,
+    async_hole_schutzschalter,
+    async_hole_session,
+    fetch_data,
+    iter_daten,
+)
+from .cache import AbschnittsCache
+from .datenbestand import Datenbestand, jahresabschnitte
+from .ferien_index import FerienIndex, Zeitraum
+from .landesabruf import LandesAbruf
+from .messwerte import AKTUALISIERUNG, PARSEN, ZUSTAND_SCHREIBEN, Messwerte
+from .tageskalender import Tageskalender
+from .const import (
+    ABSCHNITTE_PARALLEL,
+    API_URL_FERIEN,
+    API_FALLBACK_FERIEN,
+    API_URL_FEIERTAGE,
+    API_FALLBACK_FEIERTAGE,
+    BRUECKENTAG_BERECHNET_NAME,
+    BRUECKENTAG_NAME,
+    DAILY_UPDATE_HOUR,
+    DAILY_UPDATE_MINUTE,
+    DOMAIN,
+    HEDGE_VERZOEGERUNG,
+    LANDESWEITER_ABRUF_AB,
+    NACHHOLEN_INTERVALL,
+    OPTION_BRUECKENTAGE_BERECHNEN,
+    OPTION_MAX_LUECKE,
+    OPTION_NUR_SCHULZEIT,
+    OPTION_VORAUSSCHAU_JAHRE,
+    STANDARD_MAX_LUECKE,
+    STANDARD_VORAUSSCHAU_JAHRE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def fuehre_optionen_zusammen(optionen_liste):
+    """Leitet die wirksamen Optionen eines gemeinsamen Coordinators aus allen Entries ab.
+
+    Unabhängig von der Reihenfolge gilt jeweils die umfassendere Einstellung:
+    die längste Vorausschau und berechnete Brückentage, sobald ein Entry sie
+    aktiviert. Dann gilt die größte Lücke, und die Berechnung wird nur auf
+    die Schulzeit beschränkt, wenn alle Entries mit Berechnung das wollen.
+    """
+    optionen_liste = [dict(optionen or {}) for optionen in optionen_liste]
+    wirksam = {}
+    jahre = [
+        optionen[OPTION_VORAUSSCHAU_JAHRE]
+        for optionen in optionen_liste if OPTION_VORAUSSCHAU_JAHRE in optionen
+    ]
+    if jahre:
+        wirksam[OPTION_VORAUSSCHAU_JAHRE] = max(jahre)
+    berechnend = [
+        optionen for optionen in optionen_liste if optionen.get(OPTION_BRUECKENTAGE_BERECHNEN)
+    ]
+    if berechnend:
+        wirksam[OPTION_BRUECKENTAGE_BERECHNEN] = True
+        wirksam[OPTION_MAX_LUECKE] = max(
+            optionen.get(OPTION_MAX_LUECKE, STANDARD_MAX_LUECKE) for optionen in berechnend
+        )
+        wirksam[OPTION_NUR_SCHULZEIT] = all(
+            optionen.get(OPTION_NUR_SCHULZEIT, False) for optionen in berechnend
+        )
+    return wirksam
+
+
+class SchulferienCoordinator:
+    """Teilt einen Abruf- und Verarbeitungszyklus zwischen allen Entitäten eines Standorts.
+
+    Ein Coordinator existiert genau einmal pro (Land, Region, Sprache) und wird von
+    allen Config Entries mit diesem Schlüssel gemeinsam verwendet. Seine Optionen
+    werden mit fuehre_optionen_zusammen aus den Optionen aller Entries abgeleitet.
+    """
+
+    def __init__(
+        self, hass, land, region, iso_code, brueckentage=None, cache=None,
+        hedge_verzoegerung=HEDGE_VERZOEGERUNG, optionen=None,
+    ):
+        """Initialisiert den Coordinator für einen Standort."""
+        self.hass = hass
+        self._cache = cache
+        self._hedge_verzoegerung = hedge_verzoegerung
+        self._location = {
+            "land": land,
+            "region": region,
+            "iso_code": iso_code,
+        }
+        self.brueckentage = brueckentage or []
+        self.optionen = dict(optionen or {})
+        # Optionen pro Config Entry, wirksam ist ihre Zusammenführung
+        self._eintrag_optionen = {}
+        self.data = {
+            "ferien_index": FerienIndex(),
+            "feiertag_index": FerienIndex(),
+            "tageskalender": Tageskalender(FerienIndex(), FerienIndex()),
+            "letztes_update": None,
+            "datenstand": None,
+            "wechsel_tage": [],
+            "berechnete_brueckentage": [],
+        }
+        # Wird bei jeder Änderung der Daten erhöht, z.B. für zwischengespeicherte Attribute
+        self.datenversion = 0
+        # Bereits abgerufene Einträge für den gleitenden Abruf
+        self._bestaende = {"ferien": Datenbestand(), "feiertage": Datenbestand()}
+        # Begrenzt die gleichzeitig laufenden Abfragen von Jahresabschnitten
+        self._abschnitte_semaphore = asyncio.Semaphore(ABSCHNITTE_PARALLEL)
+        # Laufzeiten und Zähler für Diagnose-Sensoren und den Diagnose-Download
+        self.messwerte = Messwerte()
+        self.eintraege = set()
+        self._listeners = []
+        self._lock = asyncio.Lock()
+        self._unsub_taeglich = None
+        self._unsub_nachholen = None
+        self._unsub_tageswechsel = None
+        # Nach async_stoppe_zeitplan plant ein noch laufendes Update nichts mehr ein
+        self._gestoppt = False
+        # Während eines erzwungenen Updates werden keine bedingten Anfragen gestellt
+        self._erzwungen = False
+        self._schutzschalter = None
+
+    @property
+    def schluessel(self):
+        """Gibt den Schlüssel (Land, Region, Sprache) des Coordinators zurück."""
+        return (self._location["land"], self._location["region"], self._location["iso_code"])
+
+    @callback
+    def async_add_listener(self, update_callback):
+        """Registriert einen Listener, der nach jedem Update aufgerufen wird."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            """Entfernt den Listener wieder."""
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self):
+        """Benachrichtigt alle registrierten Entitäten."""
+        with self.messwerte.messe(ZUSTAND_SCHREIBEN):
+            for update_callback in list(self._listeners):
+                update_callback()
+
+    @callback
+    def async_starte_zeitplan(self):
+        """Richtet die tägliche Aktualisierung um DAILY_UPDATE_HOUR:DAILY_UPDATE_MINUTE ein."""
+        if self._unsub_taeglich is not None:
+            return
+        self._gestoppt = False
+
+        async def async_daily_update(_):
+            """Tägliche Aktualisierung um 03:00 Uhr."""
+            _LOGGER.debug("Tägliches Update ausgelöst für %s.", self.schluessel)
+            await self.async_refresh()
+
+        self._unsub_taeglich = async_track_time_change(
+            self.hass,
+            async_daily_update,
+            hour=DAILY_UPDATE_HOUR,
+            minute=DAILY_UPDATE_MINUTE,
+        )
+        _LOGGER.debug(
+            "Tägliche Abfrage um %02d:%02d eingerichtet.", DAILY_UPDATE_HOUR, DAILY_UPDATE_MINUTE
+        )
+
+    @callback
+    def async_stoppe_zeitplan(self):
+        """Beendet die tägliche Aktualisierung, das Nachholen und den Tageswechsel."""
+        self._gestoppt = True
+        if self._unsub_taeglich is not None:
+            self._unsub_taeglich()
+            self._unsub_taeglich = None
+        if self._unsub_nachholen is not None:
+            self._unsub_nachholen()
+            self._unsub_nachholen = None
+        if self._unsub_tageswechsel is not None:
+            self._unsub_tageswechsel()
+            self._unsub_tageswechsel = None
+
+    @callback
+    def async_lade_aus_cache(self):
+        """Übernimmt die zuletzt gespeicherten Antworten ohne Netzwerkzugriff.
+
+        Returns:
+            bool: True, wenn für beide Endpunkte Daten im Cache lagen.
+        """
+        if self._cache is None:
+            return False
+        if self.data["letztes_update"] is not None:
+            # Ein weiterer Entry teilt sich bereits aktuelle Daten
+            return True
+
+        heute = dt_util.now().date()
+        api_parameter = self.get_api_parameter(heute)
+        ferien_eintrag = self._hole_aus_cache(
+            [API_URL_FERIEN, API_FALLBACK_FERIEN], api_parameter
+        )
+        feiertage_eintrag = self._hole_aus_cache(
+            [API_URL_FEIERTAGE, API_FALLBACK_FEIERTAGE], api_parameter
+        )
+        if not ferien_eintrag or not feiertage_eintrag:
+            return False
+
+        try:
+            self.data["feiertag_index"] = FerienIndex(
+                iter_daten(feiertage_eintrag["daten"], typ="feiertage")
+            )
+            self._setze_ferien_index(iter_daten(ferien_eintrag["daten"], self.brueckentage), heute)
+            self.data["datenstand"] = datetime.fromisoformat(ferien_eintrag["gespeichert"])
+            for art, eintrag in (("ferien", ferien_eintrag), ("feiertage", feiertage_eintrag)):
+                parameter = eintrag.get("parameter") or {}
+                if "validFrom" in parameter and "validTo" in parameter:
+                    self._bestaende[art].setze(
+                        eintrag["daten"], parameter["validFrom"], parameter["validTo"]
+                    )
+        except (RuntimeError, ValueError) as e:
+            _LOGGER.warning("Gespeicherte Daten konnten nicht verarbeitet werden: %s", e)
+            return False
+
+        _LOGGER.debug("Daten für %s aus dem Cache übernommen.", self.schluessel)
+        self.async_update_listeners()
+        self._plane_tageswechsel()
+        return True
+
+    @callback
+    def async_setze_brueckentage(self, brueckentage):
+        """Übernimmt geänderte Brückentage, ohne die API erneut abzufragen.
+
+        Die bisherigen Brückentage werden aus dem Ferienindex entfernt und die
+        neuen ergänzt, danach werden Tageskalender und Entitäten aktualisiert.
+        """
+        brueckentage = list(brueckentage)
+        if brueckentage == self.brueckentage:
+            return
+        alte = set(self.brueckentage)
+        self.brueckentage = brueckentage
+        self._setze_ferien_index(
+            chain(
+                (
+                    zeitraum for zeitraum in self._api_zeitraeume()
+                    if not (
+                        zeitraum.name == BRUECKENTAG_NAME
+                        and zeitraum.start_datum == zeitraum.end_datum
+                        and zeitraum.start_datum in alte
+                    )
+                ),
+                iter_daten([], brueckentage),
+            ),
+            dt_util.now().date(),
+        )
+        _LOGGER.debug(
+            "Brückentage für %s aktualisiert: %d Tage", self.schluessel, len(brueckentage)
+        )
+        self.async_update_listeners()
+        self._plane_tageswechsel()
+
+    @callback
+    def async_setze_optionen(self, optionen):
+        """Übernimmt geänderte Optionen und berechnet die Brückentage neu.
+
+        Ändert sich die Vorausschau, werden die fehlenden Jahre im
+        Hintergrund nachgeladen bzw. die überzähligen verworfen.
+        """
+        optionen = dict(optionen or {})
+        if optionen == self.optionen:
+            return
+        alter_horizont = self.vorausschau_jahre
+        self.optionen = optionen
+        heute = dt_util.now().date()
+        if self.vorausschau_jahre < alter_horizont:
+            self._begrenze_bestaende(heute)
+        self._setze_ferien_index(self._api_zeitraeume(), heute)
+        _LOGGER.debug("Optionen für %s aktualisiert: %s", self.schluessel, optionen)
+        self.async_update_listeners()
+        self._plane_tageswechsel()
+        if self.vorausschau_jahre > alter_horizont:
+            self.data["letztes_update"] = None
+            self.hass.async_create_task(self.async_refresh())
+
+    @callback
+    def async_setze_eintrag_optionen(self, entry_id, optionen):
+        """Übernimmt die Optionen eines Config Entries, None entfernt den Entry.
+
+        Wirksam werden die mit fuehre_optionen_zusammen zusammengeführten
+        Optionen aller verbleibenden Entries.
+        """
+        if optionen is None:
+            self._eintrag_optionen.pop(entry_id, None)
+        else:
+            self._eintrag_optionen[entry_id] = dict(optionen)
+        if self._eintrag_optionen:
+            self.async_setze_optionen(fuehre_optionen_zusammen(self._eintrag_optionen.values()))
+
+    @property
+    def vorausschau_jahre(self):
+        """Gibt die Vorausschau in Jahren aus den Optionen zurück."""
+        return self.optionen.get(OPTION_VORAUSSCHAU_JAHRE, STANDARD_VORAUSSCHAU_JAHRE)
+
+    def _begrenze_bestaende(self, heute):
+        """Verwirft Einträge hinter dem letzten Jahresabschnitt des Fensters.
+
+        Der Ferienindex wird auf die verbleibenden Einträge beschränkt, der
+        Feiertagsindex aus dem Bestand neu aufgebaut.
+        """
+        _beginn, ende = self.abruf_fenster(heute)
+        grenze = date(ende.year, 12, 31)
+        for bestand in self._bestaende.values():
+            bestand.verwerfe_nach(grenze)
+        self.data["feiertag_index"] = FerienIndex(
+            iter_daten(self._bestaende["feiertage"].eintraege(), typ="feiertage")
+        )
+        self.data["ferien_index"] = FerienIndex(
+            zeitraum for zeitraum in self.data["ferien_index"] if zeitraum.start_datum <= grenze
+        )
+
+    def _api_zeitraeume(self):
+        """Iteriert über den Ferienindex ohne berechnete Brückentage."""
+        return (
+            zeitraum for zeitraum in self.data["ferien_index"]
+            if zeitraum.name != BRUECKENTAG_BERECHNET_NAME
+        )
+
+    def _setze_ferien_index(self, zeitraeume, heute):
+        """Baut Ferienindex und Tageskalender aus Zeiträumen ohne berechnete Brückentage.
+
+        Ist die Option aktiv, werden die Brückentage im Tageskalender
+        berechnet, mit BRUECKENTAG_BERECHNET_NAME in den Ferienindex
+        übernommen und der Tageskalender anschließend neu aufgebaut.
+        """
+        self.data["ferien_index"] = FerienIndex(zeitraeume)
+        self._baue_tageskalender(heute)
+
+        berechnet = []
+        if self.optionen.get(OPTION_BRUECKENTAGE_BERECHNEN, False):
+            berechnet = self.data["tageskalender"].berechne_brueckentage(
+                self.optionen.get(OPTION_MAX_LUECKE, STANDARD_MAX_LUECKE),
+                self.optionen.get(OPTION_NUR_SCHULZEIT, False),
+            )
+            if berechnet:
+                self.data["ferien_index"] = FerienIndex(chain(
+                    self.data["ferien_index"],
+                    (Zeitraum(BRUECKENTAG_BERECHNET_NAME, tag, tag) for tag in berechnet),
+                ))
+                self._baue_tageskalender(heute)
+        self.data["berechnete_brueckentage"] = berechnet
+
+    def _hole_aus_cache(self, urls, api_parameter):
+        """Gibt den ersten Cache-Eintrag mit Daten für eine der URLs zurück.
+
+        Auch nach einem landesweiten Abruf liegt der zusammengeführte Bestand
+        der Region unter ihren eigenen Parametern, siehe _speichere_bestand.
+        """
+        for url in urls:
+            eintrag = self._cache.hole_letzte(url, api_parameter)
+            if eintrag and eintrag.get("daten"):
+                return eintrag
+        return None
+
+    async def async_refresh(self, session=None, erzwingen=False):
+        """Ruft Ferien und Feiertage ab, höchstens einmal pro Tag und Standort.
+
+        Parallele Aufrufe mehrerer Entitäten warten auf denselben Abruf und
+        übernehmen anschließend dessen Ergebnis. Schlägt der Abruf fehl,
+        bleiben die zuletzt gültigen Daten bestehen (stale-while-revalidate)
+        und ein neuer Versuch wird im Hintergrund eingeplant.
+
+        Mit erzwingen wird auch am selben Tag abgerufen, und zwar das ganze
+        Fenster statt nur der fehlenden Jahresabschnitte und ohne
+        If-None-Match, so dass jede Antwort geladen und geparst wird, z.B.
+        zum Profilieren.
+        """
+        async with self._lock:
+            jetzt = dt_util.now()
+            heute = jetzt.date()
+
+            letztes_update = self.data.get("letztes_update")
+            if erzwingen:
+                self._verwerfe_bestaende()
+            elif letztes_update and letztes_update.date() == heute:
+                _LOGGER.debug(
+                    "Update übersprungen. Letztes Update war heute um %s.",
+                    letztes_update.strftime("%H:%M:%S"),
+                )
+                return
+
+            _LOGGER.debug("Starte Update der Daten für %s.", self.schluessel)
+
+            if session is None:
+                session = async_hole_session(self.hass)
+
+            vollstaendig = False
+            self.messwerte.beginne_aktualisierung()
+            self._erzwungen = erzwingen
+            try:
+                with self.messwerte.messe(AKTUALISIERUNG):
+                    vollstaendig = await self._aktualisiere(session, heute, jetzt)
+            except (aiohttp.ClientError, RuntimeError, ValueError, KeyError, TypeError) as e:
+                _LOGGER.error("Unerwarteter Fehler beim Aktualisieren der Daten: %s", e)
+
+            finally:
+                self._erzwungen = False
+                zaehler = self.hass.data.get(DOMAIN, {}).get("verbindungen")
+                if zaehler is not None:
+                    _LOGGER.debug(
+                        "HTTP-Statistik: %(anfragen)d Anfragen über "
+                        "%(verbindungen)d neue Verbindungen", zaehler.als_dict()
+                    )
+
+        if not vollstaendig:
+            _LOGGER.warning(
+                "Update für %s unvollständig, verwende Daten vom %s weiter.",
+                self.schluessel, self.data["datenstand"],
+            )
+            self._plane_nachholen()
+        self.async_update_listeners()
+        self._plane_tageswechsel()
+
+    async def _aktualisiere(self, session, heute, jetzt):
+        """Ruft beide Datensätze ab und übernimmt sie.
+
+        Returns:
+            bool: True, wenn beide Datensätze aktualisiert wurden.
+        """
+        landesabruf, regionen = self._hole_landesabruf()
+        if landesabruf is None:
+            ferien_daten, feiertage_daten = await asyncio.gather(
+                self._aktualisiere_bestand("ferien", heute, session),
+                self._aktualisiere_bestand("feiertage", heute, session),
+            )
+        else:
+            ferien_daten, feiertage_daten = await landesabruf.async_hole(
+                heute,
+                self._location["region"],
+                regionen,
+                lambda: self._hole_land(heute, session),
+            )
+            ferien_daten = self._uebernehme_fenster("ferien", ferien_daten, heute)
+            feiertage_daten = self._uebernehme_fenster("feiertage", feiertage_daten, heute)
+
+        if ferien_daten is None and feiertage_daten is None:
+            _LOGGER.warning("Keine Daten von der API erhalten.")
+            return False
+
+        self._uebernehme_daten(ferien_daten, feiertage_daten, heute)
+
+        if ferien_daten is None or feiertage_daten is None:
+            return False
+
+        if self._cache is not None:
+            self._cache.verwerfe_vor(self.abruf_fenster(heute)[0])
+        self.data["letztes_update"] = jetzt
+        self.data["datenstand"] = jetzt
+        _LOGGER.debug("Update abgeschlossen. Letztes Update um: %s", jetzt)
+        return True
+
+    def _uebernehme_daten(self, ferien_daten, feiertage_daten, heute):
+        """Baut Indizes und Tageskalender aus den Einträgen der API auf.
+
+        None steht für einen fehlgeschlagenen Abruf, die bisherigen Daten bleiben dann stehen.
+        """
+        with self.messwerte.messe(PARSEN):
+            if feiertage_daten is not None:
+                self.data["feiertag_index"] = FerienIndex(
+                    iter_daten(feiertage_daten, typ="feiertage")
+                )
+                self.messwerte.zaehle_eintraege(len(self.data["feiertag_index"]))
+            # Auch ohne neue Ferien neu aufbauen, berechnete Brückentage hängen an den Feiertagen
+            self._setze_ferien_index(
+                iter_daten(ferien_daten, self.brueckentage)
+                if ferien_daten is not None else self._api_zeitraeume(),
+                heute,
+            )
+            if ferien_daten is not None:
+                self.messwerte.zaehle_eintraege(len(self.data["ferien_index"]))
+
+    async def _aktualisiere_bestand(self, art, heute, session):
+        """Fragt für einen Datensatz nur die fehlenden Jahresabschnitte des Fensters ab.
+
+        Args:
+            art (str): "ferien" oder "feiertage".
+
+        Returns:
+            list: Alle Einträge im Fenster, None wenn ein Abschnitt fehlschlug.
+        """
+        bestand = self._bestaende[art]
+        beginn, ende = self.abruf_fenster(heute)
+        bereiche = bestand.plane(beginn, ende, heute)
+        ergebnisse = await self._hole_abschnitte(art, bereiche, heute, session)
+        for (von, bis), daten in zip(bereiche, ergebnisse):
+            if daten is None:
+                # Spätere Abschnitte nicht übernehmen, sonst entstünde eine Lücke
+                return None
+            bestand.uebernehme(daten, von, bis, heute)
+        bestand.verwerfe_vor(beginn)
+        bestand.verwerfe_nach(date(ende.year, 12, 31))
+        if bereiche:
+            self._speichere_bestand(art, heute)
+        return bestand.eintraege()
+
+    def _verwerfe_bestaende(self):
+        """Vergisst die bereits abgerufenen Einträge, auch die des landesweiten Abrufs.
+
+        Indizes und Tageskalender bleiben bis zum nächsten Update bestehen.
+        """
+        self._bestaende = {"ferien": Datenbestand(), "feiertage": Datenbestand()}
+        land, _region, iso_code = self.schluessel
+        landesabruf = self.hass.data.get(DOMAIN, {}).get("landesabrufe", {}).get((land, iso_code))
+        if landesabruf is not None:
+            landesabruf.verwerfe_stand()
+
+    def _uebernehme_fenster(self, art, daten, heute):
+        """Übernimmt eine Antwort für das ganze Fenster in den Bestand."""
+        if not daten:
+            return None
+        bestand = self._bestaende[art]
+        beginn, ende = self.abruf_fenster(heute)
+        bestand.uebernehme(daten, beginn, ende, heute)
+        bestand.verwerfe_vor(beginn)
+        bestand.verwerfe_nach(date(ende.year, 12, 31))
+        self._speichere_bestand(art, heute)
+        return bestand.eintraege()
+
+    def _speichere_bestand(self, art, heute):
+        """Speichert den zusammengeführten Bestand unter der Region im Cache.
+
+        So wird nach einem Neustart ebenfalls nur abgefragt, was fehlt.
+        """
+        if self._cache is None:
+            return
+        bestand = self._bestaende[art]
+        url = API_URL_FERIEN if art == "ferien" else API_URL_FEIERTAGE
+        self._cache.speichere(
+            url, self.get_api_parameter(heute, bestand.von, bestand.bis), bestand.eintraege()
+        )
+
+    async def _hole_abschnitte(self, art, bereiche, heute, session, landesweit=False):
+        """Fragt die Jahresabschnitte eines Datensatzes gleichzeitig ab.
+
+        Höchstens ABSCHNITTE_PARALLEL Abfragen laufen pro Standort
+        gleichzeitig. Jeder Abschnitt liegt getrennt im Antwort-Cache, ein
+        unveränderter Abschnitt wird daher nur per ETag revalidiert.
+
+        Returns:
+            list: Einträge pro Abschnitt in der Reihenfolge von bereiche,
+            None für einen fehlgeschlagenen Abschnitt.
+        """
+        hole = self.hole_ferien_daten if art == "ferien" else self.hole_feiertags_daten
+        parameter = self.get_landes_parameter if landesweit else self.get_api_parameter
+
+        async def abschnitt(von, bis):
+            async with self._abschnitte_semaphore:
+                _LOGGER.debug("Frage %s für %s von %s bis %s ab.", art, self.schluessel, von, bis)
+                # Künftige Jahre ohne Einträge sind gültig, z.B. noch nicht veröffentlicht
+                return await hole(
+                    parameter(heute, von, bis), session,
+                    leer_erlaubt=von > heute, abschnitt=str(von.year),
+                )
+
+        return await asyncio.gather(*(abschnitt(von, bis) for von, bis in bereiche))
+
+    async def _hole_land(self, heute, session):
+        """Ruft Ferien und Feiertage landesweit in Jahresabschnitten ab.
+
+        Das Fenster richtet sich nach der größten Vorausschau aller
+        Standorte des Landes, die den Abruf teilen.
+        """
+        land, _region, iso_code = self.schluessel
+        coordinators = self.hass.data.get(DOMAIN, {}).get("coordinators", {})
+        jahre = max(
+            (
+                coordinator.vorausschau_jahre
+                for (anderes_land, _andere_region, andere_sprache), coordinator
+                in coordinators.items()
+                if (anderes_land, andere_sprache) == (land, iso_code)
+            ),
+            default=self.vorausschau_jahre,
+        )
+        beginn, _ende = self.abruf_fenster(heute)
+        bereiche = jahresabschnitte(beginn, heute + timedelta(days=365 * jahre))
+
+        async def datensatz(art):
+            ergebnisse = await self._hole_abschnitte(art, bereiche, heute, session, landesweit=True)
+            if any(daten is None for daten in ergebnisse):
+                return None
+            return list(chain.from_iterable(ergebnisse))
+
+        return await asyncio.gather(datensatz("ferien"), datensatz("feiertage"))
+
+    def _hole_landesabruf(self):
+        """Gibt den gemeinsamen landesweiten Abruf und alle Regionen des Landes zurück.
+
+        Werden weniger als LANDESWEITER_ABRUF_AB Regionen desselben Landes
+        verfolgt, wird pro Region abgefragt und (None, Regionen) zurückgegeben.
+        """
+        land, _region, iso_code = self.schluessel
+        domain_daten = self.hass.data.get(DOMAIN, {})
+        regionen = sorted({
+            region
+            for (anderes_land, region, andere_sprache) in domain_daten.get("coordinators", {})
+            if anderes_land == land and andere_sprache == iso_code
+        })
+        if len(regionen) < LANDESWEITER_ABRUF_AB:
+            return None, regionen
+
+        abrufe = domain_daten.setdefault("landesabrufe", {})
+        if (land, iso_code) not in abrufe:
+            _LOGGER.debug("Rufe %s landesweit für %d Regionen ab.", land, len(regionen))
+            abrufe[(land, iso_code)] = LandesAbruf(land, iso_code)
+        return abrufe[(land, iso_code)], regionen
+
+    @callback
+    def _plane_nachholen(self):
+        """Plant einen erneuten Abruf im Hintergrund nach NACHHOLEN_INTERVALL Sekunden."""
+        if self._gestoppt or self._unsub_nachholen is not None:
+            return
+
+        async def async_nachholen(_):
+            """Holt ein fehlgeschlagenes Update nach."""
+            self._unsub_nachholen = None
+            await self.async_refresh()
+
+        self._unsub_nachholen = async_call_later(
+            self.hass, NACHHOLEN_INTERVALL, async_nachholen
+        )
+
+    @callback
+    def _plane_tageswechsel(self):
+        """Plant die Benachrichtigung der Entitäten für den nächsten Zustandswechsel.
+
+        Alle Zustände ändern sich nur um Mitternacht (Ortszeit von Home
+        Assistant) an den Rändern eines Zeitraums. Statt täglich oder
+        minütlich zu prüfen, wird genau der nächste dieser Zeitpunkte geplant.
+        """
+        if self._unsub_tageswechsel is not None:
+            self._unsub_tageswechsel()
+            self._unsub_tageswechsel = None
+        if self._gestoppt:
+            return
+
+        wechsel = self.naechster_wechsel(dt_util.now().date())
+        if wechsel is None:
+            return
+
+        @callback
+        def async_tageswechsel(_):
+            """Benachrichtigt die Entitäten zum Tageswechsel und plant den nächsten."""
+            self._unsub_tageswechsel = None
+            _LOGGER.debug("Tageswechsel für %s am %s.", self.schluessel, wechsel)
+            self.async_update_listeners()
+            self._plane_tageswechsel()
+
+        self._unsub_tageswechsel = async_track_point_in_time(
+            self.hass, async_tageswechsel, dt_util.start_of_local_day(wechsel)
+        )
+        _LOGGER.debug("Nächster Tageswechsel für %s am %s geplant.", self.schluessel, wechsel)
+
+    def naechster_wechsel(self, heute):
+        """Gibt den nächsten Tag nach heute zurück, an dem sich ein Zustand ändert."""
+        wechsel_tage = self.data["wechsel_tage"]
+        position = bisect_right(wechsel_tage, heute)
+        if position < len(wechsel_tage):
+            return wechsel_tage[position]
+        return None
+
+    @property
+    def api_zustand(self):
+        """Gibt den Zustand des Schutzschalters für den API-Host zurück."""
+        if self._schutzschalter is None:
+            self._schutzschalter = async_hole_schutzschalter(self.hass, API_URL_FERIEN)
+        return self._schutzschalter.zustand
+
+    @property
+    def datenalter(self):
+        """Gibt das Alter der verwendeten Daten in Tagen zurück, None ohne Daten."""
+        if self.data["datenstand"] is None:
+            return None
+        return (dt_util.now().date() - self.data["datenstand"].date()).days
+
+    def _baue_tageskalender(self, heute):
+        """Baut den Tageskalender für das Abruffenster aus get_api_parameter auf."""
+        self.data["tageskalender"] = Tageskalender(
+            self.data["ferien_index"], self.data["feiertag_index"], *self.abruf_fenster(heute)
+        )
+        self.data["wechsel_tage"] = self._berechne_wechsel_tage()
+        self.datenversion += 1
+
+    def _berechne_wechsel_tage(self):
+        """Sammelt alle Tage, an denen sich ein Sensorzustand ändern kann.
+
+        Heute-Sensoren wechseln am Beginn und am Tag nach dem Ende eines
+        Zeitraums, Morgen-Sensoren jeweils einen Tag früher.
+        """
+        tage = set()
+        for index in (self.data["ferien_index"], self.data["feiertag_index"]):
+            for beginn, ende, _name in index.intervalle():
+                tage.update((beginn - 1, beginn, ende, ende + 1))
+        return [date.fromordinal(tag) for tag in sorted(tage)]
+
+    def abruf_fenster(self, heute):
+        """Gibt Beginn und Ende des abgefragten Zeitraums zurück.
+
+        Das Fenster reicht 30 Tage zurück und vorausschau_jahre mal 365 Tage voraus.
+        """
+        return heute - timedelta(days=30), heute + timedelta(days=365 * self.vorausschau_jahre)
+
+    def get_api_parameter(self, heute, beginn=None, ende=None):
+        """Erstellt die API-Parameter für die Anfrage, ohne Bereich für das ganze Fenster."""
+        if beginn is None or ende is None:
+            beginn, ende = self.abruf_fenster(heute)
+        return {
+            "countryIsoCode": self._location["land"],
+            "subdivisionCode": self._location["region"],
+            "validFrom": beginn.strftime("%Y-%m-%d"),
+            "validTo": ende.strftime("%Y-%m-%d"),
+            "languageIsoCode": self._location["iso_code"],
+        }
+
+    def get_landes_parameter(self, heute, beginn=None, ende=None):
+        """Erstellt die API-Parameter für einen landesweiten Abruf ohne Region."""
+        api_parameter = self.get_api_parameter(heute, beginn, ende)
+        del api_parameter["subdivisionCode"]
+        return api_parameter
+
+    async def hole_ferien_daten(self, api_parameter, session, leer_erlaubt=False, abschnitt=None):
+        """Versucht, die Ferientermine von der API abzurufen."""
+        return await self._hole_daten(
+            [API_URL_FERIEN, API_FALLBACK_FERIEN], api_parameter, session, leer_erlaubt, abschnitt
+        )
+
+    async def hole_feiertags_daten(
+        self, api_parameter, session, leer_erlaubt=False, abschnitt=None
+    ):
+        """Versucht, die Feiertagsdaten von der API abzurufen."""
+        return await self._hole_daten(
+            [API_URL_FEIERTAGE, API_FALLBACK_FEIERTAGE], api_parameter, session,
+            leer_erlaubt, abschnitt,
+        )
+
+    async def _hole_daten(self, urls, api_parameter, session, leer_erlaubt=False, abschnitt=None):
+        """Gibt die erste Antwort mit Daten von einer der URLs zurück.
+
+        Mit leer_erlaubt gilt auch eine leere Liste als Antwort, z.B. für
+        ein künftiges Jahr ohne Zeiträume. Mit abschnitt wird die Antwort
+        getrennt von anderen Zeitfenstern im Antwort-Cache abgelegt.
+
+        Ohne Hedging werden die URLs der Reihe nach abgefragt. Mit Hedging
+        startet die nächste URL, sobald die vorherige länger als die
+        Hedge-Verzögerung braucht oder fehlschlägt. Die erste Antwort mit
+        Daten gewinnt, alle übrigen Anfragen werden abgebrochen.
+        """
+        def brauchbar(daten):
+            return bool(daten) or (leer_erlaubt and isinstance(daten, list))
+
+        if self._hedge_verzoegerung is None:
+            for position, url in enumerate(urls):
+                daten = await self._hole_url(url, api_parameter, session, abschnitt)
+                if brauchbar(daten):
+                    self.messwerte.melde_quelle(url, primaer=position == 0)
+                    return daten
+            return None
+
+        laufend = set()
+        url_der_aufgabe = {}
+        try:
+            for position, url in enumerate(urls):
+                aufgabe = asyncio.create_task(
+                    self._hole_url(url, api_parameter, session, abschnitt)
+                )
+                url_der_aufgabe[aufgabe] = url
+                laufend.add(aufgabe)
+                letzte_url = position == len(urls) - 1
+                while laufend:
+                    fertig, laufend = await asyncio.wait(
+                        laufend,
+                        timeout=None if letzte_url else self._hedge_verzoegerung,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    for aufgabe in fertig:
+                        daten = aufgabe.result()
+                        if brauchbar(daten):
+                            url = url_der_aufgabe[aufgabe]
+                            self.messwerte.melde_quelle(url, primaer=url == urls[0])
+                            return daten
+                    if not fertig:
+                        # Hedge-Verzögerung abgelaufen, nächste URL zusätzlich starten
+                        break
+                    if not letzte_url:
+                        # Fehlgeschlagen, nächste URL sofort starten
+                        break
+            return None
+        finally:
+            for aufgabe in laufend:
+                aufgabe.cancel()
+
+    async def _hole_url(self, url, api_parameter, session, abschnitt=None):
+        """Fragt eine einzelne URL ab und gibt bei Fehlern None zurück."""
+        _LOGGER.debug("Prüfe URL: %s", url)
+        cache = self._cache
+        if cache is not None and abschnitt is not None:
+            cache = AbschnittsCache(cache, abschnitt)
+        try:
+            return await fetch_data(
+                url,
+                api_parameter,
+                session,
+                cache,
+                schutzschalter=async_hole_schutzschalter(self.hass, url),
+                messwerte=self.messwerte,
+                bedingt=not self._erzwungen,
+            )
+        except aiohttp.ClientError as e:
+            _LOGGER.error("Fehler beim Abrufen der Daten von %s: %s", url, e)
+        return None
+
+
+def _ermittle_iso_code(hass):
+    """Ermittelt den Sprachcode aus der Home Assistant-Konfiguration."""
+    if hass and hass.config and hass.config.language:
+        return hass.config.language[:2].upper()
+    _LOGGER.warning("Kein Sprachcode konfiguriert, Fallback auf Standard 'DE'.")
+    return "DE"
+
+
+def async_hole_coordinator(hass, entry, brueckentage=None, cache=None):
+    """Gibt den gemeinsamen Coordinator für einen Config Entry zurück.
+
+    Entries mit gleichem (Land, Region, Sprache) erhalten denselben Coordinator.
+    """
+    domain_daten = hass.data.setdefault(DOMAIN, {})
+    coordinators = domain_daten.setdefault("coordinators", {})
+
+    schluessel = (
+        entry.data.get("land"),
+        entry.data.get("region"),
+        _ermittle_iso_code(hass),
+    )
+    coordinator = coordinators.get(schluessel)
+    if coordinator is None:
+        _LOGGER.debug("Erstelle Coordinator für %s.", schluessel)
+        coordinator = SchulferienCoordinator(
+            hass, *schluessel, brueckentage=brueckentage, cache=cache,
+            optionen=fuehre_optionen_zusammen([entry.options]),
+        )
+        coordinators[schluessel] = coordinator
+        coordinator.async_starte_zeitplan()
+    else:
+        _LOGGER.debug("Verwende bestehenden Coordinator für %s.", schluessel)
+
+    coordinator.eintraege.add(entry.entry_id)
+    coordinator.async_setze_eintrag_optionen(entry.entry_id, entry.options)
+    domain_daten[entry.entry_id] = coordinator
+    return coordinator
+
+
+def async_gib_coordinator_frei(hass, entry):
+    """Löst einen Config Entry vom Coordinator und entfernt diesen, wenn er ungenutzt ist."""
+    domain_daten = hass.data.get(DOMAIN, {})
+    coordinator = domain_daten.pop(entry.entry_id, None)
+    if coordinator is None:
+        return
+
+    coordinator.eintraege.discard(entry.entry_id)
+    coordinator.async_setze_eintrag_optionen(entry.entry_id, None)
+    if not coordinator.eintraege:
+        _LOGGER.debug("Entferne ungenutzten Coordinator für %s.", coordinator.schluessel)
+        coordinator.async_stoppe_zeitplan()
+        coordinators = domain_daten.get("coordinators", {})
+        coordinators.pop(coordinator.schluessel, None)
+        land, _region, iso_code = coordinator.schluessel
+        if not any(
+            (anderes_land, andere_sprache) == (land, iso_code)
+            for anderes_land, _andere_region, andere_sprache in coordinators
+        ):
+            domain_daten.get("landesabrufe", {}).pop((land, iso_code), None)
+        if not coordinators:
+            async_gib_session_frei(hass)
@@ -0,0 +1,129 @@
+"""Bereits abgerufene API-Einträge eines Endpunkts für den gleitenden Abruf."""
+
+from datetime import date, timedelta
+
+from .const import NAHBEREICH_TAGE, REVALIDIERUNG_TAGE
+
+
+def jahresabschnitte(von, bis):
+    """Teilt den Bereich von bis bis in ganze Kalenderjahre auf.
+
+    Die Abschnitte reichen immer vom 1. Januar bis zum 31. Dezember, damit
+    die Parameter einer Anfrage über das ganze Jahr gleich bleiben und die
+    Antwort per ETag revalidiert werden kann.
+    """
+    return [(date(jahr, 1, 1), date(jahr, 12, 31)) for jahr in range(von.year, bis.year + 1)]
+
+
+def _eintrag_schluessel(eintrag):
+    """Gibt die API-ID eines Eintrags zurück, ohne ID Start, Ende und Name."""
+    return eintrag.get("id") or (
+        eintrag.get("startDate"), eintrag.get("endDate"), str(eintrag.get("name"))
+    )
+
+
+class Datenbestand:
+    """Merkt sich den abgedeckten Zeitraum und die Einträge eines Endpunkts.
+
+    Abgefragt wird in Jahresabschnitten. Statt jeden Tag das ganze
+    Abruffenster zu laden, wird nur das Jahr nachgeholt, das seit dem
+    letzten Abruf ins Fenster gerückt ist. Alle REVALIDIERUNG_TAGE Tage
+    werden zusätzlich die Jahre mit den nächsten NAHBEREICH_TAGE Tagen neu
+    abgefragt, um Korrekturen der API zu übernehmen. Einträge, die vor dem
+    Fenster enden, werden vorne verworfen.
+    """
+
+    __slots__ = ("von", "bis", "revalidiert", "_eintraege")
+
+    def __init__(self):
+        """Initialisiert einen leeren Bestand."""
+        self.von = None
+        self.bis = None
+        self.revalidiert = None
+        self._eintraege = {}
+
+    def plane(self, beginn, ende, heute):
+        """Gibt die Jahresabschnitte (von, bis) zurück, die abgefragt werden müssen.
+
+        Ohne verwertbaren Bestand sind das alle Jahre des Fensters, sonst
+        höchstens die Jahre des Nahbereichs zur Revalidierung und die Jahre
+        am neuen Ende des Fensters.
+        """
+        if self.von is None or self.von > beginn or self.bis < beginn:
+            return jahresabschnitte(beginn, ende)
+
+        bereiche = set()
+        if self.revalidiert is None or (heute - self.revalidiert).days >= REVALIDIERUNG_TAGE:
+            bereiche.update(jahresabschnitte(
+                max(heute, beginn), min(heute + timedelta(days=NAHBEREICH_TAGE), ende)
+            ))
+        if self.bis < ende:
+            bereiche.update(jahresabschnitte(self.bis + timedelta(days=1), ende))
+        return sorted(bereiche)
+
+    def uebernehme(self, eintraege, von, bis, heute):
+        """Ersetzt alle Einträge, die den Bereich überschneiden, durch die Antwort.
+
+        Die API liefert alle Zeiträume, die den Bereich berühren. Was im
+        Bestand in diesen Bereich fällt, aber nicht mehr geliefert wird, ist
+        daher entfallen.
+        """
+        von_text, bis_text = von.isoformat(), bis.isoformat()
+        if (
+            self.von is None
+            or von > self.bis + timedelta(days=1)
+            or bis < self.von - timedelta(days=1)
+        ):
+            # Nicht anschließend: der alte Bestand ist nicht mehr lückenlos
+            self._eintraege = {}
+            self.von, self.bis = von, bis
+        else:
+            self._eintraege = {
+                schluessel: eintrag for schluessel, eintrag in self._eintraege.items()
+                if eintrag["endDate"] < von_text or eintrag["startDate"] > bis_text
+            }
+            self.von, self.bis = min(self.von, von), max(self.bis, bis)
+        for eintrag in eintraege:
+            self._eintraege[_eintrag_schluessel(eintrag)] = eintrag
+        if von <= heute <= bis:
+            self.revalidiert = heute
+
+    def verwerfe_vor(self, beginn):
+        """Verwirft alle Einträge, die vor beginn enden."""
+        if self.von is None or self.von >= beginn:
+            return
+        beginn_text = beginn.isoformat()
+        self._eintraege = {
+            schluessel: eintrag for schluessel, eintrag in self._eintraege.items()
+            if eintrag["endDate"] >= beginn_text
+        }
+        self.von = beginn
+
+    def verwerfe_nach(self, ende):
+        """Verwirft alle Einträge, die nach ende beginnen, z.B. nach einem kürzeren Horizont."""
+        if self.bis is None or self.bis <= ende:
+            return
+        ende_text = ende.isoformat()
+        self._eintraege = {
+            schluessel: eintrag for schluessel, eintrag in self._eintraege.items()
+            if eintrag["startDate"] <= ende_text
+        }
+        self.bis = ende
+
+    def setze(self, eintraege, von, bis):
+        """Übernimmt einen gespeicherten Bestand, z.B. aus dem Antwort-Cache nach einem Neustart.
+
+        Der Nahbereich gilt danach als nicht revalidiert.
+        """
+        self._eintraege = {_eintrag_schluessel(eintrag): eintrag for eintrag in eintraege}
+        self.von = date.fromisoformat(von)
+        self.bis = date.fromisoformat(bis)
+        self.revalidiert = None
+
+    def eintraege(self):
+        """Gibt alle Einträge nach Startdatum sortiert zurück."""
+        return sorted(self._eintraege.values(), key=lambda eintrag: eintrag["startDate"])
+
+    def __len__(self):
+        """Gibt die Anzahl der Einträge zurück."""
+        return len(self._eintraege)
@@ -0,0 +1,151 @@
+"""Diagnose-Sensoren mit Laufzeiten und Zählern des gemeinsamen Abrufs."""
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import callback
+
+from .messwerte import (
+    ABRUF,
+    AKTUALISIERUNG,
+    PARSEN,
+    QUELLE_FALLBACK,
+    QUELLE_PRIMAER,
+    ZUSTAND_SCHREIBEN,
+)
+
+
+def _dauer(key, name):
+    """Beschreibung für die letzte Laufzeit einer Phase in Millisekunden."""
+    return SensorEntityDescription(
+        key=key,
+        name=name,
+        translation_key=key,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=1,
+    )
+
+
+# Beschreibung -> Phase, deren letzte Laufzeit der Sensor anzeigt
+DAUER_SENSOREN = (
+    (_dauer("aktualisierungsdauer", "Aktualisierungsdauer"), AKTUALISIERUNG),
+    (_dauer("abrufdauer", "Abrufdauer"), ABRUF),
+    (_dauer("parsedauer", "Parsedauer"), PARSEN),
+    (_dauer("schreibdauer", "Schreibdauer"), ZUSTAND_SCHREIBEN),
+)
+
+EMPFANGENE_DATEN_SENSOR = SensorEntityDescription(
+    key="empfangene_daten",
+    name="Empfangene Daten",
+    translation_key="empfangene_daten",
+    entity_category=EntityCategory.DIAGNOSTIC,
+    entity_registry_enabled_default=False,
+    device_class=SensorDeviceClass.DATA_SIZE,
+    state_class=SensorStateClass.TOTAL_INCREASING,
+    native_unit_of_measurement=UnitOfInformation.BYTES,
+)
+
+CACHE_TREFFERQUOTE_SENSOR = SensorEntityDescription(
+    key="cache_trefferquote",
+    name="Cache-Trefferquote",
+    translation_key="cache_trefferquote",
+    entity_category=EntityCategory.DIAGNOSTIC,
+    entity_registry_enabled_default=False,
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=PERCENTAGE,
+)
+
+API_QUELLE_SENSOR = SensorEntityDescription(
+    key="api_quelle",
+    name="API-Quelle",
+    translation_key="api_quelle",
+    entity_category=EntityCategory.DIAGNOSTIC,
+    entity_registry_enabled_default=False,
+    device_class=SensorDeviceClass.ENUM,
+    options=[QUELLE_PRIMAER, QUELLE_FALLBACK],
+)
+
+
+class DiagnoseSensor(SensorEntity):
+    """Zeigt einen Messwert des gemeinsamen Coordinators an.
+
+    Der Wert wird bei jeder Benachrichtigung des Coordinators gelesen,
+    die Sensoren fragen selbst nichts ab.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(self, coordinator, entry_id, description, wert):
+        """Initialisiert den Sensor mit einer Funktion Messwerte -> Zustand."""
+        self.entity_description = description
+        self.coordinator = coordinator
+        self._wert = wert
+        # Pro Config Entry eindeutig, auch wenn sich Entries den Coordinator teilen
+        self._attr_unique_id = f"sensor.schulferien_{description.key}_{entry_id}"
+
+    @property
+    def native_value(self):
+        """Gibt den aktuellen Messwert zurück."""
+        return self._wert(self.coordinator.messwerte)
+
+    async def async_added_to_hass(self):
+        """Registriert den Sensor beim gemeinsamen Coordinator."""
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Schreibt den Zustand nach einer Aktualisierung."""
+        self.async_write_ha_state()
+
+
+class DauerSensor(DiagnoseSensor):
+    """Letzte Laufzeit einer Phase, Mittel und Maximum als Attribute."""
+
+    def __init__(self, coordinator, entry_id, description, phase):
+        """Initialisiert den Sensor für eine Phase aus messwerte.PHASEN."""
+        super().__init__(
+            coordinator, entry_id, description,
+            lambda messwerte: messwerte.histogramme[phase].letzte_ms,
+        )
+        self._phase = phase
+
+    @property
+    def extra_state_attributes(self):
+        """Gibt Anzahl, Mittel und Maximum der Laufzeiten zurück."""
+        histogramm = self.coordinator.messwerte.histogramme[self._phase].als_dict()
+        return {
+            "anzahl": histogramm["anzahl"],
+            "mittel_ms": histogramm["mittel_ms"],
+            "maximum_ms": histogramm["maximum_ms"],
+        }
+
+
+def erstelle_diagnose_sensoren(coordinator, entry_id):
+    """Erstellt alle Diagnose-Sensoren eines Config Entries für seinen Coordinator."""
+    return [
+        *(
+            DauerSensor(coordinator, entry_id, description, phase)
+            for description, phase in DAUER_SENSOREN
+        ),
+        DiagnoseSensor(
+            coordinator, entry_id, EMPFANGENE_DATEN_SENSOR,
+            lambda messwerte: messwerte.bytes_empfangen,
+        ),
+        DiagnoseSensor(
+            coordinator, entry_id, CACHE_TREFFERQUOTE_SENSOR,
+            lambda messwerte: messwerte.cache_trefferquote,
+        ),
+        DiagnoseSensor(
+            coordinator, entry_id, API_QUELLE_SENSOR, lambda messwerte: messwerte.letzte_quelle
+        ),
+    ]
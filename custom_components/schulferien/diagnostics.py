@@ -0,0 +1,51 @@
+"""Diagnose-Download für die Schulferien-Integration."""
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import DOMAIN, ICS_TOKEN
+
+# Geheimnisse, die nicht im Diagnose-Download landen dürfen
+ZU_SCHWAERZEN = {ICS_TOKEN}
+
+
+def _als_text(wert):
+    """Gibt Datums- und Zeitangaben als ISO-Text zurück."""
+    return None if wert is None else wert.isoformat()
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Gibt Datenstand, Messwerte und HTTP-Zustand für einen Config Entry zurück."""
+    domain_daten = hass.data.get(DOMAIN, {})
+    coordinator = domain_daten.get(entry.entry_id)
+    diagnose = {
+        "eintrag": {
+            "titel": entry.title,
+            "daten": async_redact_data(dict(entry.data), ZU_SCHWAERZEN),
+            "optionen": dict(entry.options),
+        },
+    }
+    if coordinator is not None:
+        tageskalender = coordinator.data["tageskalender"]
+        diagnose["coordinator"] = {
+            "schluessel": list(coordinator.schluessel),
+            "eintraege": sorted(coordinator.eintraege),
+            "datenversion": coordinator.datenversion,
+            "letztes_update": _als_text(coordinator.data["letztes_update"]),
+            "datenstand": _als_text(coordinator.data["datenstand"]),
+            "datenalter": coordinator.datenalter,
+            "api_zustand": coordinator.api_zustand,
+            "ferien": len(coordinator.data["ferien_index"]),
+            "feiertage": len(coordinator.data["feiertag_index"]),
+            "berechnete_brueckentage": len(coordinator.data["berechnete_brueckentage"]),
+            "tageskalender": [_als_text(tageskalender.start), _als_text(tageskalender.ende)],
+        }
+        diagnose["messwerte"] = coordinator.messwerte.als_dict()
+
+    zaehler = domain_daten.get("verbindungen")
+    if zaehler is not None:
+        diagnose["verbindungen"] = zaehler.als_dict()
+    diagnose["schutzschalter"] = {
+        host: {"zustand": schalter.zustand, "fehler_in_folge": schalter.fehler_in_folge}
+        for host, schalter in domain_daten.get("schutzschalter", {}).items()
+    }
+    return diagnose
@@ -0,0 +1,148 @@
+"""Sortierter Index über Ferien- und Feiertagszeiträume."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from operator import itemgetter
+
+
+class Zeitraum:
+    """Ein Ferien- oder Feiertagszeitraum, Start und Ende jeweils einschließlich."""
+
+    __slots__ = ("name", "start_datum", "end_datum")
+
+    def __init__(self, name, start_datum, end_datum):
+        """Initialisiert den Zeitraum."""
+        self.name = name
+        self.start_datum = start_datum
+        self.end_datum = end_datum
+
+    def __eq__(self, other):
+        """Vergleicht Name, Start und Ende."""
+        if not isinstance(other, Zeitraum):
+            return NotImplemented
+        return (self.name, self.start_datum, self.end_datum) == (
+            other.name, other.start_datum, other.end_datum
+        )
+
+    def __hash__(self):
+        """Gibt den Hash aus Name, Start und Ende zurück."""
+        return hash((self.name, self.start_datum, self.end_datum))
+
+    def __repr__(self):
+        """Gibt eine lesbare Darstellung zurück."""
+        return f"Zeitraum({self.name!r}, {self.start_datum!r}, {self.end_datum!r})"
+
+
+class FerienIndex:
+    """Beantwortet Datumsabfragen auf einer Liste von Zeiträumen in O(log n).
+
+    Die Zeiträume werden einmalig nach Startdatum sortiert und spaltenweise
+    abgelegt: Start und Ende als Ordinalzahlen in array('i'), der Name als
+    Nummer in eine Tabelle, in der jeder Name nur einmal vorkommt. Zusätzlich
+    wird für jede Position das größte Enddatum aller Zeiträume bis zu dieser
+    Position gespeichert. Damit lassen sich auch überlappende Zeiträume (z.B.
+    ein Brückentag innerhalb der Ferien) per Binärsuche finden.
+    """
+
+    __slots__ = ("_namen", "_name_nummern", "_starts", "_enden", "_max_enden")
+
+    def __init__(self, zeitraeume=None):
+        """Erstellt den Index aus Zeiträumen.
+
+        Args:
+            zeitraeume (iterable): Zeitraum-Objekte, z.B. aus iter_daten.
+        """
+        nummern = {}
+        # sorted() ist stabil: bei gleichem Start bleibt die API-Reihenfolge erhalten
+        zeilen = sorted(
+            (
+                (
+                    zeitraum.start_datum.toordinal(),
+                    zeitraum.end_datum.toordinal(),
+                    nummern.setdefault(zeitraum.name, len(nummern)),
+                )
+                for zeitraum in zeitraeume or ()
+            ),
+            key=itemgetter(0),
+        )
+        self._namen = list(nummern)
+        self._starts = array("i", map(itemgetter(0), zeilen))
+        self._enden = array("i", map(itemgetter(1), zeilen))
+        self._name_nummern = array("I", map(itemgetter(2), zeilen))
+        self._max_enden = array("i")
+        max_ende = None
+        for ende in self._enden:
+            if max_ende is None or ende > max_ende:
+                max_ende = ende
+            self._max_enden.append(max_ende)
+
+    def __len__(self):
+        """Gibt die Anzahl der Zeiträume zurück."""
+        return len(self._starts)
+
+    def __getitem__(self, position):
+        """Gibt den Zeitraum an einer Position in Startreihenfolge zurück."""
+        if position < 0:
+            position += len(self._starts)
+        if not 0 <= position < len(self._starts):
+            raise IndexError("FerienIndex-Position außerhalb des Bereichs")
+        return Zeitraum(
+            self._namen[self._name_nummern[position]],
+            date.fromordinal(self._starts[position]),
+            date.fromordinal(self._enden[position]),
+        )
+
+    def __iter__(self):
+        """Iteriert über die Zeiträume in Startreihenfolge."""
+        for position in range(len(self._starts)):
+            yield self[position]
+
+    def intervalle(self):
+        """Iteriert über (Start-Ordinalzahl, End-Ordinalzahl, Name) ohne Datumsobjekte."""
+        namen = self._namen
+        for start, ende, nummer in zip(self._starts, self._enden, self._name_nummern):
+            yield start, ende, namen[nummer]
+
+    def finde(self, datum):
+        """Gibt den Zeitraum zurück, der das Datum enthält, sonst None.
+
+        Enthalten mehrere Zeiträume das Datum, wird der zuerst begonnene geliefert.
+        """
+        ordinal = datum.toordinal()
+        treffer = None
+        position = bisect_right(self._starts, ordinal) - 1
+        while position >= 0 and self._max_enden[position] >= ordinal:
+            if self._enden[position] >= ordinal:
+                treffer = position
+            position -= 1
+        return None if treffer is None else self[treffer]
+
+    def enthaelt(self, datum):
+        """Prüft, ob das Datum in einem der Zeiträume liegt."""
+        ordinal = datum.toordinal()
+        position = bisect_right(self._starts, ordinal) - 1
+        return position >= 0 and self._max_enden[position] >= ordinal
+
+    def im_bereich(self, start, ende):
+        """Gibt alle Zeiträume zurück, die den Bereich von start bis einschließlich ende berühren.
+
+        Die erste Position, deren größtes Enddatum start erreicht, und die
+        letzte, die vor oder an ende beginnt, liefern zwei Binärsuchen.
+        Dazwischen werden nur noch Zeiträume übersprungen, die innerhalb
+        eines längeren Zeitraums vor start enden.
+        """
+        start_ordinal = start.toordinal()
+        erste = bisect_left(self._max_enden, start_ordinal)
+        letzte = bisect_right(self._starts, ende.toordinal())
+        return [
+            self[position] for position in range(erste, letzte)
+            if self._enden[position] >= start_ordinal
+        ]
+
+    def naechster_nach(self, datum):
+        """Gibt den ersten Zeitraum zurück, der nach dem Datum beginnt, sonst None."""
+        position = bisect_right(self._starts, datum.toordinal())
+        if position < len(self._starts):
+            return self[position]
+        return None
@@ -0,0 +1,244 @@
+"""iCalendar-Feed (.ics) der Ferien, Feiertage und Brückentage pro Config Entry."""
+
+import hashlib
+import hmac
+import logging
+import secrets
+from datetime import timedelta
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BRUECKENTAG_BERECHNET_NAME,
+    BRUECKENTAG_NAME,
+    DOMAIN,
+    ICS_CACHE_CONTROL,
+    ICS_TOKEN,
+    ICS_TOKEN_BYTES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ICS_URL = "/api/schulferien/{entry_id}/{token}.ics"
+
+# Kategorien der Termine im Feed
+KATEGORIE_SCHULFERIEN = "Schulferien"
+KATEGORIE_FEIERTAG = "Feiertag"
+KATEGORIE_BRUECKENTAG = "Brückentag"
+
+# Zeilen dürfen laut RFC 5545 höchstens 75 Oktette lang sein
+_MAXIMALE_ZEILENLAENGE = 75
+
+
+def _maskiere(text):
+    """Maskiert Sonderzeichen in einem TEXT-Wert nach RFC 5545."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _falte(zeile):
+    """Bricht eine Inhaltszeile nach höchstens 75 Oktetten um.
+
+    Folgezeilen beginnen mit einem Leerzeichen, UTF-8-Zeichen werden dabei
+    nicht zerteilt.
+    """
+    if len(zeile.encode()) <= _MAXIMALE_ZEILENLAENGE:
+        return zeile
+    teile = []
+    aktuell, laenge = "", 0
+    for zeichen in zeile:
+        breite = len(zeichen.encode())
+        # Folgezeilen haben wegen des führenden Leerzeichens ein Oktett weniger Platz
+        grenze = _MAXIMALE_ZEILENLAENGE if not teile else _MAXIMALE_ZEILENLAENGE - 1
+        if laenge + breite > grenze:
+            teile.append(aktuell)
+            aktuell, laenge = "", 0
+        aktuell += zeichen
+        laenge += breite
+    teile.append(aktuell)
+    return "\r\n ".join(teile)
+
+
+def kategorie_fuer(zeitraum, art):
+    """Gibt die Kategorie eines Zeitraums aus dem Ferien- oder Feiertagsindex zurück."""
+    if art == "feiertage":
+        return KATEGORIE_FEIERTAG
+    if zeitraum.name in (BRUECKENTAG_NAME, BRUECKENTAG_BERECHNET_NAME):
+        return KATEGORIE_BRUECKENTAG
+    return KATEGORIE_SCHULFERIEN
+
+
+def erzeuge_termin(zeitraum, kategorie, standort, zeitstempel):
+    """Erzeugt einen ganztägigen VEVENT-Block inklusive abschließendem Zeilenumbruch.
+
+    Args:
+        zeitraum (Zeitraum): Start und Ende jeweils einschließlich.
+        kategorie (str): Eine der KATEGORIE_*-Konstanten.
+        standort (str): Region, z.B. "DE-BY", Teil der UID.
+        zeitstempel (datetime): Wert für DTSTAMP in UTC.
+
+    Returns:
+        str: Der Block mit CRLF-Zeilenenden.
+    """
+    kennung = hashlib.sha1(
+        f"{kategorie}|{zeitraum.name}".encode(), usedforsecurity=False
+    ).hexdigest()[:12]
+    zeilen = (
+        "BEGIN:VEVENT",
+        f"UID:{zeitraum.start_datum:%Y%m%d}-{kennung}-{standort}@{DOMAIN}",
+        f"DTSTAMP:{zeitstempel:%Y%m%dT%H%M%SZ}",
+        f"DTSTART;VALUE=DATE:{zeitraum.start_datum:%Y%m%d}",
+        # DTEND ist bei ganztägigen Terminen exklusiv
+        f"DTEND;VALUE=DATE:{zeitraum.end_datum + timedelta(days=1):%Y%m%d}",
+        f"SUMMARY:{_maskiere(zeitraum.name)}",
+        f"CATEGORIES:{_maskiere(kategorie)}",
+        "TRANSP:TRANSPARENT",
+        "END:VEVENT",
+    )
+    return "".join(_falte(zeile) + "\r\n" for zeile in zeilen)
+
+
+class IcsFeed:
+    """Hält den serialisierten Feed eines Config Entries samt ETag vor.
+
+    Der Feed wird nur neu erzeugt, wenn sich die Datenversion des
+    Coordinators geändert hat. Dabei werden die VEVENT-Blöcke unveränderter
+    Zeiträume wiederverwendet, nur neue Zeiträume werden serialisiert. Da
+    DTSTAMP beim ersten Serialisieren festgelegt wird, bleiben Inhalt und
+    ETag gleich, solange sich die Zeiträume nicht ändern.
+    """
+
+    __slots__ = ("_name", "_standort", "_version", "_termine", "body", "etag")
+
+    def __init__(self, name, standort):
+        """Initialisiert den Feed mit Kalendername und Standort für die UIDs."""
+        self._name = name
+        self._standort = standort
+        self._version = None
+        self._termine = {}
+        self.body = b""
+        self.etag = None
+
+    def aktualisiere(self, coordinator):
+        """Erzeugt den Feed neu, wenn sich die Daten des Coordinators geändert haben.
+
+        Returns:
+            bool: True, wenn neu erzeugt wurde.
+        """
+        if coordinator.datenversion == self._version:
+            return False
+
+        zeitstempel = dt_util.utcnow()
+        termine = {}
+        for art, index in (
+            ("ferien", coordinator.data["ferien_index"]),
+            ("feiertage", coordinator.data["feiertag_index"]),
+        ):
+            for zeitraum in index:
+                kategorie = kategorie_fuer(zeitraum, art)
+                schluessel = (kategorie, zeitraum)
+                if schluessel not in termine:
+                    termine[schluessel] = self._termine.get(schluessel) or erzeuge_termin(
+                        zeitraum, kategorie, self._standort, zeitstempel
+                    )
+
+        kopf = "".join(_falte(zeile) + "\r\n" for zeile in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:-//{DOMAIN}//Home Assistant//DE",
+            "CALSCALE:GREGORIAN",
+            f"X-WR-CALNAME:{_maskiere(self._name)}",
+        ))
+        self.body = "".join((kopf, *termine.values(), "END:VCALENDAR\r\n")).encode()
+        self.etag = f'"{hashlib.sha1(self.body, usedforsecurity=False).hexdigest()}"'
+        self._termine = termine
+        self._version = coordinator.datenversion
+        _LOGGER.debug("iCalendar-Feed für %s neu erzeugt: %d Termine", self._name, len(termine))
+        return True
+
+
+def etag_passt(if_none_match, etag):
+    """Prüft If-None-Match gegen den ETag (schwacher Vergleich nach RFC 9110)."""
+    if not if_none_match or etag is None:
+        return False
+    for kandidat in if_none_match.split(","):
+        kandidat = kandidat.strip()
+        if kandidat == "*" or kandidat.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def async_sichere_ics_token(hass, entry):
+    """Legt beim ersten Start eines Config Entries das zufällige Token des Feeds an."""
+    if entry.data.get(ICS_TOKEN):
+        return
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, ICS_TOKEN: secrets.token_urlsafe(ICS_TOKEN_BYTES)}
+    )
+
+
+def ics_pfad(entry):
+    """Gibt den Pfad des Feeds eines Config Entries samt Token zurück."""
+    return ICS_URL.format(entry_id=entry.entry_id, token=entry.data.get(ICS_TOKEN, ""))
+
+
+class SchulferienIcsView(HomeAssistantView):
+    """Liefert den iCalendar-Feed eines Config Entries aus.
+
+    Kalender-Clients wie Google Kalender können keinen Bearer-Token
+    mitsenden, daher ist keine Anmeldung nötig. Stattdessen enthält die URL
+    ein zufälliges Token pro Entry. Die Entry-ID allein, die z.B. in
+    Diagnose und Oberfläche sichtbar ist, genügt nicht.
+    """
+
+    url = ICS_URL
+    name = "api:schulferien:ics"
+    requires_auth = False
+
+    def __init__(self, hass):
+        """Initialisiert die View mit leerem Feed-Speicher."""
+        self.hass = hass
+        self._feeds = {}
+
+    async def get(self, request, entry_id, token):
+        """Beantwortet GET mit dem Feed oder 304, wenn der ETag passt.
+
+        Ein falsches Token wird wie ein unbekannter Entry mit 404 beantwortet.
+        """
+        entry = self.hass.config_entries.async_get_entry(entry_id)
+        coordinator = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        if entry is None or entry.domain != DOMAIN or coordinator is None:
+            self._feeds.pop(entry_id, None)
+            return web.Response(status=404)
+        erwartet = entry.data.get(ICS_TOKEN)
+        if not erwartet or not hmac.compare_digest(token.encode(), erwartet.encode()):
+            return web.Response(status=404)
+
+        feed = self._feeds.get(entry_id)
+        if feed is None:
+            _land, region, _iso_code = coordinator.schluessel
+            feed = self._feeds[entry_id] = IcsFeed(entry.title, region)
+        feed.aktualisiere(coordinator)
+
+        headers = {"ETag": feed.etag, "Cache-Control": ICS_CACHE_CONTROL}
+        if etag_passt(request.headers.get("If-None-Match"), feed.etag):
+            return web.Response(status=304, headers=headers)
+        return web.Response(
+            body=feed.body, content_type="text/calendar", charset="utf-8", headers=headers
+        )
+
+
+def async_registriere_ics_view(hass):
+    """Registriert die View einmalig für alle Config Entries."""
+    domain_daten = hass.data.setdefault(DOMAIN, {})
+    if "ics_view" in domain_daten:
+        return
+    domain_daten["ics_view"] = SchulferienIcsView(hass)
+    hass.http.register_view(domain_daten["ics_view"])
@@ -0,0 +1,187 @@
+"""Zwischengespeicherte Länder- und Regionslisten für den Konfigurations-Flow."""
+
+import asyncio
+import logging
+from datetime import timedelta
+
+import aiohttp
+from homeassistant.util import dt as dt_util
+
+from .api_utils import async_hole_session
+from .cache import GespeicherteEintraege
+from .const import API_URL_LAENDER, API_URL_REGIONEN, DOMAIN, KATALOG_GUELTIGKEIT
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.katalog"
+
+
+def laender_schluessel(sprache):
+    """Schlüssel der Länderliste in einer Sprache."""
+    return f"laender/{sprache}"
+
+
+def regionen_schluessel(land, sprache):
+    """Schlüssel der Regionsliste eines Landes in einer Sprache."""
+    return f"regionen/{land}/{sprache}"
+
+
+def _namen_nach_code(eintraege, code_feld, sprache):
+    """Bildet {Code: Name in der Sprache} aus einer Länder- oder Regionsliste."""
+    return {
+        eintrag[code_feld]: next(
+            (name["text"] for name in eintrag["name"] if name["language"] == sprache),
+            eintrag[code_feld],  # Fallback
+        )
+        for eintrag in eintraege if "name" in eintrag
+    }
+
+
+async def _async_lade_liste(session, url, parameter, code_feld, sprache, bezeichnung):
+    """Holt eine Länder- oder Regionsliste von der API, bei Fehlern {}."""
+    try:
+        async with session.get(url, params=parameter) as response:
+            if response.status != 200:
+                _LOGGER.error("Fehler beim Abrufen der %s: HTTP %s", bezeichnung, response.status)
+                return {}
+            eintraege = await response.json()
+            _LOGGER.debug("API-Antwort für %s: %d Einträge", bezeichnung, len(eintraege))
+            return _namen_nach_code(eintraege, code_feld, sprache)
+    except (KeyError, ValueError, TypeError) as error:
+        _LOGGER.error("Fehler beim Verarbeiten der API-Antwort für %s: %s", bezeichnung, error)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+        _LOGGER.error("Netzwerkfehler beim Abrufen der %s: %s", bezeichnung, error)
+    return {}
+
+
+async def async_lade_laender(session, sprache):
+    """Holt die unterstützten Länder als {ISO-Code: Name}."""
+    return await _async_lade_liste(
+        session, API_URL_LAENDER, {"languageIsoCode": sprache}, "isoCode", sprache, "Länder"
+    )
+
+
+async def async_lade_regionen(session, land, sprache):
+    """Holt die Regionen eines Landes als {Code: Name}."""
+    return await _async_lade_liste(
+        session,
+        API_URL_REGIONEN,
+        {"countryIsoCode": land, "languageIsoCode": sprache},
+        "code",
+        sprache,
+        "Regionen",
+    )
+
+
+class KatalogCache(GespeicherteEintraege):
+    """Hält Länder- und Regionslisten mit Ablaufzeit über Neustarts hinweg.
+
+    Der Cache wird von allen Flow-Instanzen geteilt. Gleichzeitige Anfragen
+    nach derselben Liste warten auf denselben Abruf. Schlägt ein Abruf fehl,
+    wird eine abgelaufene Liste weiter verwendet, sofern vorhanden.
+    """
+
+    def __init__(self, hass, gueltigkeit=KATALOG_GUELTIGKEIT):
+        """Initialisiert den Cache mit einem Home Assistant Store."""
+        super().__init__(hass, STORAGE_KEY, "Katalog")
+        self._hass = hass
+        self._gueltigkeit = timedelta(seconds=gueltigkeit)
+        self._laufend = {}
+
+    def hole(self, schluessel):
+        """Gibt eine noch gültige Liste zurück, sonst None."""
+        eintrag = self._eintraege.get(schluessel)
+        if not eintrag:
+            return None
+        gespeichert = dt_util.parse_datetime(eintrag.get("gespeichert") or "")
+        if gespeichert is None or dt_util.now() - gespeichert > self._gueltigkeit:
+            return None
+        return eintrag["daten"]
+
+    def speichere(self, schluessel, daten):
+        """Speichert eine Liste und plant das Schreiben auf die Platte ein."""
+        self._eintraege[schluessel] = {
+            "daten": daten,
+            "gespeichert": dt_util.now().isoformat(),
+        }
+        self._plane_speichern()
+
+    async def async_hole(self, schluessel, abrufen):
+        """Gibt die Liste aus dem Cache zurück oder holt sie mit abrufen().
+
+        Args:
+            schluessel (str): Schlüssel aus laender_schluessel/regionen_schluessel.
+            abrufen (callable): Coroutine-Funktion, die die Liste als dict liefert.
+        """
+        daten = self.hole(schluessel)
+        if daten is not None:
+            return daten
+
+        laufend = self._laufend.get(schluessel)
+        if laufend is None:
+            laufend = self._hass.async_create_task(self._async_abrufen(schluessel, abrufen))
+            self._laufend[schluessel] = laufend
+        # shield: bricht ein Flow ab, läuft der gemeinsame Abruf für die anderen weiter
+        return await asyncio.shield(laufend)
+
+    def starte_vorabruf(self, schluessel, abrufen):
+        """Holt eine Liste im Hintergrund, falls sie fehlt oder abgelaufen ist."""
+        if self.hole(schluessel) is not None or schluessel in self._laufend:
+            return
+        _LOGGER.debug("Starte Vorabruf für %s", schluessel)
+        self._laufend[schluessel] = self._hass.async_create_background_task(
+            self._async_abrufen(schluessel, abrufen), f"{DOMAIN} Vorabruf {schluessel}"
+        )
+
+    async def _async_abrufen(self, schluessel, abrufen):
+        """Ruft eine Liste ab und speichert sie, bei Fehlschlag die alte Liste."""
+        try:
+            daten = await abrufen()
+        finally:
+            self._laufend.pop(schluessel, None)
+        if daten:
+            self.speichere(schluessel, daten)
+            return daten
+        veraltet = self._eintraege.get(schluessel)
+        if veraltet:
+            _LOGGER.warning("Verwende abgelaufene Liste für %s", schluessel)
+            return veraltet["daten"]
+        return {}
+
+
+async def async_hole_katalog(hass):
+    """Gibt den geladenen, integrationsweiten Katalog-Cache zurück."""
+    domain_daten = hass.data.setdefault(DOMAIN, {})
+    katalog = domain_daten.get("katalog")
+    if katalog is None:
+        katalog = KatalogCache(hass)
+        domain_daten["katalog"] = katalog
+    await katalog.async_laden()
+    return katalog
+
+
+async def async_hole_laender(hass, sprache):
+    """Gibt die unterstützten Länder aus dem Katalog oder von der API zurück."""
+    katalog = await async_hole_katalog(hass)
+    return await katalog.async_hole(
+        laender_schluessel(sprache),
+        lambda: async_lade_laender(async_hole_session(hass), sprache),
+    )
+
+
+async def async_hole_regionen(hass, land, sprache):
+    """Gibt die Regionen eines Landes aus dem Katalog oder von der API zurück."""
+    katalog = await async_hole_katalog(hass)
+    return await katalog.async_hole(
+        regionen_schluessel(land, sprache),
+        lambda: async_lade_regionen(async_hole_session(hass), land, sprache),
+    )
+
+
+async def async_starte_regionen_vorabruf(hass, land, sprache):
+    """Lädt die Regionen eines Landes vorsorglich im Hintergrund."""
+    katalog = await async_hole_katalog(hass)
+    katalog.starte_vorabruf(
+        regionen_schluessel(land, sprache),
+        lambda: async_lade_regionen(async_hole_session(hass), land, sprache),
+    )
@@ -0,0 +1,125 @@
+"""Landesweiter Abruf, der lokal auf die einzelnen Regionen verteilt wird."""
+
+import asyncio
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def verteile_auf_regionen(json_daten, regionen):
+    """Verteilt die Einträge einer landesweiten Antwort auf die Regionen.
+
+    Ein Eintrag gehört zu einer Region, wenn er landesweit gilt oder einer
+    seiner Unterteilungscodes der Region selbst oder einer übergeordneten
+    Unterteilung entspricht (z.B. "CH-BE" für "CH-BE-BI").
+
+    Args:
+        json_daten (list): JSON-Daten einer Anfrage ohne subdivisionCode.
+        regionen (iterable): Unterteilungscodes, z.B. ["DE-BY", "DE-NW"].
+
+    Returns:
+        dict: Region -> Liste der zugehörigen Einträge in API-Reihenfolge.
+    """
+    verteilung = {region: [] for region in regionen}
+
+    # Jeder Code (inklusive übergeordneter Codes) zeigt auf die Regionen, die er abdeckt
+    zuordnung = {}
+    for region in verteilung:
+        teile = region.split("-")
+        for laenge in range(2, len(teile) + 1):
+            zuordnung.setdefault("-".join(teile[:laenge]), []).append(region)
+
+    alle = list(verteilung.values())
+    for eintrag in json_daten or []:
+        if eintrag.get("nationwide"):
+            for liste in alle:
+                liste.append(eintrag)
+            continue
+
+        getroffen = set()
+        for unterteilung in eintrag.get("subdivisions") or []:
+            getroffen.update(zuordnung.get(unterteilung.get("code"), ()))
+        for region in getroffen:
+            verteilung[region].append(eintrag)
+
+    return verteilung
+
+
+class LandesAbruf:
+    """Teilt einen landesweiten Abruf zwischen allen Coordinators eines Landes.
+
+    Pro Tag wird höchstens einmal erfolgreich abgerufen. Gleichzeitige
+    Aufrufe warten auf denselben laufenden Abruf, statt selbst anzufragen.
+    """
+
+    def __init__(self, land, iso_code):
+        """Initialisiert den Abruf für ein Land und eine Sprache."""
+        self.land = land
+        self.iso_code = iso_code
+        self._stand = None
+        self._laufend = None
+        self._ferien = None
+        self._feiertage = None
+        self._verteilung_ferien = {}
+        self._verteilung_feiertage = {}
+
+    async def async_hole(self, heute, region, regionen, abrufen):
+        """Gibt die Ferien- und Feiertagseinträge einer Region zurück.
+
+        Args:
+            heute (date): Aktueller Tag, pro Tag wird einmal abgerufen.
+            region (str): Region, deren Einträge benötigt werden.
+            regionen (iterable): Alle Regionen des Landes, auf die beim
+                Abruf verteilt wird.
+            abrufen (callable): Liefert ein Awaitable mit (ferien, feiertage)
+                für die landesweiten Parameter.
+
+        Returns:
+            tuple: (ferien, feiertage), jeweils None, wenn keine Daten vorliegen.
+        """
+        if self._stand != heute:
+            if self._laufend is None:
+                self._laufend = asyncio.ensure_future(
+                    self._async_abrufen(heute, regionen, abrufen)
+                )
+            await asyncio.shield(self._laufend)
+        return self.fuer_region(region)
+
+    async def _async_abrufen(self, heute, regionen, abrufen):
+        """Führt den landesweiten Abruf aus und verteilt das Ergebnis."""
+        try:
+            ferien, feiertage = await abrufen()
+            if ferien:
+                self._ferien = ferien
+                self._verteilung_ferien = verteile_auf_regionen(ferien, regionen)
+            if feiertage:
+                self._feiertage = feiertage
+                self._verteilung_feiertage = verteile_auf_regionen(feiertage, regionen)
+            if ferien and feiertage:
+                self._stand = heute
+            _LOGGER.debug(
+                "Landesweiter Abruf für %s auf %d Regionen verteilt.",
+                self.land, len(self._verteilung_ferien),
+            )
+        finally:
+            self._laufend = None
+
+    def verwerfe_stand(self):
+        """Sorgt dafür, dass der nächste Aufruf erneut landesweit abruft."""
+        self._stand = None
+
+    def fuer_region(self, region):
+        """Gibt die bereits abgerufenen Einträge einer Region zurück."""
+        return (
+            self._hole_verteilt(self._ferien, self._verteilung_ferien, region),
+            self._hole_verteilt(self._feiertage, self._verteilung_feiertage, region),
+        )
+
+    @staticmethod
+    def _hole_verteilt(json_daten, verteilung, region):
+        """Verteilt bei Bedarf nachträglich auf eine neu hinzugekommene Region."""
+        if not json_daten:
+            return None
+        if region not in verteilung:
+            verteilung.update(verteile_auf_regionen(json_daten, [region]))
+        return verteilung[region]
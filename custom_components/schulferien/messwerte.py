@@ -0,0 +1,148 @@
+"""Laufzeitmessungen für Abruf, Verarbeitung und Zustandsschreiben eines Standorts."""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from .const import MESSWERTE_GRENZEN_MS
+
+# Phasen, für die Laufzeiten erfasst werden
+AKTUALISIERUNG = "aktualisierung"
+ABRUF = "abruf"
+PARSEN = "parsen"
+VERARBEITUNG = "verarbeitung"
+ZUSTAND_SCHREIBEN = "zustand_schreiben"
+PHASEN = (AKTUALISIERUNG, ABRUF, PARSEN, VERARBEITUNG, ZUSTAND_SCHREIBEN)
+
+# Herkunft einer verwendeten API-Antwort
+QUELLE_PRIMAER = "primaer"
+QUELLE_FALLBACK = "fallback"
+
+
+class Histogramm:
+    """Laufzeit-Histogramm mit festen Grenzen in Millisekunden.
+
+    Ein Wert landet im ersten Eimer, dessen Grenze er nicht überschreitet,
+    alle größeren Werte im letzten Eimer "inf".
+    """
+
+    def __init__(self, grenzen=MESSWERTE_GRENZEN_MS):
+        """Initialisiert ein leeres Histogramm."""
+        self._grenzen = tuple(grenzen)
+        self._eimer = [0] * (len(self._grenzen) + 1)
+        self.anzahl = 0
+        self.summe_ms = 0.0
+        self.maximum_ms = None
+        self.letzte_ms = None
+
+    def erfasse(self, sekunden):
+        """Erfasst eine Laufzeit in Sekunden."""
+        millisekunden = sekunden * 1000
+        self._eimer[bisect_left(self._grenzen, millisekunden)] += 1
+        self.anzahl += 1
+        self.summe_ms += millisekunden
+        self.letzte_ms = millisekunden
+        if self.maximum_ms is None or millisekunden > self.maximum_ms:
+            self.maximum_ms = millisekunden
+
+    @property
+    def mittel_ms(self):
+        """Gibt die mittlere Laufzeit zurück, None ohne Messungen."""
+        return self.summe_ms / self.anzahl if self.anzahl else None
+
+    def als_dict(self):
+        """Gibt Kennzahlen und Eimer (Obergrenze in ms -> Anzahl) zurück."""
+        return {
+            "anzahl": self.anzahl,
+            "letzte_ms": _runde(self.letzte_ms),
+            "mittel_ms": _runde(self.mittel_ms),
+            "maximum_ms": _runde(self.maximum_ms),
+            "eimer": {
+                **{f"<={grenze}": anzahl for grenze, anzahl in zip(self._grenzen, self._eimer)},
+                "inf": self._eimer[-1],
+            },
+        }
+
+
+def _runde(wert):
+    """Rundet Millisekunden auf drei Nachkommastellen."""
+    return None if wert is None else round(wert, 3)
+
+
+class Messwerte:
+    """Sammelt Laufzeiten und Zähler eines Coordinators seit dem Start.
+
+    Gemessen wird mit time.perf_counter, eine Messung kostet also nur
+    zwei Uhrzeitabfragen und einen Eintrag ins Histogramm.
+    """
+
+    def __init__(self):
+        """Initialisiert Histogramme für alle PHASEN und leere Zähler."""
+        self.histogramme = {phase: Histogramm() for phase in PHASEN}
+        self.bytes_empfangen = 0
+        self.bytes_letzte_aktualisierung = 0
+        self.eintraege_geparst = 0
+        self.eintraege_letzte_aktualisierung = 0
+        self.cache_treffer = 0
+        self.cache_fehlschlaege = 0
+        self.quellen = {}
+        self.letzte_quelle = None
+
+    @contextmanager
+    def messe(self, phase):
+        """Misst die Laufzeit des umschlossenen Blocks für phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogramme[phase].erfasse(time.perf_counter() - start)
+
+    def beginne_aktualisierung(self):
+        """Setzt die Zähler der letzten Aktualisierung zurück."""
+        self.bytes_letzte_aktualisierung = 0
+        self.eintraege_letzte_aktualisierung = 0
+
+    def zaehle_bytes(self, anzahl):
+        """Zählt empfangene Bytes einer API-Antwort."""
+        self.bytes_empfangen += anzahl
+        self.bytes_letzte_aktualisierung += anzahl
+
+    def zaehle_eintraege(self, anzahl):
+        """Zählt in Indizes übernommene Zeiträume."""
+        self.eintraege_geparst += anzahl
+        self.eintraege_letzte_aktualisierung += anzahl
+
+    def melde_cache(self, treffer):
+        """Zählt einen Cache-Treffer (304) oder -Fehlschlag."""
+        if treffer:
+            self.cache_treffer += 1
+        else:
+            self.cache_fehlschlaege += 1
+
+    @property
+    def cache_trefferquote(self):
+        """Gibt den Anteil der Cache-Treffer in Prozent zurück, None ohne Anfragen."""
+        gesamt = self.cache_treffer + self.cache_fehlschlaege
+        return round(100 * self.cache_treffer / gesamt, 1) if gesamt else None
+
+    def melde_quelle(self, url, primaer):
+        """Merkt sich, welche URL eine verwendete Antwort geliefert hat."""
+        self.quellen[url] = self.quellen.get(url, 0) + 1
+        self.letzte_quelle = QUELLE_PRIMAER if primaer else QUELLE_FALLBACK
+
+    def als_dict(self):
+        """Gibt alle Messwerte für die Diagnose zurück."""
+        return {
+            "laufzeiten": {
+                phase: histogramm.als_dict() for phase, histogramm in self.histogramme.items()
+            },
+            "bytes_empfangen": self.bytes_empfangen,
+            "bytes_letzte_aktualisierung": self.bytes_letzte_aktualisierung,
+            "eintraege_geparst": self.eintraege_geparst,
+            "eintraege_letzte_aktualisierung": self.eintraege_letzte_aktualisierung,
+            "cache_treffer": self.cache_treffer,
+            "cache_fehlschlaege": self.cache_fehlschlaege,
+            "cache_trefferquote": self.cache_trefferquote,
+            "letzte_quelle": self.letzte_quelle,
+            "quellen": dict(self.quellen),
+        }
@@ -0,0 +1,114 @@
+"""Profilieren eines vollständigen Aktualisierungszyklus auf Anforderung.
+
+cProfile und tracemalloc werden nur für die Dauer eines Aufrufs des
+Dienstes profile_refresh eingeschaltet. Ohne Aufruf entstehen keine Kosten.
+"""
+
+import cProfile
+import logging
+import time
+import tracemalloc
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, PROFIL_ALLOKATIONEN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Allokationen dieser Dateien gehören zur Messung selbst bzw. zu Importen
+_AUSGEBLENDET = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+# Anzahl der Allokationsstellen in der Antwort des Dienstes
+ANTWORT_ALLOKATIONEN = 10
+
+
+async def async_profiliere_aktualisierung(hass, coordinator, allokationen=PROFIL_ALLOKATIONEN):
+    """Führt Abruf, Parsen, Indexaufbau und Zustandsschreiben unter cProfile und tracemalloc aus.
+
+    Die Statistik von cProfile landet als .prof-Datei (auswertbar mit pstats
+    oder snakeviz), die größten Allokationsstellen als Textdatei im
+    Konfigurationsverzeichnis. cProfile erfasst dabei alles, was während des
+    Zyklus in der Event-Loop läuft, also auch andere Integrationen.
+
+    Returns:
+        dict: Dateipfade, Dauer, Spitzenwert des Speichers und die größten
+        Allokationsstellen.
+
+    Raises:
+        HomeAssistantError: Wenn bereits eine Profilierung läuft.
+    """
+    domain_daten = hass.data.setdefault(DOMAIN, {})
+    if domain_daten.get("profil_laeuft"):
+        raise HomeAssistantError("Es läuft bereits eine Profilierung.")
+    domain_daten["profil_laeuft"] = True
+
+    # Läuft tracemalloc schon (z.B. PYTHONTRACEMALLOC), bleibt es danach an
+    tracemalloc_aktiv = tracemalloc.is_tracing()
+    profiler = cProfile.Profile()
+    try:
+        if not tracemalloc_aktiv:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            raise HomeAssistantError(f"cProfile kann nicht gestartet werden: {e}") from e
+        try:
+            await coordinator.async_refresh(erzwingen=True)
+        finally:
+            profiler.disable()
+            dauer = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot()
+            spitze = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not tracemalloc_aktiv:
+            tracemalloc.stop()
+        domain_daten["profil_laeuft"] = False
+
+    basis = hass.config.path(
+        f"{DOMAIN}_profil_{dt_util.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+    stellen = await hass.async_add_executor_job(
+        _schreibe_ergebnisse, profiler, snapshot, basis, allokationen, coordinator.schluessel,
+        dauer, spitze,
+    )
+    _LOGGER.info(
+        "Profil der Aktualisierung für %s nach %s.prof geschrieben (%.1f ms).",
+        coordinator.schluessel, basis, dauer * 1000,
+    )
+    return {
+        "profil": f"{basis}.prof",
+        "allokationen": f"{basis}_allokationen.txt",
+        "dauer_ms": round(dauer * 1000, 1),
+        "speicher_spitze_bytes": spitze,
+        "groesste_allokationen": stellen[:ANTWORT_ALLOKATIONEN],
+    }
+
+
+def _schreibe_ergebnisse(profiler, snapshot, basis, allokationen, schluessel, dauer, spitze):
+    """Schreibt Profil und Allokationsstellen und gibt die Stellen zurück."""
+    profiler.dump_stats(f"{basis}.prof")
+
+    statistik = snapshot.filter_traces(_AUSGEBLENDET).statistics("lineno")[:allokationen]
+    stellen = [
+        {
+            "ort": f"{eintrag.traceback[0].filename}:{eintrag.traceback[0].lineno}",
+            "bytes": eintrag.size,
+            "anzahl": eintrag.count,
+        }
+        for eintrag in statistik
+    ]
+    with open(f"{basis}_allokationen.txt", "w", encoding="utf-8") as datei:
+        datei.write(f"Standort: {schluessel}\n")
+        datei.write(f"Dauer: {dauer * 1000:.1f} ms\n")
+        datei.write(f"Speicher-Spitze: {spitze} Bytes\n\n")
+        datei.write("Nach dem Zyklus noch belegter Speicher pro Allokationsstelle:\n")
+        for stelle in stellen:
+            datei.write(f"{stelle['bytes']:>12} B {stelle['anzahl']:>8}x  {stelle['ort']}\n")
+    return stellen
@@ -1,17 +1,13 @@
 """Modul für die Verwaltung und den Abruf von Schulferien in Deutschland."""
 
 import logging
-from datetime import datetime, timedelta
-from homeassistant.helpers.event import async_track_time_change
+from datetime import timedelta
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-import aiohttp
-from .api_utils import fetch_data, parse_daten, DEFAULT_TIMEOUT
-from .const import (
-    API_URL_FERIEN,
-    API_FALLBACK_FERIEN,
-    DAILY_UPDATE_HOUR,
-    DAILY_UPDATE_MINUTE,
-)
+from .attribute import ZwischengespeicherteAttribute
+from .messwerte import VERARBEITUNG
+from .tageskalender import SCHULFERIEN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,73 +24,50 @@ SCHULFERIEN_MORGEN_SENSOR = SensorEntityDescription(
     translation_key="schulferien_morgen",
 )
 
-class SchulferienSensor(SensorEntity):
+class SchulferienSensor(ZwischengespeicherteAttribute, SensorEntity):
     """Sensor für Schulferien und Brückentage."""
 
-    def __init__(self, hass, config):
+    _attr_should_poll = False
+
+    def __init__(self, coordinator, config):
         """Initialisiert den Schulferien-Sensor mit Konfigurationsdaten."""
         self.entity_description = SCHULFERIEN_SENSOR
+        self.coordinator = coordinator
         self._name = config["name"]
         self._unique_id = config.get("unique_id", "sensor.schulferien")
         self._location = {
-            "land": config["land"],
-            "region": config["region"],
             "land_name": config["land_name"],  # Ausgeschriebener Name des Landes
             "region_name": config["region_name"],  # Ausgeschriebener Name der Region
-            "iso_code": "DE",  # Wird dynamisch aus der Spracheinstellung übernommen
         }
-        self._brueckentage = config.get("brueckentage", [])
         self._ferien_info = {
             "heute_ferientag": None,
             "naechste_ferien_name": None,
             "naechste_ferien_beginn": None,
             "naechste_ferien_ende": None,
-            "ferien_liste": [],
-            "letztes_update": None,  # Neuer Schlüssel
         }
-        _LOGGER.debug("Sensor für %s mit Land: %s, Region: %s, Brückentagen: %s",
-            self._name, self._location["land"], self._location["region"],
-            self._brueckentage
+        _LOGGER.debug("Sensor für %s mit Standort: %s, Brückentagen: %s",
+            self._name, coordinator.schluessel, coordinator.brueckentage
         )
 
     async def async_added_to_hass(self):
-        """Initialisierung des Sensors."""
-        _LOGGER.debug("Schulferien-Sensor hinzugefügt, erstes Update wird ausgeführt.")
-
-        if self.hass and self.hass.config:
-            self._location["iso_code"] = self.hass.config.language[:2].upper()
-        else:
-            self._location["iso_code"] = "DE"  # Standardwert
-            _LOGGER.warning("Schulferien-Sensor: Fallback auf Standard 'DE'.")
-
-        # Debug-Ausgabe des Sprachcodes im Log
-        _LOGGER.debug("Schulferien-Sensor: Verwendeter Sprachcode: %s", self._location["iso_code"])
-
-        # Holen des letzten Updates
-        letztes_update = self._ferien_info.get("letztes_update")
-        jetzt = datetime.now()
-
-        # Update nur, wenn noch kein Update vorhanden oder wenn der Tag gewechselt hat
-        if not letztes_update or letztes_update.date() != jetzt.date():
-            await self.async_update()
-            self.async_write_ha_state()
-
-        async def async_daily_update(_):
-            """Tägliche Aktualisierung um 03:00 Uhr."""
-            _LOGGER.debug("Tägliches Update ausgelöst.")
-            await self.async_update()
-            self.async_write_ha_state()
-
-        async_track_time_change(
-            self.hass,
-            async_daily_update,
-            hour=DAILY_UPDATE_HOUR,
-            minute=DAILY_UPDATE_MINUTE,
+        """Registriert den Sensor beim gemeinsamen Coordinator."""
+        _LOGGER.debug("Schulferien-Sensor hinzugefügt, übernehme Daten des Coordinators.")
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
         )
-        _LOGGER.debug(
-            "Tägliche Abfrage um %02d:%02d eingerichtet.", DAILY_UPDATE_HOUR, DAILY_UPDATE_MINUTE
+        self.verarbeite_ferien_daten(
+            self.coordinator.data["ferien_index"], dt_util.now().date()
         )
 
+    @callback
+    def _handle_coordinator_update(self):
+        """Übernimmt neue Daten des Coordinators und schreibt den Zustand."""
+        with self.coordinator.messwerte.messe(VERARBEITUNG):
+            self.verarbeite_ferien_daten(
+                self.coordinator.data["ferien_index"], dt_util.now().date()
+            )
+        self.async_write_ha_state()
+
     @property
     def name(self):
         """Gibt den Namen des Sensors zurück."""
@@ -108,30 +81,27 @@ class SchulferienSensor(SensorEntity):
     @property
     def native_value(self):
         """Gibt den aktuellen Zustand des Sensors zurück."""
-        return "ferientag" if self._ferien_info.get("heute_ferientag", False) else "kein_ferientag"
+        heute = dt_util.now().date()
+        if self.coordinator.data["tageskalender"].hat(heute, SCHULFERIEN):
+            return "ferientag"
+        return "kein_ferientag"
 
     @property
     def brueckentage(self):
         """Gibt die konfigurierten Brückentage zurück."""
-        return self._brueckentage
+        return self.coordinator.brueckentage
 
-    @property
-    def extra_state_attributes(self):
-        """Gibt zusätzliche Statusattribute des Sensors zurück."""
-        heute = datetime.now().date()
+    def _baue_attribute(self, heute):
+        """Baut die Statusattribute für einen Tag auf."""
         aktuelles_ereignis = None
         beginn = None
         ende = None
 
-        # Nutze eine leere Liste, falls 'ferien_liste' fehlt
-        ferien_liste = self._ferien_info.get("ferien_liste", [])
-
-        for ferien in ferien_liste:
-            if ferien["start_datum"] <= heute <= ferien["end_datum"]:
-                aktuelles_ereignis = ferien["name"]
-                beginn = ferien["start_datum"].strftime("%d.%m.%Y")
-                ende = ferien["end_datum"].strftime("%d.%m.%Y")
-                break
+        ferien = self.coordinator.data["ferien_index"].finde(heute)
+        if ferien:
+            aktuelles_ereignis = ferien.name
+            beginn = ferien.start_datum.strftime("%d.%m.%Y")
+            ende = ferien.end_datum.strftime("%d.%m.%Y")
 
         if not aktuelles_ereignis:
             aktuelles_ereignis = self._ferien_info["naechste_ferien_name"]
@@ -144,108 +114,39 @@ class SchulferienSensor(SensorEntity):
             "Ende": ende,
             "Land": self._location["land_name"],
             "Region": self._location["region_name"],
-            "Brückentage": self._brueckentage,
-        }
-
-    async def async_update(self, session=None):
-        """Aktualisiert die Schulferiendaten durch Abfrage der API."""
-        heute = datetime.now().date()
-        jetzt = datetime.now()
-
-        # Prüfen, ob ein Update notwendig ist
-        letztes_update = self._ferien_info.get("letztes_update")
-        if letztes_update and letztes_update.date() == heute:
-            _LOGGER.debug(
-                "Update übersprungen. Letztes Update war heute um %s.",
-                letztes_update.strftime("%H:%M:%S"),
-            )
-            return
-
-        _LOGGER.debug("Starte Update der Schulferiendaten.")
-        close_session = False
-
-        if session is None:
-            session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
-            close_session = True
-
-        try:
-            api_parameter = self.get_api_parameter(heute)
-            ferien_daten = await self.hole_ferien_daten(api_parameter, session)
-
-            if not ferien_daten:
-                _LOGGER.warning("Keine Daten von der API erhalten.")
-                return
-
-            self.verarbeite_ferien_daten(ferien_daten, heute)
-
-            self._ferien_info["letztes_update"] = jetzt
-            _LOGGER.debug(
-                "Update abgeschlossen. Letztes Update um: %s",
-                self._ferien_info["letztes_update"],
-            )
-
-        except (aiohttp.ClientError, ValueError, KeyError, TypeError) as e:
-            _LOGGER.error("Unerwarteter Fehler beim Aktualisieren der Daten: %s", e)
-
-        finally:
-            if close_session:
-                await session.close()
-                _LOGGER.debug("API-Session geschlossen.")
-
-    def get_api_parameter(self, heute):
-        """Erstellt die API-Parameter für die Anfrage."""
-        return {
-            "countryIsoCode": self._location["land"],
-            "subdivisionCode": self._location["region"],
-            "validFrom": (heute - timedelta(days=30)).strftime("%Y-%m-%d"),
-            "validTo": (heute + timedelta(days=365)).strftime("%Y-%m-%d"),
-            "languageIsoCode": self._location["iso_code"],
+            "Brückentage": [tag.strftime("%d.%m.%Y") for tag in self.coordinator.brueckentage],
+            "Berechnete Brückentage": [
+                tag.strftime("%d.%m.%Y")
+                for tag in self.coordinator.data["berechnete_brueckentage"]
+            ],
+            "Datenalter (Tage)": self.coordinator.datenalter,
+            "API-Schutzschalter": self.coordinator.api_zustand,
         }
 
-    async def hole_ferien_daten(self, api_parameter, session):
-        """Versucht, die Ferientermine von der API abzurufen."""
-        for url in [API_URL_FERIEN, API_FALLBACK_FERIEN]:
-            _LOGGER.debug("Prüfe URL: %s", url)
-            try:
-                ferien_daten = await fetch_data(url, api_parameter, session)
-                if ferien_daten:
-                    return ferien_daten
-            except aiohttp.ClientError as e:
-                _LOGGER.error("Fehler beim Abrufen der Daten von %s: %s", url, e)
-        return None
-
-    def verarbeite_ferien_daten(self, ferien_daten, heute):
-        """Verarbeitet die erhaltenen Ferien-Daten."""
-        try:
-            ferien_liste = parse_daten(ferien_daten, self._brueckentage)
-            self._ferien_info["ferien_liste"] = ferien_liste
-        except ValueError as e:
-            _LOGGER.error("Fehler beim Verarbeiten der Daten: %s", e)
-            return
+    async def async_update(self):
+        """Stößt eine Aktualisierung des gemeinsamen Coordinators an."""
+        await self.coordinator.async_refresh()
 
-        aktuelles_ereignis = next(
-            (ferien
-            for ferien in ferien_liste
-            if ferien["start_datum"] <= heute <= ferien["end_datum"]),
-            None,
-        )
+    def verarbeite_ferien_daten(self, ferien_index, heute):
+        """Leitet den Zustand des Sensors aus dem gemeinsamen Ferienindex ab."""
+        self.verwerfe_attribute()
+        aktuelles_ereignis = ferien_index.finde(heute)
 
         if aktuelles_ereignis:
             self._ferien_info.update({
                 "heute_ferientag": True,
-                "naechste_ferien_name": aktuelles_ereignis["name"],
-                "naechste_ferien_beginn": aktuelles_ereignis["start_datum"].strftime("%d.%m.%Y"),
-                "naechste_ferien_ende": aktuelles_ereignis["end_datum"].strftime("%d.%m.%Y"),
+                "naechste_ferien_name": aktuelles_ereignis.name,
+                "naechste_ferien_beginn": aktuelles_ereignis.start_datum.strftime("%d.%m.%Y"),
+                "naechste_ferien_ende": aktuelles_ereignis.end_datum.strftime("%d.%m.%Y"),
             })
         else:
             self._ferien_info["heute_ferientag"] = False
-            zukunftsferien = [ferien for ferien in ferien_liste if ferien["start_datum"] > heute]
-            if zukunftsferien:
-                naechste_ferien = min(zukunftsferien, key=lambda f: f["start_datum"])
+            naechste_ferien = ferien_index.naechster_nach(heute)
+            if naechste_ferien:
                 self._ferien_info.update({
-                    "naechste_ferien_name": naechste_ferien["name"],
-                    "naechste_ferien_beginn": naechste_ferien["start_datum"].strftime("%d.%m.%Y"),
-                    "naechste_ferien_ende": naechste_ferien["end_datum"].strftime("%d.%m.%Y"),
+                    "naechste_ferien_name": naechste_ferien.name,
+                    "naechste_ferien_beginn": naechste_ferien.start_datum.strftime("%d.%m.%Y"),
+                    "naechste_ferien_ende": naechste_ferien.end_datum.strftime("%d.%m.%Y"),
                 })
 
 # Definition der EntityDescription für den morgigen Schulferien-Sensor
@@ -258,9 +159,11 @@ SCHULFERIEN_MORGEN_SENSOR = SensorEntityDescription(
 class SchulferienMorgenSensor(SensorEntity):
     """Sensor für Schulferien morgen."""
 
-    def __init__(self, referenzsensor: SchulferienSensor):
+    _attr_should_poll = False
+
+    def __init__(self, coordinator):
         self.entity_description = SCHULFERIEN_MORGEN_SENSOR
-        self._referenzsensor = referenzsensor
+        self.coordinator = coordinator
         self._attr_name = "Schulferien Morgen"
         self._attr_unique_id = "sensor.schulferien_morgen"
         self._attr_native_value = None
@@ -275,12 +178,17 @@ class SchulferienMorgenSensor(SensorEntity):
 
     @property
     def native_value(self):
-        morgen = datetime.now().date() + timedelta(days=1)
-        for ferien in self._referenzsensor._ferien_info.get("ferien_liste", []):
-            if ferien["start_datum"] <= morgen <= ferien["end_datum"]:
-                return "ferientag"
+        morgen = dt_util.now().date() + timedelta(days=1)
+        if self.coordinator.data["tageskalender"].hat(morgen, SCHULFERIEN):
+            return "ferientag"
         return "kein_ferientag"
 
+    async def async_added_to_hass(self):
+        """Registriert den Sensor beim gemeinsamen Coordinator."""
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self.async_write_ha_state)
+        )
+
     async def async_update(self):
-        # Holt sich alles aus dem Referenzsensor, kein extra Update nötig
-        pass
+        """Stößt eine Aktualisierung des gemeinsamen Coordinators an."""
+        await self.coordinator.async_refresh()
@@ -0,0 +1,179 @@
+"""Dienste der Schulferien-Integration."""
+
+import logging
+
+import voluptuous as vol
+from homeassistant.core import ServiceCall, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .brueckentage import async_lade_brueckentage
+from .const import DOMAIN, PROFIL_ALLOKATIONEN
+from .profil import async_profiliere_aktualisierung
+from .tageskalender import BRUECKENTAG, FEIERTAG, FREI, SCHULFERIEN, WOCHENENDE
+
+_LOGGER = logging.getLogger(__name__)
+
+DIENST_BRUECKENTAGE_NEU_LADEN = "brueckentage_neu_laden"
+DIENST_TAG_ABFRAGEN = "query_day"
+DIENST_SCHULTAGE_ZAEHLEN = "count_school_days"
+DIENST_NAECHSTER_SCHULTAG = "next_school_day"
+DIENST_PROFILIEREN = "profile_refresh"
+
+ATTR_ENTRY_ID = "entry_id"
+ATTR_DATUM = "datum"
+ATTR_VON = "von"
+ATTR_BIS = "bis"
+ATTR_ALLOKATIONEN = "allokationen"
+
+SCHEMA_TAG = vol.Schema({
+    vol.Optional(ATTR_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_DATUM): cv.date,
+})
+
+SCHEMA_BEREICH = vol.Schema({
+    vol.Optional(ATTR_ENTRY_ID): cv.string,
+    vol.Required(ATTR_VON): cv.date,
+    vol.Required(ATTR_BIS): cv.date,
+})
+
+SCHEMA_PROFIL = vol.Schema({
+    vol.Optional(ATTR_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_ALLOKATIONEN, default=PROFIL_ALLOKATIONEN): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=500)
+    ),
+})
+
+
+async def _async_brueckentage_neu_laden(hass, _call: ServiceCall):
+    """Liest bridge_days.yaml bei Änderung neu und übernimmt sie in alle Coordinators."""
+    brueckentage = await async_lade_brueckentage(hass)
+    for coordinator in hass.data.get(DOMAIN, {}).get("coordinators", {}).values():
+        coordinator.async_setze_brueckentage(brueckentage)
+    _LOGGER.debug("Brückentage neu geladen: %d Tage", len(brueckentage))
+
+
+def _hole_coordinator(hass, call: ServiceCall):
+    """Gibt den Coordinator zum entry_id des Aufrufs zurück.
+
+    Ohne entry_id wird der einzige Coordinator verwendet, bei mehreren ist
+    die Angabe nötig.
+    """
+    domain_daten = hass.data.get(DOMAIN, {})
+    coordinators = list(domain_daten.get("coordinators", {}).values())
+    entry_id = call.data.get(ATTR_ENTRY_ID)
+    if entry_id is not None:
+        coordinator = domain_daten.get(entry_id)
+        if coordinator not in coordinators:
+            raise ServiceValidationError(f"Unbekannter Schulferien-Eintrag: {entry_id}")
+        return coordinator
+    if len(coordinators) != 1:
+        raise ServiceValidationError(
+            "Mehrere Schulferien-Einträge eingerichtet, bitte entry_id angeben"
+        )
+    return coordinators[0]
+
+
+def _tag_abfragen(hass, call: ServiceCall):
+    """Gibt den Status eines Tages aus dem Tageskalender zurück."""
+    coordinator = _hole_coordinator(hass, call)
+    datum = call.data.get(ATTR_DATUM) or dt_util.now().date()
+    bits = coordinator.data["tageskalender"].status(datum)
+    ferien = coordinator.data["ferien_index"].finde(datum)
+    feiertag = coordinator.data["feiertag_index"].finde(datum)
+    return {
+        "datum": datum.isoformat(),
+        "schulferien": bool(bits & SCHULFERIEN),
+        "feiertag": bool(bits & FEIERTAG),
+        "brueckentag": bool(bits & BRUECKENTAG),
+        "wochenende": bool(bits & WOCHENENDE),
+        "frei": bool(bits & FREI),
+        "ferien_name": ferien.name if ferien else None,
+        "feiertag_name": feiertag.name if feiertag else None,
+    }
+
+
+def _schultage_zaehlen(hass, call: ServiceCall):
+    """Zählt die Schultage in einem Bereich über die Präfixsummen des Tageskalenders."""
+    coordinator = _hole_coordinator(hass, call)
+    von, bis = call.data[ATTR_VON], call.data[ATTR_BIS]
+    if bis < von:
+        raise ServiceValidationError("bis darf nicht vor von liegen")
+    try:
+        schultage = coordinator.data["tageskalender"].schultage(von, bis)
+    except ValueError as e:
+        raise ServiceValidationError(str(e)) from e
+    tage = (bis - von).days + 1
+    return {
+        "von": von.isoformat(),
+        "bis": bis.isoformat(),
+        "schultage": schultage,
+        "freie_tage": tage - schultage,
+    }
+
+
+def _naechster_schultag(hass, call: ServiceCall):
+    """Gibt den ersten Schultag nach dem Datum zurück, ohne Datum nach heute."""
+    coordinator = _hole_coordinator(hass, call)
+    datum = call.data.get(ATTR_DATUM) or dt_util.now().date()
+    try:
+        naechster = coordinator.data["tageskalender"].naechster_schultag(datum)
+    except ValueError as e:
+        raise ServiceValidationError(str(e)) from e
+    return {"datum": naechster.isoformat() if naechster else None}
+
+
+async def _async_profiliere(hass, call: ServiceCall):
+    """Profiliert einen erzwungenen Aktualisierungszyklus des Coordinators."""
+    coordinator = _hole_coordinator(hass, call)
+    return await async_profiliere_aktualisierung(
+        hass, coordinator, call.data[ATTR_ALLOKATIONEN]
+    )
+
+
+def async_registriere_dienste(hass):
+    """Registriert die Dienste einmalig für alle Config Entries."""
+    if hass.services.has_service(DOMAIN, DIENST_BRUECKENTAGE_NEU_LADEN):
+        return
+
+    async def brueckentage_neu_laden(call: ServiceCall):
+        await _async_brueckentage_neu_laden(hass, call)
+
+    hass.services.async_register(DOMAIN, DIENST_BRUECKENTAGE_NEU_LADEN, brueckentage_neu_laden)
+
+    # Abfragen mit Antwortdaten, direkt aus Tageskalender und Indizes beantwortet
+    for dienst, abfrage, schema in (
+        (DIENST_TAG_ABFRAGEN, _tag_abfragen, SCHEMA_TAG),
+        (DIENST_SCHULTAGE_ZAEHLEN, _schultage_zaehlen, SCHEMA_BEREICH),
+        (DIENST_NAECHSTER_SCHULTAG, _naechster_schultag, SCHEMA_TAG),
+    ):
+        @callback
+        def beantworte(call: ServiceCall, abfrage=abfrage):
+            return abfrage(hass, call)
+
+        hass.services.async_register(
+            DOMAIN, dienst, beantworte, schema=schema, supports_response=SupportsResponse.ONLY
+        )
+
+    async def profiliere(call: ServiceCall):
+        return await _async_profiliere(hass, call)
+
+    hass.services.async_register(
+        DOMAIN, DIENST_PROFILIEREN, profiliere, schema=SCHEMA_PROFIL,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def async_entferne_dienste(hass):
+    """Entfernt die Dienste, sobald kein Config Entry mehr geladen ist."""
+    if hass.data.get(DOMAIN, {}).get("coordinators"):
+        return
+    for dienst in (
+        DIENST_BRUECKENTAGE_NEU_LADEN,
+        DIENST_TAG_ABFRAGEN,
+        DIENST_SCHULTAGE_ZAEHLEN,
+        DIENST_NAECHSTER_SCHULTAG,
+        DIENST_PROFILIEREN,
+    ):
+        hass.services.async_remove(DOMAIN, dienst)
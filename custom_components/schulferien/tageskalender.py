@@ -0,0 +1,178 @@
+"""Vorberechneter Tageskalender mit Statusbits für jeden Tag des Abrufzeitraums."""
+
+import re
+from array import array
+from bisect import bisect_right
+from datetime import date
+from itertools import accumulate
+
+from .const import BRUECKENTAG_BERECHNET_NAME, BRUECKENTAG_NAME
+
+# Statusbits pro Tag
+SCHULFERIEN = 1
+FEIERTAG = 2
+BRUECKENTAG = 4
+WOCHENENDE = 8
+
+# Tage, an denen keine Schule ist
+FREI = SCHULFERIEN | FEIERTAG | BRUECKENTAG | WOCHENENDE
+
+# Namen im Ferienindex, die als Brückentag markiert werden
+BRUECKENTAG_NAMEN = (BRUECKENTAG_NAME, BRUECKENTAG_BERECHNET_NAME)
+
+# Übersetzt Statusbytes für die Brückentagssuche: F = arbeitsfrei (Feiertag
+# oder Wochenende), S = Arbeitstag in den Schulferien, A = sonstiger Arbeitstag
+_ARBEITSTAGE = bytes(
+    ord("F") if bits & (FEIERTAG | WOCHENENDE) else ord("S") if bits & SCHULFERIEN else ord("A")
+    for bits in range(256)
+)
+
+# Übersetzt Statusbytes in 1 für Schultage und 0 für freie Tage
+_SCHULTAGE = bytes(0 if bits & FREI else 1 for bits in range(256))
+
+
+class Tageskalender:
+    """Speichert für jeden Tag des Abrufzeitraums ein Byte mit Statusbits.
+
+    Der Kalender wird einmal pro Aktualisierung aus den Indizes aufgebaut.
+    Abfragen innerhalb des Zeitraums sind danach ein einzelner Arrayzugriff
+    über die Ordinalzahl des Datums. Außerhalb des Zeitraums wird auf die
+    Indizes zurückgegriffen.
+
+    Zusätzlich werden die Schultage als Präfixsummen abgelegt: an Position i
+    steht die Zahl der Schultage vor dem i-ten Tag. Schultage in einem
+    Bereich sind damit eine Differenz, der nächste Schultag eine Binärsuche.
+    """
+
+    __slots__ = (
+        "start", "ende", "_start_ordinal", "_tage", "_schultage", "_ferien_index",
+        "_feiertag_index",
+    )
+
+    def __init__(self, ferien_index, feiertag_index, start=None, ende=None):
+        """Baut den Kalender für den Zeitraum von start bis einschließlich ende auf."""
+        self._ferien_index = ferien_index
+        self._feiertag_index = feiertag_index
+        self.start = start
+        self.ende = ende
+
+        if start is None or ende is None or ende < start:
+            self._start_ordinal = 0
+            self._tage = bytearray()
+            self._schultage = array("I", [0])
+            return
+
+        self._start_ordinal = start.toordinal()
+        anzahl = ende.toordinal() - self._start_ordinal + 1
+        self._tage = bytearray(anzahl)
+
+        # Samstag und Sonntag per Slice mit Schrittweite 7 setzen
+        for wochentag in (5, 6):
+            erster = (wochentag - start.weekday()) % 7
+            treffer = len(range(erster, anzahl, 7))
+            self._tage[erster::7] = bytes([WOCHENENDE]) * treffer
+
+        for beginn_ord, ende_ord, name in ferien_index.intervalle():
+            bits = SCHULFERIEN
+            if name in BRUECKENTAG_NAMEN:
+                bits |= BRUECKENTAG
+            self._markiere(beginn_ord, ende_ord, bits)
+
+        for beginn_ord, ende_ord, _name in feiertag_index.intervalle():
+            self._markiere(beginn_ord, ende_ord, FEIERTAG)
+
+        self._schultage = array(
+            "I", accumulate(self._tage.translate(_SCHULTAGE), initial=0)
+        )
+
+    def _markiere(self, start, ende, bits):
+        """Setzt die Statusbits für alle Tage von start bis ende (Ordinalzahlen)."""
+        von = max(start - self._start_ordinal, 0)
+        bis = min(ende - self._start_ordinal + 1, len(self._tage))
+        tage = self._tage
+        for position in range(von, bis):
+            tage[position] |= bits
+
+    def __len__(self):
+        """Gibt die Anzahl der Tage im Kalender zurück."""
+        return len(self._tage)
+
+    def status(self, datum):
+        """Gibt die Statusbits für ein Datum zurück."""
+        position = datum.toordinal() - self._start_ordinal
+        if 0 <= position < len(self._tage):
+            return self._tage[position]
+
+        bits = WOCHENENDE if datum.weekday() >= 5 else 0
+        zeitraum = self._ferien_index.finde(datum)
+        if zeitraum:
+            bits |= SCHULFERIEN
+            if zeitraum.name in BRUECKENTAG_NAMEN:
+                bits |= BRUECKENTAG
+        if self._feiertag_index.enthaelt(datum):
+            bits |= FEIERTAG
+        return bits
+
+    def hat(self, datum, maske):
+        """Prüft, ob für das Datum eines der Bits aus der Maske gesetzt ist."""
+        return bool(self.status(datum) & maske)
+
+    def ist_frei(self, datum):
+        """Prüft, ob an dem Datum keine Schule ist."""
+        return self.hat(datum, FREI)
+
+    def _position(self, datum):
+        """Gibt die Position des Datums zurück, ValueError außerhalb des Zeitraums."""
+        position = datum.toordinal() - self._start_ordinal
+        if not 0 <= position < len(self._tage):
+            raise ValueError(
+                f"{datum} liegt außerhalb des geladenen Zeitraums {self.start} bis {self.ende}"
+            )
+        return position
+
+    def schultage(self, von, bis):
+        """Zählt die Schultage von von bis bis (jeweils einschließlich) in O(1).
+
+        Raises:
+            ValueError: Wenn eines der Daten außerhalb des Zeitraums liegt.
+        """
+        if bis < von:
+            return 0
+        return self._schultage[self._position(bis) + 1] - self._schultage[self._position(von)]
+
+    def naechster_schultag(self, datum):
+        """Gibt den ersten Schultag nach datum zurück, None, wenn keiner mehr im Zeitraum liegt.
+
+        Raises:
+            ValueError: Wenn datum außerhalb des Zeitraums liegt.
+        """
+        position = self._position(datum)
+        # Erste Position, nach der die Summe steigt, ist der nächste Schultag
+        naechste = bisect_right(self._schultage, self._schultage[position + 1]) - 1
+        if naechste >= len(self._tage):
+            return None
+        return date.fromordinal(self._start_ordinal + naechste)
+
+    def berechne_brueckentage(self, max_luecke=1, nur_schulzeit=False):
+        """Leitet Brückentage aus Feiertagen und Wochenenden ab.
+
+        Ein Brückentag ist ein Arbeitstag in einer Lücke von höchstens
+        max_luecke Arbeitstagen zwischen zwei freien Tagen, z.B. der Freitag
+        nach einem Feiertag am Donnerstag. Der ganze Kalender wird dazu
+        einmal übersetzt und in einem Durchlauf nach Lücken durchsucht.
+
+        Args:
+            max_luecke (int): Maximale Länge einer Lücke in Arbeitstagen.
+            nur_schulzeit (bool): Nur Tage außerhalb der Schulferien liefern.
+
+        Returns:
+            list: Sortierte date-Objekte.
+        """
+        tage = self._tage.translate(_ARBEITSTAGE)
+        erlaubt = b"A" if nur_schulzeit else b"AS"
+        ergebnis = []
+        for luecke in re.finditer(rb"(?<=F)[AS]{1,%d}(?=F)" % max_luecke, tage):
+            for position in range(luecke.start(), luecke.end()):
+                if tage[position] in erlaubt:
+                    ergebnis.append(date.fromordinal(self._start_ordinal + position))
+        return ergebnis
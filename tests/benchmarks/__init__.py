@@ -0,0 +1 @@
+"""Benchmarks für die Schulferien-Integration (werden nicht automatisch gesammelt)."""
@@ -0,0 +1,92 @@
+"""Misst 100 000 Lesezugriffe auf extra_state_attributes mit und ohne Memo.
+
+"ohne Memo" entspricht dem bisherigen Verhalten: bei jedem Zugriff wird
+der Schutzschalter gesucht, der Index durchsucht und jedes Datum neu
+formatiert. "mit Memo" liest die Property, die nur bei neuem Datenstand,
+neuem Tag oder geändertem Schutzschalter neu aufbaut.
+
+Aufruf aus dem Repository-Wurzelverzeichnis:
+    python -m tests.benchmarks.bench_attribute
+"""
+
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+# Home Assistant muss vor seinen Helfern importiert werden (zirkuläre Importe)
+import homeassistant.core  # noqa: F401  pylint: disable=unused-import
+from homeassistant.util import dt as dt_util
+
+from custom_components.schulferien.coordinator import SchulferienCoordinator
+from custom_components.schulferien.feiertag_sensor import FeiertagSensor
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+from custom_components.schulferien.schulferien_sensor import SchulferienSensor
+
+LESEZUGRIFFE = 100_000
+CONFIG = {"name": "Test", "land_name": "Deutschland", "region_name": "Bayern"}
+
+
+def erstelle_coordinator():
+    """Erstellt einen Coordinator mit 20 Jahren Ferien und Feiertagen."""
+    coordinator = SchulferienCoordinator(SimpleNamespace(data={}), "DE", "DE-BY", "DE")
+    heute = dt_util.now().date()
+    beginn = heute - timedelta(days=3650)
+    ferien = [
+        Zeitraum(f"Ferien {nummer}", beginn + timedelta(days=60 * nummer),
+                 beginn + timedelta(days=60 * nummer + 10))
+        for nummer in range(120)
+    ]
+    feiertage = [
+        Zeitraum(f"Feiertag {nummer}", beginn + timedelta(days=37 * nummer),
+                 beginn + timedelta(days=37 * nummer))
+        for nummer in range(200)
+    ]
+    coordinator.data["ferien_index"] = FerienIndex(ferien)
+    coordinator.data["feiertag_index"] = FerienIndex(feiertage)
+    coordinator.data["datenstand"] = dt_util.now()
+    coordinator._baue_tageskalender(heute)  # pylint: disable=protected-access
+    return coordinator
+
+
+def ohne_memo(sensor):
+    """Bisheriges Verhalten: alles bei jedem Zugriff neu berechnen."""
+    sensor.coordinator._schutzschalter = None  # pylint: disable=protected-access
+    return sensor._baue_attribute(dt_util.now().date())  # pylint: disable=protected-access
+
+
+def mit_memo(sensor):
+    """Neues Verhalten: die gemerkten Attribute lesen."""
+    return sensor.extra_state_attributes
+
+
+def messe(funktion, sensor):
+    """Gibt die Gesamtdauer in Millisekunden für alle Lesezugriffe zurück."""
+    start = time.perf_counter()
+    for _ in range(LESEZUGRIFFE):
+        funktion(sensor)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    """Misst beide Sensoren mit und ohne Memo und gibt eine Tabelle aus."""
+    coordinator = erstelle_coordinator()
+    sensoren = (
+        ("Schulferien", SchulferienSensor(coordinator, CONFIG)),
+        ("Feiertag", FeiertagSensor(coordinator, CONFIG)),
+    )
+    heute = dt_util.now().date()
+    sensoren[0][1].verarbeite_ferien_daten(coordinator.data["ferien_index"], heute)
+    sensoren[1][1].verarbeite_feiertags_daten(coordinator.data["feiertag_index"], heute)
+
+    print(f"{LESEZUGRIFFE} Lesezugriffe")
+    print(f"{'Sensor':<11} | {'ohne Memo ms':>12} | {'mit Memo ms':>11} | {'Faktor':>6}")
+    print("-" * 50)
+    for name, sensor in sensoren:
+        assert ohne_memo(sensor) == mit_memo(sensor)
+        vorher = messe(ohne_memo, sensor)
+        nachher = messe(mit_memo, sensor)
+        print(f"{name:<11} | {vorher:>12.1f} | {nachher:>11.1f} | {vorher / nachher:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
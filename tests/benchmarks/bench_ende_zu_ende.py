@@ -0,0 +1,168 @@
+"""Ende-zu-Ende-Messungen gegen den lokalen OpenHolidays-Ersatz.
+
+Teil 1 misst Durchsatz und Latenz von fetch_data bei verschiedener
+Parallelität, Fehlerquote und mit bzw. ohne 304-Revalidierung über den
+persistenten Cache. Teil 2 richtet die Integration mit einem Config Entry
+in einer Test-Instanz von Home Assistant ein und misst den vollständigen
+Aktualisierungspfad über 20 simulierte Tage: Abruf, Parsen, Index,
+Tageskalender und das Schreiben der Sensorzustände.
+
+Die Wartezeiten zwischen Wiederholungen werden um WARTEZEIT_FAKTOR
+verkürzt, damit Läufe mit Fehlerquote nicht von Sekunden-Backoffs dominiert
+werden. Aufruf aus dem Repository-Wurzelverzeichnis:
+
+    python -m pytest tests/benchmarks/bench_ende_zu_ende.py -s
+"""
+
+import asyncio
+import statistics
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.schulferien import api_utils, coordinator as coordinator_modul
+from custom_components.schulferien.api_utils import async_hole_session, fetch_data
+from custom_components.schulferien.cache import async_hole_cache
+from custom_components.schulferien.const import DOMAIN
+
+from ..fake_openholidays import FakeOpenHolidays, Verhalten, lognormale_latenz
+
+AUFRUFE = 200
+WARTEZEIT_FAKTOR = 0.01
+PARAMETER = {
+    "countryIsoCode": "DE",
+    "subdivisionCode": "DE-BY",
+    "validFrom": "2024-01-01",
+    "validTo": "2024-12-31",
+    "languageIsoCode": "DE",
+}
+
+
+@pytest.fixture
+async def fake(monkeypatch):
+    """Startet den Fake-Server und leitet alle API-URLs darauf um."""
+    originale_wartezeit = api_utils.berechne_wartezeit
+    monkeypatch.setattr(
+        api_utils, "berechne_wartezeit",
+        lambda versuch: originale_wartezeit(versuch) * WARTEZEIT_FAKTOR,
+    )
+    async with FakeOpenHolidays(seed=42) as server:
+        for konstante, url in server.konstanten().items():
+            if hasattr(coordinator_modul, konstante):
+                monkeypatch.setattr(coordinator_modul, konstante, url)
+        yield server
+
+
+def _perzentil(werte, anteil):
+    """Gibt das Perzentil einer Liste von Werten zurück."""
+    werte = sorted(werte)
+    return werte[min(int(len(werte) * anteil), len(werte) - 1)]
+
+
+def _zeile(*spalten):
+    """Gibt eine Tabellenzeile mit fester Spaltenbreite aus."""
+    print(" | ".join(f"{spalte:>10}" for spalte in spalten))
+
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_fetch_data_durchsatz(hass, fake):
+    """fetch_data unter verschiedenen Lastprofilen."""
+    session = async_hole_session(hass)
+    cache = await async_hole_cache(hass)
+    url = fake.url("/SchoolHolidays")
+
+    print()
+    _zeile(
+        "parallel", "fehler", "cache", "aufrufe/s", "p50 ms", "p95 ms", "erfolg", "anfragen", "304"
+    )
+    for parallel in (1, 8, 32):
+        for fehlerquote in (0.0, 0.1):
+            for mit_cache in (False, True):
+                fake.verhalten["/SchoolHolidays"] = Verhalten(
+                    latenz=lognormale_latenz(0.02, 0.5), fehlerquote=fehlerquote
+                )
+                fake.setze_zurueck()
+                dauern = []
+                erfolge = 0
+                semaphore = asyncio.Semaphore(parallel)
+
+                async def aufruf():
+                    nonlocal erfolge
+                    async with semaphore:
+                        start = time.perf_counter()
+                        daten = await fetch_data(
+                            url, PARAMETER, session, cache if mit_cache else None
+                        )
+                        dauern.append(time.perf_counter() - start)
+                        erfolge += bool(daten)
+
+                start = time.perf_counter()
+                await asyncio.gather(*(aufruf() for _ in range(AUFRUFE)))
+                gesamt = time.perf_counter() - start
+
+                _zeile(
+                    parallel, f"{fehlerquote:.0%}", "ja" if mit_cache else "nein",
+                    f"{AUFRUFE / gesamt:.0f}",
+                    f"{statistics.median(dauern) * 1000:.1f}",
+                    f"{_perzentil(dauern, 0.95) * 1000:.1f}",
+                    f"{erfolge / AUFRUFE:.0%}",
+                    fake.anfragen["/SchoolHolidays"],
+                    fake.status[304],
+                )
+                assert erfolge >= AUFRUFE * 0.9
+
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_sensor_aktualisierung(hass, enable_custom_integrations, fake):
+    """Vollständiger Aktualisierungspfad von der Einrichtung bis zu den Sensorzuständen."""
+    for pfad in ("/SchoolHolidays", "/PublicHolidays"):
+        fake.verhalten[pfad] = Verhalten(latenz=lognormale_latenz(0.05, 0.4), anzahl=50)
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Schulferien - Deutschland (Bayern)",
+        data={"land": "DE", "region": "DE-BY", "land_name": "Deutschland", "region_name": "Bayern"},
+    )
+    entry.add_to_hass(hass)
+
+    start = time.perf_counter()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    einrichtung = time.perf_counter() - start
+    assert hass.states.async_entity_ids("sensor")
+    assert hass.states.async_entity_ids("binary_sensor")
+    assert hass.states.async_entity_ids("calendar")
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    dauern = []
+    heute = dt_util.now()
+    for tag in range(1, 21):
+        # Jede Aktualisierung an einem neuen Tag, sonst wird sie übersprungen
+        with patch.object(
+            coordinator_modul.dt_util, "now", return_value=heute + timedelta(days=tag)
+        ):
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            dauern.append(time.perf_counter() - start)
+
+    print()
+    print(f"Einrichtung inkl. erstem Abruf: {einrichtung * 1000:.1f} ms")
+    print(
+        f"Tägliche Aktualisierung (20 Tage, gleitendes Fenster): "
+        f"p50 {statistics.median(dauern) * 1000:.1f} ms, "
+        f"p95 {_perzentil(dauern, 0.95) * 1000:.1f} ms"
+    )
+    print(f"Anfragen: {dict(fake.anfragen)}, Status: {dict(fake.status)}, Bytes: {fake.bytes}")
+    assert coordinator.data["letztes_update"].date() == (heute + timedelta(days=20)).date()
+    # Zwei Jahresabschnitte bei der Einrichtung, danach nur wöchentliche Revalidierungen
+    assert 2 <= fake.anfragen["/SchoolHolidays"] < 21
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
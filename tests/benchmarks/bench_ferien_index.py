@@ -0,0 +1,132 @@
+"""Vergleicht Speicherbedarf und Abfragezeit des FerienIndex mit der Dict-Variante.
+
+Vorher: Liste von Dicts mit "name", "start_datum", "end_datum" (date) plus
+Listen der Starts und größten Enden. Nachher: spaltenweiser FerienIndex mit
+array('i')-Ordinalzahlen und Namenstabelle. Gemessen werden die nach dem
+Aufbau belegten Bytes pro Zeitraum (tracemalloc) und die Zeit pro finde().
+
+Aufruf aus dem Repository-Wurzelverzeichnis:
+    python -m tests.benchmarks.bench_ferien_index
+"""
+
+import random
+import time
+import tracemalloc
+from bisect import bisect_right
+from datetime import date, timedelta
+
+# Home Assistant muss vor seinen Helfern importiert werden (zirkuläre Importe)
+import homeassistant.core  # noqa: F401  pylint: disable=unused-import
+
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+
+GROESSEN = (1_000, 10_000, 100_000)
+ABFRAGEN = 20_000
+NAMEN = (
+    "Winterferien", "Osterferien", "Pfingstferien", "Sommerferien",
+    "Herbstferien", "Weihnachtsferien", "Brückentag",
+)
+
+
+class DictIndex:
+    """Bisherige Darstellung: Dicts mit date-Objekten und Listen für die Suche."""
+
+    def __init__(self, zeitraeume):
+        """Sortiert die Dicts und baut Start- und Maximalende-Listen auf."""
+        self.zeitraeume = sorted(zeitraeume, key=lambda z: z["start_datum"])
+        self._starts = [zeitraum["start_datum"] for zeitraum in self.zeitraeume]
+        self._max_enden = []
+        max_ende = None
+        for zeitraum in self.zeitraeume:
+            if max_ende is None or zeitraum["end_datum"] > max_ende:
+                max_ende = zeitraum["end_datum"]
+            self._max_enden.append(max_ende)
+
+    def finde(self, datum):
+        """Gibt den frühesten Zeitraum zurück, der das Datum enthält."""
+        treffer = None
+        position = bisect_right(self._starts, datum) - 1
+        while position >= 0 and self._max_enden[position] >= datum:
+            if self.zeitraeume[position]["end_datum"] >= datum:
+                treffer = self.zeitraeume[position]
+            position -= 1
+        return treffer
+
+
+def erzeuge_zeitraeume(anzahl):
+    """Erzeugt nicht überlappende Zeiträume mit wiederkehrenden Namen."""
+    zufall = random.Random(anzahl)
+    tag = date(1900, 1, 1)
+    zeitraeume = []
+    for nummer in range(anzahl):
+        tag += timedelta(days=zufall.randint(1, 20))
+        ende = tag + timedelta(days=zufall.randint(0, 14))
+        zeitraeume.append((NAMEN[nummer % len(NAMEN)], tag, ende))
+        tag = ende
+    return zeitraeume
+
+
+def vorher(zeitraeume):
+    """Baut die Dict-Variante auf (Datumsobjekte werden neu erzeugt, wie beim Parsen)."""
+    return DictIndex([
+        {
+            "name": name,
+            "start_datum": date.fromordinal(start.toordinal()),
+            "end_datum": date.fromordinal(ende.toordinal()),
+        }
+        for name, start, ende in zeitraeume
+    ])
+
+
+def nachher(zeitraeume):
+    """Baut den spaltenweisen FerienIndex auf."""
+    return FerienIndex(
+        Zeitraum(
+            name, date.fromordinal(start.toordinal()), date.fromordinal(ende.toordinal())
+        )
+        for name, start, ende in zeitraeume
+    )
+
+
+def messe(aufbau, zeitraeume, abfragen):
+    """Gibt Bytes pro Zeitraum und Mikrosekunden pro Abfrage zurück."""
+    tracemalloc.start()
+    index = aufbau(zeitraeume)
+    belegt, _spitze = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for datum in abfragen:
+        index.finde(datum)
+    dauer = time.perf_counter() - start
+    return belegt / len(zeitraeume), dauer / len(abfragen) * 1e6, index
+
+
+def main():
+    """Misst beide Varianten für alle Größen und gibt eine Tabelle aus."""
+    print(f"{'Zeiträume':>9} | {'Variante':<8} | {'Bytes/Zeitraum':>14} | {'µs/finde':>8}")
+    print("-" * 50)
+    for anzahl in GROESSEN:
+        zeitraeume = erzeuge_zeitraeume(anzahl)
+        erster, letzter = zeitraeume[0][1], zeitraeume[-1][2]
+        zufall = random.Random(0)
+        abfragen = [
+            erster + timedelta(days=zufall.randint(0, (letzter - erster).days))
+            for _ in range(ABFRAGEN)
+        ]
+        ergebnisse = {}
+        for name, aufbau in (("vorher", vorher), ("nachher", nachher)):
+            bytes_pro, mikro, index = messe(aufbau, zeitraeume, abfragen)
+            ergebnisse[name] = index
+            print(f"{anzahl:>9} | {name:<8} | {bytes_pro:>14.1f} | {mikro:>8.2f}")
+
+        for datum in abfragen[:1000]:
+            alt = ergebnisse["vorher"].finde(datum)
+            neu = ergebnisse["nachher"].finde(datum)
+            assert (alt and alt["name"], alt and alt["start_datum"]) == (
+                neu and neu.name, neu and neu.start_datum
+            )
+
+
+if __name__ == "__main__":
+    main()
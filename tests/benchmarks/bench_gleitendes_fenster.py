@@ -0,0 +1,115 @@
+"""Gleitender Abruf gegen tägliches Laden des ganzen Fensters über einen Monat.
+
+Simuliert 30 aufeinanderfolgende Tage mit je einer Aktualisierung gegen den
+lokalen OpenHolidays-Ersatz und misst pro Aktualisierung die übertragenen
+Bytes (vom Server gezählt), die Zahl der Anfragen und die Zeit für das
+Übernehmen der Einträge in Indizes und Tageskalender. Verglichen wird der
+gleitende Abruf in Jahresabschnitten, ohne und mit Antwort-Cache, mit dem
+bisherigen Verhalten, bei dem Datenbestand.plane immer das ganze Fenster
+liefert. Mit Cache werden unveränderte Abschnitte nur per ETag revalidiert.
+
+Aufruf aus dem Repository-Wurzelverzeichnis:
+
+    python -m pytest tests/benchmarks/bench_gleitendes_fenster.py -s
+"""
+
+import statistics
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.schulferien import coordinator as coordinator_modul
+from custom_components.schulferien.cache import AntwortCache
+from custom_components.schulferien.coordinator import SchulferienCoordinator
+from custom_components.schulferien.datenbestand import Datenbestand
+
+from ..fake_openholidays import FakeOpenHolidays, Verhalten
+
+TAGE = 30
+START = datetime(2024, 3, 1, 3)
+
+
+async def _simuliere_monat(hass, fake, monkeypatch, modus):
+    """Führt eine Aktualisierung pro Tag aus und gibt die Messwerte pro Tag zurück."""
+    if modus == "ganz":
+        monkeypatch.setattr(
+            Datenbestand, "plane", lambda _self, beginn, ende, _heute: [(beginn, ende)]
+        )
+    for konstante, url in fake.konstanten().items():
+        if hasattr(coordinator_modul, konstante):
+            monkeypatch.setattr(coordinator_modul, konstante, url)
+
+    cache = AntwortCache(hass) if modus == "abschnitte+cache" else None
+    coordinator = SchulferienCoordinator(
+        hass, "DE", "DE-BY", "DE", cache=cache, hedge_verzoegerung=None
+    )
+    verarbeitung = []
+    original = coordinator._uebernehme_daten  # pylint: disable=protected-access
+
+    def gemessen(*args):
+        start = time.perf_counter()
+        original(*args)
+        verarbeitung.append(time.perf_counter() - start)
+
+    coordinator._uebernehme_daten = gemessen  # pylint: disable=protected-access
+
+    messwerte = []
+    async with aiohttp.ClientSession() as session:
+        for tag in range(TAGE):
+            fake.setze_zurueck()
+            jetzt = dt_util.as_local(START + timedelta(days=tag))
+            with patch.object(coordinator_modul.dt_util, "now", return_value=jetzt):
+                await coordinator.async_refresh(session)
+            assert coordinator.data["letztes_update"] == jetzt
+            messwerte.append(
+                (fake.bytes, sum(fake.anfragen.values()), fake.status[304], verarbeitung[-1])
+            )
+    coordinator.async_stoppe_zeitplan()
+    return messwerte, coordinator
+
+
+def _im_fenster(coordinator, index):
+    """Gibt die Zeiträume des Index zurück, die im aktuellen Abruffenster beginnen."""
+    ende = coordinator.data["tageskalender"].ende
+    return [zeitraum for zeitraum in coordinator.data[index] if zeitraum.start_datum <= ende]
+
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_gleitendes_fenster(hass, monkeypatch):
+    """Bytes, Anfragen und Verarbeitungszeit über einen simulierten Monat."""
+    ergebnisse = {}
+    for modus in ("ganz", "abschnitte", "abschnitte+cache"):
+        async with FakeOpenHolidays() as fake:
+            fake.verhalten["/SchoolHolidays"] = Verhalten(anzahl=12)
+            fake.verhalten["/PublicHolidays"] = Verhalten(anzahl=25)
+            with monkeypatch.context() as kontext:
+                ergebnisse[modus] = await _simuliere_monat(hass, fake, kontext, modus)
+
+    print()
+    print(f"{'Modus':<18} | {'Bytes gesamt':>12} | {'Bytes/Tag':>10} | {'Anfragen':>8} | "
+          f"{'304':>5} | {'Verarbeitung p50 µs':>20} | {'Einträge':>8}")
+    for modus, (messwerte, coordinator) in ergebnisse.items():
+        bytes_gesamt = sum(wert[0] for wert in messwerte)
+        print(
+            f"{modus:<18} | {bytes_gesamt:>12} | "
+            f"{bytes_gesamt / TAGE:>10.0f} | {sum(wert[1] for wert in messwerte):>8} | "
+            f"{sum(wert[2] for wert in messwerte):>5} | "
+            f"{statistics.median(wert[3] for wert in messwerte) * 1e6:>20.0f} | "
+            f"{len(coordinator.data['ferien_index']) + len(coordinator.data['feiertag_index']):>8}"
+        )
+    print("Mit Cache pro Tag (Bytes):", [wert[0] for wert in ergebnisse["abschnitte+cache"][0]])
+
+    def _bytes(modus):
+        return sum(wert[0] for wert in ergebnisse[modus][0])
+
+    ganz = ergebnisse["ganz"][1]
+    for modus in ("abschnitte", "abschnitte+cache"):
+        coordinator = ergebnisse[modus][1]
+        assert _im_fenster(ganz, "ferien_index") == _im_fenster(coordinator, "ferien_index")
+        assert _im_fenster(ganz, "feiertag_index") == _im_fenster(coordinator, "feiertag_index")
+    assert _bytes("abschnitte+cache") < _bytes("abschnitte") < _bytes("ganz")
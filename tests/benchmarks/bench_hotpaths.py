@@ -0,0 +1,92 @@
+"""pytest-benchmark-Suite für die häufig durchlaufenen Pfade der Integration.
+
+Die Datei folgt bewusst nicht dem Muster test_*.py und läuft daher nicht mit
+der normalen Testsuite. Aufruf aus dem Repository-Wurzelverzeichnis:
+
+    python -m pytest tests/benchmarks/bench_hotpaths.py --benchmark-autosave
+
+Mit --benchmark-compare werden die Ergebnisse mit dem zuletzt gespeicherten
+Lauf (z.B. vom vorherigen Commit) verglichen, mit
+--benchmark-compare-fail=mean:10% schlägt der Lauf bei Regressionen fehl.
+"""
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.schulferien.api_utils import parse_daten
+from custom_components.schulferien.feiertag_sensor import FeiertagMorgenSensor, FeiertagSensor
+from custom_components.schulferien.schulferien_sensor import (
+    SchulferienMorgenSensor,
+    SchulferienSensor,
+)
+
+from .conftest import erzeuge_brueckentage, erzeuge_payload
+
+CONFIG = {"name": "Benchmark", "land_name": "Deutschland", "region_name": "Bayern"}
+
+
+@pytest.mark.parametrize("mit_brueckentagen", [False, True], ids=["ohne_bt", "mit_bt"])
+def test_parse_daten(benchmark, anzahl, mit_brueckentagen):
+    """parse_daten auf einer Antwort mit anzahl Zeiträumen."""
+    benchmark.group = "parse_daten"
+    payload = erzeuge_payload(anzahl)
+    brueckentage = erzeuge_brueckentage(anzahl // 10) if mit_brueckentagen else None
+    benchmark.extra_info["zeitraeume"] = anzahl
+
+    ergebnis = benchmark(parse_daten, payload, brueckentage)
+
+    assert len(ergebnis) == anzahl + (len(brueckentage) if brueckentage else 0)
+
+
+def test_verarbeite_ferien_daten(benchmark, coordinator, anzahl):
+    """SchulferienSensor.verarbeite_ferien_daten für heute."""
+    benchmark.group = "verarbeite_daten"
+    benchmark.extra_info["zeitraeume"] = anzahl
+    sensor = SchulferienSensor(coordinator, CONFIG)
+
+    benchmark(sensor.verarbeite_ferien_daten, coordinator.data["ferien_index"],
+              dt_util.now().date())
+
+    assert sensor._ferien_info["naechste_ferien_name"]  # pylint: disable=protected-access
+
+
+def test_verarbeite_feiertags_daten(benchmark, coordinator, anzahl):
+    """FeiertagSensor.verarbeite_feiertags_daten für heute."""
+    benchmark.group = "verarbeite_daten"
+    benchmark.extra_info["zeitraeume"] = anzahl
+    sensor = FeiertagSensor(coordinator, CONFIG)
+
+    benchmark(sensor.verarbeite_feiertags_daten, coordinator.data["feiertag_index"],
+              dt_util.now().date())
+
+    assert sensor._feiertags_info["naechster_feiertag_name"]  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize("sensor_klasse", [SchulferienSensor, FeiertagSensor])
+@pytest.mark.parametrize("gemerkt", [True, False], ids=["gemerkt", "neu_aufgebaut"])
+def test_extra_state_attributes(benchmark, coordinator, anzahl, sensor_klasse, gemerkt):
+    """extra_state_attributes, einmal aus dem Memo und einmal nach einem neuen Datenstand."""
+    benchmark.group = "extra_state_attributes"
+    benchmark.extra_info["zeitraeume"] = anzahl
+    sensor = sensor_klasse(coordinator, CONFIG)
+
+    def lesen():
+        if not gemerkt:
+            coordinator.datenversion += 1
+        return sensor.extra_state_attributes
+
+    attribute = benchmark(lesen)
+
+    assert attribute["Land"] == "Deutschland"
+
+
+@pytest.mark.parametrize("sensor_klasse", [SchulferienMorgenSensor, FeiertagMorgenSensor])
+def test_morgen_native_value(benchmark, coordinator, anzahl, sensor_klasse):
+    """native_value der Morgen-Sensoren."""
+    benchmark.group = "morgen_native_value"
+    benchmark.extra_info["zeitraeume"] = anzahl
+    sensor = sensor_klasse(coordinator)
+
+    wert = benchmark(lambda: sensor.native_value)
+
+    assert wert in ("ferientag", "kein_ferientag", "feiertag", "kein_feiertag")
@@ -0,0 +1,96 @@
+"""Anfragen pro Sekunde an den iCalendar-Feed, mit und ohne zwischengespeicherten Inhalt.
+
+Misst über den HTTP-Stack einer Test-Instanz von Home Assistant:
+
+- neu: der Feed wird für jede Anfrage von Grund auf serialisiert
+- neue Version: die Datenversion ändert sich, unveränderte Termine werden wiederverwendet
+- zwischengespeichert: der fertige Inhalt wird ausgeliefert
+- 304: der Client sendet den aktuellen ETag per If-None-Match
+
+Aufruf aus dem Repository-Wurzelverzeichnis:
+
+    python -m pytest tests/benchmarks/bench_ics_feed.py -s
+"""
+
+import asyncio
+import statistics
+import time
+
+import pytest
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.schulferien.const import DOMAIN, ICS_TOKEN
+from custom_components.schulferien.ics import async_registriere_ics_view, ics_pfad
+
+ANFRAGEN = 400
+PARALLEL = 8
+
+
+@pytest.fixture(params=(100, 1_000), ids=lambda anzahl: f"{anzahl}_zeitraeume")
+def anzahl(request):
+    """Feeds mit realistischer und großer Anzahl von Zeiträumen."""
+    return request.param
+
+
+async def _messe(client, url, vorbereiten=None, headers=None):
+    """Stellt ANFRAGEN Anfragen mit PARALLEL gleichzeitigen Clients.
+
+    Gibt (Anfragen pro Sekunde, p50 in ms, Statuscodes) zurück.
+    """
+    dauern = []
+    status = set()
+
+    async def arbeiter(anzahl):
+        for _ in range(anzahl):
+            if vorbereiten is not None:
+                vorbereiten()
+            start = time.perf_counter()
+            antwort = await client.get(url, headers=headers)
+            await antwort.read()
+            dauern.append(time.perf_counter() - start)
+            status.add(antwort.status)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(arbeiter(ANFRAGEN // PARALLEL) for _ in range(PARALLEL)))
+    gesamt = time.perf_counter() - start
+    return len(dauern) / gesamt, statistics.median(dauern) * 1000, status
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_ics_feed_durchsatz(hass, hass_client_no_auth, coordinator, anzahl):
+    """Vergleicht den Durchsatz der Varianten für einen Feed mit anzahl Zeiträumen."""
+    assert await async_setup_component(hass, "http", {})
+    entry = MockConfigEntry(
+        domain=DOMAIN, title="Schulferien - Bayern", data={ICS_TOKEN: "benchmark"}
+    )
+    entry.add_to_hass(hass)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    async_registriere_ics_view(hass)
+    view = hass.data[DOMAIN]["ics_view"]
+    client = await hass_client_no_auth()
+    url = ics_pfad(entry)
+
+    def neue_version():
+        coordinator.datenversion += 1
+
+    ergebnisse = {
+        "neu": await _messe(client, url, view._feeds.clear),  # pylint: disable=protected-access
+        "neue Version": await _messe(client, url, neue_version),
+        "zwischengespeichert": await _messe(client, url),
+    }
+    antwort = await client.get(url)
+    groesse = len(await antwort.read())
+    ergebnisse["304"] = await _messe(
+        client, url, headers={"If-None-Match": antwort.headers["ETag"]}
+    )
+
+    print()
+    print(f"{anzahl} Zeiträume, Feed {groesse} Bytes, {ANFRAGEN} Anfragen, {PARALLEL} parallel")
+    print(f"{'Variante':<20} | {'Anfragen/s':>10} | {'p50 ms':>8} | {'Status':>8}")
+    for variante, (rps, p50, status) in ergebnisse.items():
+        codes = ",".join(map(str, sorted(status)))
+        print(f"{variante:<20} | {rps:>10.0f} | {p50:>8.2f} | {codes:>8}")
+
+    assert ergebnisse["304"][2] == {304}
+    assert ergebnisse["zwischengespeichert"][0] > ergebnisse["neu"][0]
@@ -0,0 +1,73 @@
+"""Bereichsabfragen des Kalenders: Binärsuche im FerienIndex gegen Filtern aller Zeiträume.
+
+Das Kalender-Panel fragt bei jeder Navigation einen sichtbaren Monat ab.
+Gemessen wird die Zeit pro Monatsabfrage über FerienIndex.im_bereich und
+über das Filtern der vollständigen Liste, jeweils mit dem Erzeugen der
+Zeitraum-Objekte für die Treffer.
+
+Aufruf aus dem Repository-Wurzelverzeichnis:
+    python -m tests.benchmarks.bench_kalender
+"""
+
+import random
+import time
+from datetime import date, timedelta
+
+# Home Assistant muss vor seinen Helfern importiert werden (zirkuläre Importe)
+import homeassistant.core  # noqa: F401  pylint: disable=unused-import
+
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+
+GROESSEN = (100, 1_000, 10_000, 100_000)
+ABFRAGEN = 2_000
+
+
+def erzeuge_zeitraeume(anzahl):
+    """Erzeugt Zeiträume von 1 bis 14 Tagen im Abstand von 1 bis 10 Tagen."""
+    zufall = random.Random(anzahl)
+    tag = date(1900, 1, 1)
+    zeitraeume = []
+    for nummer in range(anzahl):
+        dauer = zufall.randint(0, 13)
+        zeitraeume.append(Zeitraum(f"Zeitraum {nummer % 7}", tag, tag + timedelta(days=dauer)))
+        tag += timedelta(days=dauer + zufall.randint(1, 10))
+    return zeitraeume
+
+
+def _messe(abfrage, monate):
+    """Gibt die mittlere Zeit pro Abfrage in Mikrosekunden und die Trefferzahl zurück."""
+    treffer = 0
+    start = time.perf_counter()
+    for beginn, ende in monate:
+        treffer += len(abfrage(beginn, ende))
+    return (time.perf_counter() - start) / len(monate) * 1e6, treffer
+
+
+def main():
+    """Führt die Messung für alle Größen aus und gibt eine Tabelle aus."""
+    print(f"{'Zeiträume':>10} | {'Liste µs':>10} | {'Index µs':>10} | {'Faktor':>7}")
+    for anzahl in GROESSEN:
+        zeitraeume = erzeuge_zeitraeume(anzahl)
+        index = FerienIndex(zeitraeume)
+        liste = list(index)
+        erster, letzter = liste[0].start_datum, liste[-1].end_datum
+        zufall = random.Random(0)
+        monate = []
+        for _ in range(ABFRAGEN):
+            beginn = erster + timedelta(days=zufall.randint(0, (letzter - erster).days))
+            monate.append((beginn, beginn + timedelta(days=41)))
+
+        def gefiltert(beginn, ende):
+            return [z for z in liste if z.start_datum <= ende and z.end_datum >= beginn]
+
+        zeit_liste, treffer_liste = _messe(gefiltert, monate)
+        zeit_index, treffer_index = _messe(index.im_bereich, monate)
+        assert treffer_liste == treffer_index
+        print(
+            f"{anzahl:>10} | {zeit_liste:>10.1f} | {zeit_index:>10.1f} | "
+            f"{zeit_liste / zeit_index:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
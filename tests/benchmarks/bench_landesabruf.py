@@ -0,0 +1,183 @@
+"""Vergleicht N Abrufe pro Region mit einem landesweiten Abruf (N = 1 … 16).
+
+Ein lokaler Stub-Server liefert synthetische Ferien- und Feiertagsdaten für
+16 Bundesländer mit einer festen Antwortzeit. Gemessen werden Anfragen,
+übertragene Bytes und die Gesamtdauer inklusive Verteilen und Parsen.
+
+Aufruf aus dem Repository-Wurzelverzeichnis:
+    python -m tests.benchmarks.bench_landesabruf
+"""
+
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+# Home Assistant muss vor seinen Helfern importiert werden (zirkuläre Importe)
+import homeassistant.core  # noqa: F401  pylint: disable=unused-import
+
+from custom_components.schulferien.api_utils import fetch_data, parse_daten
+from custom_components.schulferien.landesabruf import verteile_auf_regionen
+
+REGIONEN = [
+    "DE-BB", "DE-BE", "DE-BW", "DE-BY", "DE-HB", "DE-HE", "DE-HH", "DE-MV",
+    "DE-NI", "DE-NW", "DE-RP", "DE-SH", "DE-SL", "DE-SN", "DE-ST", "DE-TH",
+]
+LATENZ = 0.05
+PARAMETER = {
+    "countryIsoCode": "DE",
+    "validFrom": "2024-01-01",
+    "validTo": "2024-12-31",
+    "languageIsoCode": "DE",
+}
+
+
+def _eintrag(name, beginn, tage, regionen=None):
+    """Erzeugt einen Eintrag im Format der OpenHolidays-API."""
+    eintrag = {
+        "id": f"{name}-{beginn.isoformat()}",
+        "startDate": beginn.isoformat(),
+        "endDate": (beginn + timedelta(days=tage)).isoformat(),
+        "type": "School",
+        "name": [{"language": "DE", "text": name}],
+        "nationwide": regionen is None,
+    }
+    if regionen is not None:
+        eintrag["subdivisions"] = [
+            {"code": region, "shortName": region[3:]} for region in regionen
+        ]
+    return eintrag
+
+
+def erzeuge_daten():
+    """Erzeugt Schulferien pro Land sowie bundesweite und regionale Feiertage."""
+    ferien = []
+    for position, region in enumerate(REGIONEN):
+        versatz = timedelta(days=position)
+        for name, beginn, tage in (
+            ("Winterferien", date(2024, 2, 5), 5),
+            ("Osterferien", date(2024, 3, 25), 12),
+            ("Pfingstferien", date(2024, 5, 21), 10),
+            ("Sommerferien", date(2024, 7, 1), 42),
+            ("Herbstferien", date(2024, 10, 14), 12),
+            ("Weihnachtsferien", date(2024, 12, 23), 14),
+        ):
+            ferien.append(_eintrag(name, beginn + versatz, tage, [region]))
+
+    feiertage = [
+        _eintrag(name, datum, 0)
+        for name, datum in (
+            ("Neujahr", date(2024, 1, 1)),
+            ("Karfreitag", date(2024, 3, 29)),
+            ("Ostermontag", date(2024, 4, 1)),
+            ("Tag der Arbeit", date(2024, 5, 1)),
+            ("Christi Himmelfahrt", date(2024, 5, 9)),
+            ("Pfingstmontag", date(2024, 5, 20)),
+            ("Tag der Deutschen Einheit", date(2024, 10, 3)),
+            ("1. Weihnachtstag", date(2024, 12, 25)),
+            ("2. Weihnachtstag", date(2024, 12, 26)),
+        )
+    ]
+    feiertage.append(_eintrag("Fronleichnam", date(2024, 5, 30), 0, REGIONEN[2:4] + REGIONEN[5:6]))
+    feiertage.append(
+        _eintrag("Reformationstag", date(2024, 10, 31), 0, REGIONEN[:1] + REGIONEN[7:9])
+    )
+    return ferien, feiertage
+
+
+class StubServer:
+    """OpenHolidays-Stub, der Anfragen und gesendete Bytes zählt."""
+
+    def __init__(self):
+        """Initialisiert Daten und Zähler."""
+        self.ferien, self.feiertage = erzeuge_daten()
+        self.anfragen = 0
+        self.bytes = 0
+
+    def app(self):
+        """Erstellt die aiohttp-Anwendung."""
+        app = web.Application()
+        app.router.add_get("/SchoolHolidays", self._antwort(self.ferien))
+        app.router.add_get("/PublicHolidays", self._antwort(self.feiertage))
+        return app
+
+    def _antwort(self, daten):
+        """Erstellt einen Handler, der optional nach subdivisionCode filtert."""
+        async def handler(request):
+            await asyncio.sleep(LATENZ)
+            region = request.query.get("subdivisionCode")
+            if region:
+                auswahl = verteile_auf_regionen(daten, [region])[region]
+            else:
+                auswahl = daten
+            body = json.dumps(auswahl).encode()
+            self.anfragen += 1
+            self.bytes += len(body)
+            return web.Response(body=body, content_type="application/json")
+        return handler
+
+
+async def _hole_paar(basis, session, parameter):
+    """Ruft Ferien und Feiertage gleichzeitig ab."""
+    return await asyncio.gather(
+        fetch_data(f"{basis}/SchoolHolidays", parameter, session),
+        fetch_data(f"{basis}/PublicHolidays", parameter, session),
+    )
+
+
+async def pro_region(basis, session, regionen):
+    """Jede Region fragt einzeln mit subdivisionCode an."""
+    async def eine_region(region):
+        ferien, feiertage = await _hole_paar(
+            basis, session, {**PARAMETER, "subdivisionCode": region}
+        )
+        return parse_daten(ferien), parse_daten(feiertage, typ="feiertage")
+
+    return await asyncio.gather(*(eine_region(region) for region in regionen))
+
+
+async def landesweit(basis, session, regionen):
+    """Ein Abruf für das ganze Land, anschließend lokal verteilt."""
+    ferien, feiertage = await _hole_paar(basis, session, PARAMETER)
+    ferien_verteilt = verteile_auf_regionen(ferien, regionen)
+    feiertage_verteilt = verteile_auf_regionen(feiertage, regionen)
+    return [
+        (parse_daten(ferien_verteilt[region]),
+         parse_daten(feiertage_verteilt[region], typ="feiertage"))
+        for region in regionen
+    ]
+
+
+async def main():
+    """Führt den Vergleich für N = 1 … 16 aus und gibt eine Tabelle aus."""
+    stub = StubServer()
+    server = TestServer(stub.app())
+    await server.start_server()
+    basis = str(server.make_url("")).rstrip("/")
+
+    print(f"{'N':>3} | {'Modus':<11} | {'Anfragen':>8} | {'Bytes':>8} | {'Dauer ms':>8}")
+    print("-" * 51)
+    try:
+        async with aiohttp.ClientSession() as session:
+            for anzahl in range(1, len(REGIONEN) + 1):
+                regionen = REGIONEN[:anzahl]
+                ergebnisse = {}
+                for modus, funktion in (("pro Region", pro_region), ("landesweit", landesweit)):
+                    stub.anfragen = stub.bytes = 0
+                    start = time.perf_counter()
+                    ergebnisse[modus] = await funktion(basis, session, regionen)
+                    dauer = (time.perf_counter() - start) * 1000
+                    print(
+                        f"{anzahl:>3} | {modus:<11} | {stub.anfragen:>8} | "
+                        f"{stub.bytes:>8} | {dauer:>8.1f}"
+                    )
+                assert ergebnisse["pro Region"] == ergebnisse["landesweit"]
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
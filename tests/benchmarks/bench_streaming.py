@@ -0,0 +1,103 @@
+"""Misst den Spitzenspeicher beim Einlesen einer Antwort mit 50 000 Einträgen.
+
+Verglichen werden das bisherige Vorgehen (ganzer Body, json.loads,
+parse_daten, FerienIndex) und das blockweise Parsen mit JsonListenLeser
+und iter_daten. Der Body wird in beiden Fällen wie von aiohttp in Blöcken
+geliefert, gemessen wird mit tracemalloc.
+
+Aufruf aus dem Repository-Wurzelverzeichnis:
+    python -m tests.benchmarks.bench_streaming
+"""
+
+import json
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+# Home Assistant muss vor seinen Helfern importiert werden (zirkuläre Importe)
+import homeassistant.core  # noqa: F401  pylint: disable=unused-import
+
+from custom_components.schulferien.api_utils import (
+    JsonListenLeser,
+    iter_daten,
+    parse_daten,
+    verschlanke_eintrag,
+)
+from custom_components.schulferien.const import STREAM_BLOCKGROESSE
+from custom_components.schulferien.ferien_index import FerienIndex
+
+ANZAHL = 50_000
+
+
+def erzeuge_body(anzahl=ANZAHL):
+    """Erzeugt eine Antwort im Format der OpenHolidays-API."""
+    beginn = date(2000, 1, 1)
+    eintraege = []
+    for nummer in range(anzahl):
+        start = beginn + timedelta(days=nummer % 9000)
+        eintraege.append({
+            "id": f"6a1f3c2e-{nummer:08d}-4b7d-9a6e-2f1d0c8b7a65",
+            "startDate": start.isoformat(),
+            "endDate": (start + timedelta(days=nummer % 14)).isoformat(),
+            "type": "School",
+            "name": [
+                {"language": "DE", "text": f"Ferien {nummer}"},
+                {"language": "EN", "text": f"Holidays {nummer}"},
+            ],
+            "regionalScope": "Regional",
+            "temporalScope": "FullDay",
+            "nationwide": False,
+            "subdivisions": [{"code": "DE-BY", "shortName": "BY"}],
+        })
+    return json.dumps(eintraege).encode()
+
+
+def bloecke(body, groesse=STREAM_BLOCKGROESSE):
+    """Liefert den Body in Blöcken, wie ihn aiohttp vom Socket liest."""
+    for start in range(0, len(body), groesse):
+        yield body[start:start + groesse]
+
+
+def bisher(body):
+    """Body vollständig lesen, json.loads, parse_daten, Index."""
+    ganz = b"".join(bloecke(body))
+    return FerienIndex(parse_daten(json.loads(ganz)))
+
+
+def gestreamt(body):
+    """Blockweise parsen und verschlanken, dann direkt in den Index."""
+    leser = JsonListenLeser(verschlanke_eintrag)
+    eintraege = []
+    for block in bloecke(body):
+        eintraege.extend(leser.fuettere(block))
+    eintraege.extend(leser.beende())
+    return FerienIndex(iter_daten(eintraege))
+
+
+def messe(funktion, body):
+    """Gibt Spitzenspeicher in MiB, Dauer in ms und Ergebnis zurück."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    ergebnis = funktion(body)
+    dauer = (time.perf_counter() - start) * 1000
+    _aktuell, spitze = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return spitze / 2**20, dauer, ergebnis
+
+
+def main():
+    """Führt beide Varianten aus und gibt eine Tabelle aus."""
+    body = erzeuge_body()
+    print(f"{ANZAHL} Einträge, Body {len(body) / 2**20:.1f} MiB")
+    print(f"{'Variante':<10} | {'Spitze MiB':>10} | {'Dauer ms':>8}")
+    print("-" * 34)
+    ergebnisse = []
+    for name, funktion in (("bisher", bisher), ("gestreamt", gestreamt)):
+        spitze, dauer, ergebnis = messe(funktion, body)
+        ergebnisse.append(list(ergebnis))
+        print(f"{name:<10} | {spitze:>10.1f} | {dauer:>8.1f}")
+    assert ergebnisse[0] == ergebnisse[1]
+
+
+if __name__ == "__main__":
+    main()
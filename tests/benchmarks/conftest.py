@@ -0,0 +1,72 @@
+"""Synthetische OpenHolidays-Daten für die Benchmarks."""
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.schulferien.api_utils import iter_daten
+from custom_components.schulferien.coordinator import SchulferienCoordinator
+from custom_components.schulferien.ferien_index import FerienIndex
+
+GROESSEN = (100, 1_000, 10_000, 100_000)
+NAMEN = (
+    "Winterferien", "Osterferien", "Pfingstferien", "Sommerferien",
+    "Herbstferien", "Weihnachtsferien",
+)
+
+
+def erzeuge_payload(anzahl, heute=None):
+    """Erzeugt eine Antwort im Format der OpenHolidays-API mit anzahl Zeiträumen.
+
+    Die Zeiträume beginnen an aufeinanderfolgenden Tagen, dauern 0 bis 14
+    Tage und sind um heute zentriert, sodass Abfragen für heute und morgen
+    mitten in den Daten landen.
+    """
+    heute = heute or dt_util.now().date()
+    beginn = heute - timedelta(days=anzahl // 2)
+    payload = []
+    for nummer in range(anzahl):
+        start = beginn + timedelta(days=nummer)
+        payload.append({
+            "id": f"{nummer:08d}-0000-4000-8000-000000000000",
+            "startDate": start.isoformat(),
+            "endDate": (start + timedelta(days=nummer % 15)).isoformat(),
+            "type": "School",
+            "name": [{"language": "DE", "text": NAMEN[nummer % len(NAMEN)]}],
+            "nationwide": False,
+            "subdivisions": [{"code": "DE-BY", "shortName": "BY"}],
+        })
+    return payload
+
+
+def erzeuge_brueckentage(anzahl, heute=None):
+    """Erzeugt anzahl Brückentage im Format der bridge_days.yaml."""
+    heute = heute or dt_util.now().date()
+    beginn = heute - timedelta(days=anzahl * 5)
+    return [
+        (beginn + timedelta(days=10 * nummer)).strftime("%d.%m.%Y")
+        for nummer in range(anzahl)
+    ]
+
+
+@pytest.fixture(params=GROESSEN, ids=lambda anzahl: f"{anzahl}_zeitraeume")
+def anzahl(request):
+    """Anzahl der Zeiträume im synthetischen Datensatz."""
+    return request.param
+
+
+@pytest.fixture
+def coordinator(anzahl):
+    """Coordinator, dessen Ferien- und Feiertagsindex anzahl Zeiträume enthalten."""
+    coordinator = SchulferienCoordinator(SimpleNamespace(data={}), "DE", "DE-BY", "DE")
+    heute = dt_util.now().date()
+    payload = erzeuge_payload(anzahl, heute)
+    coordinator.data["ferien_index"] = FerienIndex(
+        iter_daten(payload, erzeuge_brueckentage(anzahl // 10, heute))
+    )
+    coordinator.data["feiertag_index"] = FerienIndex(iter_daten(payload, typ="feiertage"))
+    coordinator.data["datenstand"] = dt_util.now()
+    coordinator._baue_tageskalender(heute)  # pylint: disable=protected-access
+    return coordinator
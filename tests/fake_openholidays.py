@@ -0,0 +1,268 @@
+"""Lokaler Ersatz für die OpenHolidays-API für Last- und Ende-zu-Ende-Tests.
+
+Der Server bedient dieselben Pfade wie const.py und config_flow.py:
+/SchoolHolidays, /PublicHolidays, /Holidays/SchoolHolidays,
+/Holidays/PublicHolidays, /Countries und /Subdivisions. Pro Pfad lassen
+sich Latenzverteilung, Fehlerquote, 304-Unterstützung und die Anzahl der
+gelieferten Zeiträume einstellen. Alle Zufallswerte stammen aus einem
+Generator mit festem Startwert, Läufe sind damit reproduzierbar.
+
+Beispiel:
+    async with FakeOpenHolidays() as fake:
+        fake.verhalten["/SchoolHolidays"] = Verhalten(
+            latenz=lognormale_latenz(0.08, 0.5), fehlerquote=0.1
+        )
+        monkeypatch.setattr(coordinator_modul, "API_URL_FERIEN", fake.url("/SchoolHolidays"))
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.schulferien.landesabruf import verteile_auf_regionen
+
+FERIEN_PFADE = ("/SchoolHolidays", "/Holidays/SchoolHolidays")
+FEIERTAGE_PFADE = ("/PublicHolidays", "/Holidays/PublicHolidays")
+LAENDER_PFAD = "/Countries"
+REGIONEN_PFAD = "/Subdivisions"
+
+REGIONEN = {
+    "DE-BW": "Baden-Württemberg", "DE-BY": "Bayern", "DE-BE": "Berlin",
+    "DE-BB": "Brandenburg", "DE-HB": "Bremen", "DE-HH": "Hamburg",
+    "DE-HE": "Hessen", "DE-MV": "Mecklenburg-Vorpommern", "DE-NI": "Niedersachsen",
+    "DE-NW": "Nordrhein-Westfalen", "DE-RP": "Rheinland-Pfalz", "DE-SL": "Saarland",
+    "DE-SN": "Sachsen", "DE-ST": "Sachsen-Anhalt", "DE-SH": "Schleswig-Holstein",
+    "DE-TH": "Thüringen",
+}
+FERIEN_NAMEN = (
+    "Winterferien", "Osterferien", "Pfingstferien", "Sommerferien",
+    "Herbstferien", "Weihnachtsferien",
+)
+
+
+def feste_latenz(sekunden):
+    """Jede Antwort braucht genau so lange."""
+    return lambda _zufall: sekunden
+
+
+def gleichverteilte_latenz(minimum, maximum):
+    """Latenz gleichverteilt zwischen minimum und maximum."""
+    return lambda zufall: zufall.uniform(minimum, maximum)
+
+
+def lognormale_latenz(median, sigma):
+    """Log-normalverteilte Latenz mit langem Ausläufer, wie bei echten APIs."""
+    return lambda zufall: zufall.lognormvariate(math.log(median), sigma)
+
+
+class Verhalten:
+    """Einstellungen für einen Pfad des Fake-Servers."""
+
+    def __init__(
+        self, latenz=None, fehlerquote=0.0, fehlerstatus=503, etag=True, anzahl=None
+    ):
+        """Initialisiert das Verhalten.
+
+        Args:
+            latenz (callable): Erhält einen random.Random und liefert Sekunden.
+            fehlerquote (float): Anteil der Anfragen, die mit fehlerstatus antworten.
+            fehlerstatus (int): HTTP-Status für fehlerhafte Antworten.
+            etag (bool): ETag senden und If-None-Match mit 304 beantworten.
+            anzahl (int): Statt der Standarddaten so viele synthetische Ferien
+                pro Region bzw. Feiertage insgesamt liefern.
+        """
+        self.latenz = latenz or feste_latenz(0.0)
+        self.fehlerquote = fehlerquote
+        self.fehlerstatus = fehlerstatus
+        self.etag = etag
+        self.anzahl = anzahl
+
+
+def _eintrag(name, beginn, ende, regionen=None):
+    """Erzeugt einen Eintrag im Format der OpenHolidays-API."""
+    eintrag = {
+        "id": hashlib.md5(f"{name}{beginn}{regionen}".encode()).hexdigest(),
+        "startDate": beginn.isoformat(),
+        "endDate": ende.isoformat(),
+        "type": "School" if regionen else "Public",
+        "name": [{"language": "DE", "text": name}],
+        "nationwide": not regionen,
+    }
+    if regionen:
+        eintrag["subdivisions"] = [
+            {"code": region, "shortName": region[3:]} for region in regionen
+        ]
+    return eintrag
+
+
+def erzeuge_ferien(anzahl_pro_region=6, start=date(2024, 1, 1), regionen=REGIONEN):
+    """Erzeugt Schulferien für alle Regionen, um die Region versetzt."""
+    ferien = []
+    for position, region in enumerate(regionen):
+        for nummer in range(anzahl_pro_region):
+            beginn = start + timedelta(days=60 * nummer + position)
+            ferien.append(_eintrag(
+                FERIEN_NAMEN[nummer % len(FERIEN_NAMEN)],
+                beginn,
+                beginn + timedelta(days=5 + nummer % 10),
+                [region],
+            ))
+    return ferien
+
+
+def erzeuge_feiertage(anzahl=10, start=date(2024, 1, 1)):
+    """Erzeugt bundesweite Feiertage im Abstand von 36 Tagen."""
+    return [
+        _eintrag(f"Feiertag {nummer + 1}", start + timedelta(days=36 * nummer),
+                 start + timedelta(days=36 * nummer))
+        for nummer in range(anzahl)
+    ]
+
+
+class FakeOpenHolidays:
+    """aiohttp-Server, der die OpenHolidays-API nachbildet und mitzählt."""
+
+    def __init__(self, seed=0):
+        """Initialisiert Daten, Verhalten und Statistik."""
+        self.zufall = random.Random(seed)
+        self.verhalten = {}
+        self.ferien = erzeuge_ferien()
+        self.feiertage = erzeuge_feiertage()
+        self.anfragen = Counter()
+        self.status = Counter()
+        self.bytes = 0
+        self._synthetisch = {}
+        self._server = None
+
+    async def __aenter__(self):
+        """Startet den Server."""
+        await self.starte()
+        return self
+
+    async def __aexit__(self, *_args):
+        """Beendet den Server."""
+        await self.beende()
+
+    async def starte(self):
+        """Startet den Server auf einem freien lokalen Port."""
+        app = web.Application()
+        for pfad in FERIEN_PFADE:
+            app.router.add_get(pfad, self._zeitraeume_handler(pfad, "ferien"))
+        for pfad in FEIERTAGE_PFADE:
+            app.router.add_get(pfad, self._zeitraeume_handler(pfad, "feiertage"))
+        app.router.add_get(LAENDER_PFAD, self._handler(LAENDER_PFAD, self._laender))
+        app.router.add_get(REGIONEN_PFAD, self._handler(REGIONEN_PFAD, self._regionen))
+        self._server = TestServer(app)
+        await self._server.start_server(access_log=None)
+
+    async def beende(self):
+        """Beendet den Server."""
+        if self._server is not None:
+            await self._server.close()
+            self._server = None
+
+    def url(self, pfad=""):
+        """Gibt die vollständige URL eines Pfades zurück."""
+        return str(self._server.make_url(pfad))
+
+    def konstanten(self):
+        """Gibt die URL-Konstanten aus const.py mit Adressen dieses Servers zurück."""
+        return {
+            "API_URL_FERIEN": self.url(FERIEN_PFADE[0]),
+            "API_FALLBACK_FERIEN": self.url(FERIEN_PFADE[1]),
+            "API_URL_FEIERTAGE": self.url(FEIERTAGE_PFADE[0]),
+            "API_FALLBACK_FEIERTAGE": self.url(FEIERTAGE_PFADE[1]),
+            "API_URL_LAENDER": self.url(LAENDER_PFAD),
+            "API_URL_REGIONEN": self.url(REGIONEN_PFAD),
+        }
+
+    def setze_zurueck(self):
+        """Setzt die Statistik zurück."""
+        self.anfragen.clear()
+        self.status.clear()
+        self.bytes = 0
+
+    def _verhalten(self, pfad):
+        """Gibt das Verhalten eines Pfades zurück (Standard: sofort, fehlerfrei)."""
+        return self.verhalten.get(pfad) or Verhalten()
+
+    def _zeitraeume_handler(self, pfad, art):
+        """Erstellt den Handler für Ferien- oder Feiertagspfade."""
+        def daten(request):
+            anzahl = self._verhalten(pfad).anzahl
+            if anzahl is not None:
+                if (art, anzahl) not in self._synthetisch:
+                    self._synthetisch[(art, anzahl)] = (
+                        erzeuge_ferien(anzahl) if art == "ferien" else erzeuge_feiertage(anzahl)
+                    )
+                eintraege = self._synthetisch[(art, anzahl)]
+            else:
+                eintraege = self.ferien if art == "ferien" else self.feiertage
+            return self._filtere(eintraege, request.query)
+        return self._handler(pfad, daten)
+
+    @staticmethod
+    def _filtere(eintraege, query):
+        """Filtert nach subdivisionCode und dem Zeitfenster validFrom/validTo."""
+        region = query.get("subdivisionCode")
+        if region:
+            eintraege = verteile_auf_regionen(eintraege, [region])[region]
+        von, bis = query.get("validFrom"), query.get("validTo")
+        if von and bis:
+            eintraege = [
+                eintrag for eintrag in eintraege
+                if eintrag["endDate"] >= von and eintrag["startDate"] <= bis
+            ]
+        return eintraege
+
+    @staticmethod
+    def _laender(request):
+        """Liefert die unterstützten Länder."""
+        sprache = request.query.get("languageIsoCode", "DE")
+        return [
+            {"isoCode": "DE", "name": [{"language": sprache, "text": "Deutschland"}]},
+            {"isoCode": "AT", "name": [{"language": sprache, "text": "Österreich"}]},
+        ]
+
+    @staticmethod
+    def _regionen(request):
+        """Liefert die Regionen eines Landes."""
+        if request.query.get("countryIsoCode") != "DE":
+            return []
+        sprache = request.query.get("languageIsoCode", "DE")
+        return [
+            {"code": code, "name": [{"language": sprache, "text": name}]}
+            for code, name in REGIONEN.items()
+        ]
+
+    def _handler(self, pfad, daten):
+        """Umhüllt eine Datenfunktion mit Latenz, Fehlern, ETag und Statistik."""
+        async def handler(request):
+            verhalten = self._verhalten(pfad)
+            self.anfragen[pfad] += 1
+            await asyncio.sleep(max(verhalten.latenz(self.zufall), 0.0))
+
+            if self.zufall.random() < verhalten.fehlerquote:
+                self.status[verhalten.fehlerstatus] += 1
+                return web.Response(status=verhalten.fehlerstatus)
+
+            body = json.dumps(daten(request)).encode()
+            headers = {}
+            if verhalten.etag:
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                headers["ETag"] = etag
+                if request.headers.get("If-None-Match") == etag:
+                    self.status[304] += 1
+                    return web.Response(status=304, headers=headers)
+
+            self.status[200] += 1
+            self.bytes += len(body)
+            return web.Response(body=body, content_type="application/json", headers=headers)
+        return handler
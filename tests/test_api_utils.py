@@ -1,51 +1,94 @@
 """Unit tests for API utility functions."""
 
+import asyncio
+import json
 import pytest
 from unittest import mock
 from datetime import datetime
 import aiohttp
-from custom_components.schulferien.api_utils import fetch_data, parse_daten
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from custom_components.schulferien.api_utils import (
+    fetch_data,
+    parse_daten,
+    berechne_wartezeit,
+    JsonListenLeser,
+    lese_json,
+    Schutzschalter,
+    VerbindungsZaehler,
+)
+from custom_components.schulferien.ferien_index import Zeitraum
+
+async def _bloecke(daten):
+    """Liefert den Antworttext wie aiohttp in Blöcken."""
+    yield daten
+
+def _session(response=None, fehler=None):
+    """Erstellt eine Session, deren get() als Kontextmanager response liefert oder fehler wirft."""
+    kontext = mock.MagicMock()
+    kontext.__aenter__ = mock.AsyncMock(return_value=response, side_effect=fehler)
+    kontext.__aexit__ = mock.AsyncMock(return_value=False)
+    session = mock.MagicMock()
+    session.get = mock.MagicMock(return_value=kontext)
+    return session
+
+def _response(status, json_daten=None):
+    response = mock.MagicMock()
+    response.status = status
+    response.headers = {}
+    response.content.iter_chunked = mock.MagicMock(
+        return_value=_bloecke(json.dumps(json_daten).encode())
+    )
+    return response
 
 @pytest.mark.asyncio
 async def test_fetch_data_success():
     """Test API fetch with HTTP success."""
-    mock_get = mock.AsyncMock()
-    mock_get.return_value.__aenter__.return_value = mock.AsyncMock(
-        status=200, json=mock.AsyncMock(return_value={"key": "value"})
-    )
+    session = _session(_response(200, [{"id": "a", "startDate": "2024-06-01"}]))
+
+    result = await fetch_data("https://example.com/api", {"param": "value"}, session)
 
-    async with aiohttp.ClientSession() as session:
-        with mock.patch.object(session, 'get', mock_get):
-            result = await fetch_data("https://example.com/api", {"param": "value"}, session)
-            assert result == {"key": "value"}
+    assert result == [{"id": "a", "startDate": "2024-06-01"}]
+    aufruf = session.get.call_args
+    assert aufruf.args == ("https://example.com/api",)
+    assert aufruf.kwargs["params"] == {"param": "value"}
 
 @pytest.mark.asyncio
 async def test_fetch_data_timeout():
-    """Test API fetch with timeout error."""
-    mock_response = mock.AsyncMock()
-    mock_response.status = 504  # Simuliere Timeout-Fehler
-    mock_response.json = mock.AsyncMock(return_value={})
+    """Test API fetch with timeout error: retried, then empty data."""
+    session = _session(fehler=asyncio.TimeoutError())
+    schutzschalter = Schutzschalter("example.com", schwelle=10)
 
     with mock.patch(
-        "aiohttp.ClientSession.get",
-        side_effect=aiohttp.ClientTimeout,
-    ):
+        "custom_components.schulferien.api_utils.asyncio.sleep", new=mock.AsyncMock()
+    ) as mock_sleep:
         result = await fetch_data(
-            "https://example.com/api", {"param": "value"}, aiohttp.ClientSession()
+            "https://example.com/api", {"param": "value"}, session,
+            schutzschalter=schutzschalter, versuche=3,
         )
-        assert result == {}  # Erwarte leere Daten bei Timeout
+
+    assert result == {}
+    assert session.get.call_count == 3
+    assert mock_sleep.await_count == 2
+    assert schutzschalter.fehler_in_folge == 3
 
 @pytest.mark.asyncio
 async def test_fetch_data_http_error():
-    """Test API fetch with HTTP error."""
-    mock_get = mock.AsyncMock()
-    mock_get.return_value.__aenter__.return_value.raise_for_status.side_effect = aiohttp.ClientError
+    """Test API fetch with HTTP error: a 404 is not retried."""
+    response = _response(404)
+    response.raise_for_status = mock.MagicMock(side_effect=aiohttp.ClientResponseError(
+        mock.MagicMock(), (), status=404, message="Not Found"
+    ))
+    session = _session(response)
 
-    with mock.patch("aiohttp.ClientSession.get", mock_get):
-        result = await fetch_data(
-            "https://example.com/api", {"param": "value"}, aiohttp.ClientSession()
-        )
-        assert result == {}
+    with mock.patch(
+        "custom_components.schulferien.api_utils.asyncio.sleep", new=mock.AsyncMock()
+    ) as mock_sleep:
+        result = await fetch_data("https://example.com/api", {"param": "value"}, session)
+
+    assert result == {}
+    assert session.get.call_count == 1
+    mock_sleep.assert_not_awaited()
 
 def test_parse_daten_valid():
     """Test parsing valid JSON data."""
@@ -58,11 +101,7 @@ def test_parse_daten_valid():
     ]
     result = parse_daten(json_data)
     expected = [
-        {
-            "name": "Ferien",
-            "start_datum": datetime(2024, 6, 1).date(),
-            "end_datum": datetime(2024, 6, 15).date()
-        }
+        Zeitraum("Ferien", datetime(2024, 6, 1).date(), datetime(2024, 6, 15).date())
     ]
     assert result == expected
 
@@ -78,21 +117,9 @@ def test_parse_daten_with_brueckentage():
     brueckentage = ["16.06.2024", "17.06.2024"]
     result = parse_daten(json_data, brueckentage)
     expected = [
-        {
-            "name": "Ferien",
-            "start_datum": datetime(2024, 6, 1).date(),
-            "end_datum": datetime(2024, 6, 15).date()
-        },
-        {
-            "name": "Brückentag",
-            "start_datum": datetime(2024, 6, 16).date(),
-            "end_datum": datetime(2024, 6, 16).date()
-        },
-        {
-            "name": "Brückentag",
-            "start_datum": datetime(2024, 6, 17).date(),
-            "end_datum": datetime(2024, 6, 17).date()
-        },
+        Zeitraum("Ferien", datetime(2024, 6, 1).date(), datetime(2024, 6, 15).date()),
+        Zeitraum("Brückentag", datetime(2024, 6, 16).date(), datetime(2024, 6, 16).date()),
+        Zeitraum("Brückentag", datetime(2024, 6, 17).date(), datetime(2024, 6, 17).date()),
     ]
     assert result == expected
 
@@ -105,3 +132,223 @@ def test_parse_daten_missing_fields():
     """Test parsing JSON data with missing fields."""
     with pytest.raises(RuntimeError):
         parse_daten([{"endDate": "2024-06-15"}])  # Missing startDate
+
+API_EINTRAG = {
+    "id": "a1",
+    "startDate": "2024-07-29",
+    "endDate": "2024-09-09",
+    "type": "School",
+    "name": [{"language": "DE", "text": "Sommerferien – Bayern"}],
+    "nationwide": False,
+    "subdivisions": [{"code": "DE-BY", "shortName": "BY"}],
+}
+
+def test_json_leser_unabhaengig_von_blockgrenzen():
+    """Jede Aufteilung in Blöcke ergibt dieselben Elemente wie json.loads."""
+    text = json.dumps([API_EINTRAG, 12, "x", [1, 2], API_EINTRAG], ensure_ascii=False)
+    daten = text.encode()
+
+    for groesse in (1, 2, 7, 64, len(daten)):
+        leser = JsonListenLeser()
+        elemente = []
+        for start in range(0, len(daten), groesse):
+            elemente.extend(leser.fuettere(daten[start:start + groesse]))
+        elemente.extend(leser.beende())
+        assert elemente == json.loads(text)
+
+def test_json_leser_gibt_elemente_sofort_zurueck():
+    """Ein abgeschlossenes Element steht bereit, bevor das Array zu Ende ist."""
+    leser = JsonListenLeser()
+    assert leser.fuettere(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    assert leser.fuettere(b': 2}]') == [{"b": 2}]
+    assert leser.beende() == []
+
+@pytest.mark.parametrize("trennung", [b"[1, 123.", b"[1, 12", b"[1, 123.25e", b"[1, 123.25e-"])
+def test_json_leser_zahl_ueber_blockgrenze(trennung):
+    """Eine am Blockende abgeschnittene Zahl wird erst mit dem nächsten Block übernommen."""
+    text = b"[1, 123.25e-1, 7]"
+    leser = JsonListenLeser()
+
+    elemente = leser.fuettere(trennung)
+    elemente += leser.fuettere(text[len(trennung):])
+    elemente += leser.beende()
+
+    assert elemente == [1, 12.325, 7]
+
+def test_json_leser_kein_array_und_abbruch():
+    """Andere Dokumente landen in wert, abgeschnittene Arrays sind ein Fehler."""
+    leser = JsonListenLeser()
+    leser.fuettere(b'{"fehler": ')
+    leser.fuettere(b'"x"}')
+    assert leser.beende() == []
+    assert leser.wert == {"fehler": "x"}
+
+    leser = JsonListenLeser()
+    leser.fuettere(b'[{"a": 1},')
+    with pytest.raises(ValueError):
+        leser.beende()
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.asyncio
+async def test_lese_json_verschlankt_eintraege():
+    """Die gestreamte Antwort enthält nur die ausgewerteten Felder."""
+    async def handler(_request):
+        return web.json_response([API_EINTRAG] * 3)
+
+    app = web.Application()
+    app.router.add_get("/SchoolHolidays", handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(server.make_url("/SchoolHolidays")) as response:
+                result = await lese_json(response, blockgroesse=16)
+    finally:
+        await server.close()
+
+    assert len(result) == 3
+    assert "type" not in result[0]
+    assert result[0]["subdivisions"] == [{"code": "DE-BY"}]
+    assert parse_daten(result)[0].name == "Sommerferien – Bayern"
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.asyncio
+async def test_verbindungs_zaehler_zaehlt_wiederverwendung():
+    """Mehrere Anfragen über eine Session teilen sich eine Keep-Alive-Verbindung."""
+    async def handler(_request):
+        return web.json_response([])
+
+    app = web.Application()
+    app.router.add_get("/SchoolHolidays", handler)
+    server = TestServer(app)
+    await server.start_server()
+
+    zaehler = VerbindungsZaehler()
+    try:
+        async with aiohttp.ClientSession(trace_configs=[zaehler.trace_config]) as session:
+            for _ in range(3):
+                await fetch_data(str(server.make_url("/SchoolHolidays")), {}, session)
+    finally:
+        await server.close()
+
+    assert zaehler.als_dict() == {"anfragen": 3, "verbindungen": 1, "wiederverwendet": 2}
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.asyncio
+async def test_wiederholung_nach_serverfehler():
+    """Ein 503 wird wiederholt, die zweite Antwort wird übernommen."""
+    antworten = [web.Response(status=503), web.json_response([{"id": "ok"}])]
+
+    async def handler(_request):
+        return antworten.pop(0)
+
+    app = web.Application()
+    app.router.add_get("/SchoolHolidays", handler)
+    server = TestServer(app)
+    await server.start_server()
+
+    schutzschalter = Schutzschalter("localhost")
+    try:
+        with mock.patch(
+            "custom_components.schulferien.api_utils.asyncio.sleep", new=mock.AsyncMock()
+        ) as mock_sleep:
+            async with aiohttp.ClientSession() as session:
+                result = await fetch_data(
+                    str(server.make_url("/SchoolHolidays")), {}, session,
+                    schutzschalter=schutzschalter,
+                )
+    finally:
+        await server.close()
+
+    assert result == [{"id": "ok"}]
+    assert mock_sleep.await_count == 1
+    assert schutzschalter.zustand == Schutzschalter.GESCHLOSSEN
+
+def test_wartezeit_waechst_exponentiell():
+    with mock.patch("custom_components.schulferien.api_utils.random.uniform", side_effect=max):
+        assert [berechne_wartezeit(v, basis=1, maximum=10) for v in range(1, 6)] == [
+            1, 2, 4, 8, 10
+        ]
+
+def test_schutzschalter_oeffnet_und_erholt_sich():
+    schutzschalter = Schutzschalter("example.com", schwelle=2, pause=60)
+    schutzschalter.melde_fehler()
+    assert schutzschalter.erlaubt()
+
+    with mock.patch("custom_components.schulferien.api_utils.time.monotonic", return_value=100):
+        schutzschalter.melde_fehler()
+        assert schutzschalter.zustand == Schutzschalter.OFFEN
+        assert not schutzschalter.erlaubt()
+
+    with mock.patch("custom_components.schulferien.api_utils.time.monotonic", return_value=161):
+        assert schutzschalter.zustand == Schutzschalter.HALBOFFEN
+        schutzschalter.melde_erfolg()
+        assert schutzschalter.zustand == Schutzschalter.GESCHLOSSEN
+
+def test_halboffener_schutzschalter_laesst_nur_eine_probe_durch():
+    schutzschalter = Schutzschalter("example.com", schwelle=1, pause=60)
+    with mock.patch("custom_components.schulferien.api_utils.time.monotonic", return_value=100):
+        schutzschalter.melde_fehler()
+
+    with mock.patch("custom_components.schulferien.api_utils.time.monotonic", return_value=161):
+        assert [schutzschalter.erlaubt() for _ in range(5)] == [True] + [False] * 4
+        schutzschalter.gib_probe_frei()
+        assert schutzschalter.erlaubt()
+        assert not schutzschalter.erlaubt()
+        schutzschalter.melde_erfolg()
+
+    assert [schutzschalter.erlaubt() for _ in range(3)] == [True] * 3
+
+@pytest.mark.asyncio
+async def test_abgebrochene_probe_gibt_schutzschalter_frei():
+    """Wird die Probe mitten in der Anfrage abgebrochen, darf die nächste Anfrage proben."""
+    schutzschalter = Schutzschalter("example.com", schwelle=1, pause=0)
+    schutzschalter.melde_fehler()
+    gestartet = asyncio.Event()
+
+    async def haengt(*_args):
+        gestartet.set()
+        await asyncio.Event().wait()
+
+    session = _session()
+    session.get.return_value.__aenter__ = mock.AsyncMock(side_effect=haengt)
+    probe = asyncio.create_task(
+        fetch_data("https://example.com/api", {}, session, schutzschalter=schutzschalter)
+    )
+    await gestartet.wait()
+    assert not schutzschalter.erlaubt()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert schutzschalter.erlaubt()
+
+@pytest.mark.asyncio
+async def test_client_fehler_oeffnen_den_schutzschalter_nicht():
+    """Fünf 400er und eine unlesbare Antwort zählen nicht gegen den Host."""
+    schutzschalter = Schutzschalter("example.com", schwelle=5)
+    response = _response(400)
+    response.raise_for_status = mock.MagicMock(side_effect=aiohttp.ClientResponseError(
+        mock.MagicMock(), (), status=400, message="Bad Request"
+    ))
+    for _ in range(5):
+        await fetch_data(
+            "https://example.com/api", {}, _session(response), schutzschalter=schutzschalter
+        )
+    kaputt = _response(200)
+    kaputt.content.iter_chunked = mock.MagicMock(return_value=_bloecke(b"[{"))
+    await fetch_data("https://example.com/api", {}, _session(kaputt), schutzschalter=schutzschalter)
+
+    assert schutzschalter.zustand == Schutzschalter.GESCHLOSSEN
+    assert schutzschalter.fehler_in_folge == 0
+
+@pytest.mark.asyncio
+async def test_offener_schutzschalter_blockiert_anfragen():
+    schutzschalter = Schutzschalter("example.com", schwelle=1)
+    schutzschalter.melde_fehler()
+    session = mock.MagicMock()
+
+    result = await fetch_data("https://example.com/api", {}, session, schutzschalter=schutzschalter)
+
+    assert result == {}
+    session.get.assert_not_called()
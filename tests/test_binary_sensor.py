@@ -1,92 +1,77 @@
 """Unit Tests für SchulferienFeiertagBinarySensor & Morgen-Binärsensor."""
 
 import pytest
-from unittest.mock import MagicMock
-from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from datetime import datetime, date
 
 from custom_components.schulferien.binary_sensor import (
     SchulferienFeiertagBinarySensor,
     SchulferienFeiertagMorgenBinarySensor,
 )
+from custom_components.schulferien.coordinator import SchulferienCoordinator
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+from custom_components.schulferien.tageskalender import Tageskalender
+
+HEUTE = datetime(2024, 6, 18)
 
 @pytest.fixture
-def hass():
-    hass = MagicMock()
-    hass.states.get = MagicMock()
-    return hass
+def coordinator():
+    return SchulferienCoordinator(MagicMock(), "DE", "DE-BY", "DE")
 
 @pytest.fixture
 def config():
-    return {
-        "unique_id": "binary_sensor.schulferien_feiertage",
-        "schulferien_entity_id": "sensor.schulferien",
-        "feiertag_entity_id": "sensor.feiertag",
-    }
+    return {"unique_id": "binary_sensor.schulferien_feiertage"}
 
-@pytest.fixture
-def today_sensor(hass, config):
-    return SchulferienFeiertagBinarySensor(hass, config)
+def _setze_daten(coordinator, ferien, feiertag):
+    """Belegt heute (ferien) und morgen (feiertag) im Tageskalender des Coordinators."""
+    def index(datum):
+        if datum is None:
+            return FerienIndex()
+        return FerienIndex([Zeitraum("Test", datum, datum)])
 
-@pytest.fixture
-def morgen_sensor(hass, config):
-    return SchulferienFeiertagMorgenBinarySensor(hass, config)
+    coordinator.data["tageskalender"] = Tageskalender(
+        index(ferien), index(feiertag), date(2024, 6, 1), date(2024, 6, 30)
+    )
 
-@pytest.mark.asyncio
 @pytest.mark.parametrize(
-    "ferien_state, feiertag_state, expected",
+    "ferien, feiertag, expected_heute, expected_morgen",
     [
-        ("ferientag", "feiertag", True),
-        ("ferientag", "kein_feiertag", True),
-        ("kein_ferientag", "feiertag", True),
-        ("kein_ferientag", "kein_feiertag", False),
-        (None, "feiertag", True),
-        ("ferientag", None, True),
-        (None, None, False),
+        (date(2024, 6, 18), None, True, False),
+        (None, date(2024, 6, 18), True, False),
+        (date(2024, 6, 19), None, False, True),
+        (None, date(2024, 6, 19), False, True),
+        (date(2024, 6, 18), date(2024, 6, 19), True, True),
+        (None, None, False, False),
     ]
 )
-async def test_today_binary_sensor_state(today_sensor, hass, ferien_state, feiertag_state, expected):
-    """Testet heutigen Binärsensor-Zustand."""
-    def fake_state(state_str):
-        mock = MagicMock()
-        mock.state = state_str
-        return mock if state_str is not None else None
+def test_binary_sensor_state(
+    coordinator, config, ferien, feiertag, expected_heute, expected_morgen
+):
+    """Testet heutigen und morgigen Binärsensor-Zustand aus dem Tageskalender."""
+    _setze_daten(coordinator, ferien, feiertag)
 
-    hass.states.get.side_effect = lambda eid: {
-        "sensor.schulferien": fake_state(ferien_state),
-        "sensor.feiertag": fake_state(feiertag_state),
-    }.get(eid)
+    with patch("custom_components.schulferien.binary_sensor.dt_util") as mock_dt:
+        mock_dt.now.return_value = HEUTE
+        heute_sensor = SchulferienFeiertagBinarySensor(coordinator, config)
+        morgen_sensor = SchulferienFeiertagMorgenBinarySensor(coordinator, {})
 
-    await today_sensor.async_update()
-    assert today_sensor.is_on is expected
+    assert heute_sensor.is_on is expected_heute
+    assert morgen_sensor.is_on is expected_morgen
+    assert morgen_sensor.unique_id == "binary_sensor.schulferien_feiertage_morgen"
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "ferien_state, feiertag_state, expected",
-    [
-        ("ferientag", "feiertag", True),
-        ("ferientag", "kein_feiertag", True),
-        ("kein_ferientag", "feiertag", True),
-        ("kein_ferientag", "kein_feiertag", False),
-        (None, "feiertag", True),
-        ("ferientag", None, True),
-        (None, None, False),
-    ]
-)
-async def test_morgen_binary_sensor_state(morgen_sensor, hass, ferien_state, feiertag_state, expected):
-    """Testet morgigen Binärsensor-Zustand."""
-    def fake_state(state_str):
-        mock = MagicMock()
-        mock.state = state_str
-        return mock if state_str is not None else None
+def test_zustand_wird_nur_bei_wechsel_geschrieben(coordinator, config):
+    """Ein Coordinator-Update ohne Wechsel schreibt keinen Zustand."""
+    with patch("custom_components.schulferien.binary_sensor.dt_util") as mock_dt:
+        mock_dt.now.return_value = HEUTE
+        sensor = SchulferienFeiertagBinarySensor(coordinator, config)
+        sensor.async_write_ha_state = MagicMock()
 
-    hass.states.get.side_effect = lambda eid: {
-        "sensor.schulferien": fake_state(ferien_state),
-        "sensor.feiertag": fake_state(feiertag_state),
-    }.get(eid)
+        sensor._handle_coordinator_update()
+        sensor.async_write_ha_state.assert_not_called()
 
-    with patch("custom_components.schulferien.binary_sensor.datetime") as mock_dt:
-        mock_dt.now.return_value = datetime(2024, 6, 18)
-        mock_dt.now().date.return_value = datetime(2024, 6, 18).date()
+        _setze_daten(coordinator, date(2024, 6, 18), None)
+        sensor._handle_coordinator_update()
+        sensor._handle_coordinator_update()
 
-        await morgen_sensor.async_update()
-        assert morgen_sensor.is_on is expected
+    sensor.async_write_ha_state.assert_called_once()
+    assert sensor.is_on is True
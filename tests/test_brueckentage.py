@@ -0,0 +1,49 @@
+"""Unit Tests für den Brückentag-Lader."""
+
+import os
+from datetime import date
+from unittest.mock import patch
+import pytest
+from custom_components.schulferien.brueckentage import BrueckentagLader, lese_brueckentage
+
+@pytest.fixture
+def datei(tmp_path):
+    pfad = tmp_path / "bridge_days.yaml"
+    pfad.write_text('bridge_days:\n  - "04.10.2024"\n  - "10.05.2024"\n  - "04.10.2024"\n')
+    return pfad
+
+def test_tage_werden_geprueft_sortiert_und_entdoppelt(tmp_path):
+    pfad = tmp_path / "bridge_days.yaml"
+    pfad.write_text('bridge_days:\n  - "04.10.2024"\n  - "31.02.2024"\n  - "10.05.2024"\n')
+
+    assert lese_brueckentage(pfad) == [date(2024, 5, 10), date(2024, 10, 4)]
+
+def test_leere_und_fehlende_dateien(tmp_path):
+    leer = tmp_path / "leer.yaml"
+    leer.write_text("")
+    kommentare = tmp_path / "kommentare.yaml"
+    kommentare.write_text("# bridge_days:\n")
+
+    assert lese_brueckentage(leer) == []
+    assert lese_brueckentage(kommentare) == []
+    assert lese_brueckentage(tmp_path / "fehlt.yaml") == []
+
+async def test_unveraenderte_datei_wird_nicht_neu_geparst(hass, datei):
+    lader = BrueckentagLader(hass)
+
+    with patch(
+        "custom_components.schulferien.brueckentage.lese_brueckentage",
+        wraps=lese_brueckentage,
+    ) as mock_lesen:
+        erste = await lader.async_lade(str(datei))
+        zweite = await lader.async_lade(str(datei))
+        assert mock_lesen.call_count == 1
+
+        datei.write_text('bridge_days:\n  - "27.12.2024"\n')
+        zeit = os.stat(datei).st_mtime_ns + 1_000_000_000
+        os.utime(datei, ns=(zeit, zeit))
+        dritte = await lader.async_lade(str(datei))
+
+    assert erste == zweite == [date(2024, 5, 10), date(2024, 10, 4)]
+    assert dritte == [date(2024, 12, 27)]
+    assert mock_lesen.call_count == 2
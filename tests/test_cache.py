@@ -0,0 +1,107 @@
+"""Unit Tests für den persistenten Antwort-Cache."""
+
+import json
+from datetime import date
+from unittest.mock import patch, AsyncMock, MagicMock
+import pytest
+from custom_components.schulferien.api_utils import fetch_data
+from custom_components.schulferien.cache import AbschnittsCache, AntwortCache
+from custom_components.schulferien.messwerte import Messwerte
+
+URL = "https://example.com/api"
+PARAMETER = {
+    "countryIsoCode": "DE",
+    "subdivisionCode": "DE-BY",
+    "validFrom": "2024-05-19",
+    "validTo": "2025-06-18",
+}
+
+@pytest.fixture
+def cache():
+    with patch("custom_components.schulferien.cache.Store"):
+        yield AntwortCache(MagicMock())
+
+async def _bloecke(daten):
+    """Liefert den Antworttext wie aiohttp in Blöcken."""
+    for start in range(0, len(daten), 8):
+        yield daten[start:start + 8]
+
+def _session(status, json_daten=None, headers=None):
+    """Erstellt eine Session, deren get() eine feste Antwort liefert."""
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    response.content.iter_chunked = MagicMock(
+        return_value=_bloecke(json.dumps(json_daten).encode())
+    )
+    kontext = MagicMock()
+    kontext.__aenter__ = AsyncMock(return_value=response)
+    kontext.__aexit__ = AsyncMock(return_value=False)
+    session = MagicMock()
+    session.get = MagicMock(return_value=kontext)
+    return session
+
+@pytest.mark.asyncio
+async def test_antwort_wird_mit_etag_gespeichert(cache):
+    session = _session(200, [{"startDate": "2024-06-01"}], {"ETag": '"abc"'})
+
+    result = await fetch_data(URL, PARAMETER, session, cache)
+
+    assert result == [{"startDate": "2024-06-01"}]
+    eintrag = cache.hole(URL, PARAMETER)
+    assert eintrag["etag"] == '"abc"'
+    assert eintrag["daten"] == result
+
+@pytest.mark.asyncio
+async def test_304_liefert_gespeicherte_daten(cache):
+    cache.speichere(URL, PARAMETER, ["alt"], etag='"abc"', last_modified="Mon, 01 Jan 2024")
+    session = _session(304)
+
+    result = await fetch_data(URL, PARAMETER, session, cache)
+
+    assert result == ["alt"]
+    headers = session.get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"abc"'
+    assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024"
+
+def test_anderes_zeitfenster_ist_kein_exakter_treffer(cache):
+    cache.speichere(URL, PARAMETER, ["alt"], etag='"abc"')
+    verschoben = {**PARAMETER, "validFrom": "2024-05-20", "validTo": "2025-06-19"}
+
+    assert cache.hole(URL, verschoben) is None
+    assert cache.hole_letzte(URL, verschoben)["daten"] == ["alt"]
+
+def test_abschnitte_werden_getrennt_gespeichert(cache):
+    jahr_2024 = {**PARAMETER, "validFrom": "2024-01-01", "validTo": "2024-12-31"}
+    jahr_2025 = {**PARAMETER, "validFrom": "2025-01-01", "validTo": "2025-12-31"}
+    AbschnittsCache(cache, "2024").speichere(URL, jahr_2024, ["2024"], etag='"a"')
+    AbschnittsCache(cache, "2025").speichere(URL, jahr_2025, ["2025"], etag='"b"')
+    cache.speichere(URL, PARAMETER, ["fenster"])
+
+    assert AbschnittsCache(cache, "2024").hole(URL, jahr_2024)["etag"] == '"a"'
+    assert AbschnittsCache(cache, "2025").hole(URL, jahr_2025)["daten"] == ["2025"]
+    assert cache.hole(URL, PARAMETER)["daten"] == ["fenster"]
+
+def test_vergangene_abschnitte_werden_verworfen(cache):
+    jahr_2023 = {**PARAMETER, "validFrom": "2023-01-01", "validTo": "2023-12-31"}
+    AbschnittsCache(cache, "2023").speichere(URL, jahr_2023, ["2023"])
+    cache.speichere(URL, PARAMETER, ["fenster"])
+
+    cache.verwerfe_vor(date(2024, 5, 19))
+
+    assert AbschnittsCache(cache, "2023").hole_letzte(URL, jahr_2023) is None
+    assert cache.hole(URL, PARAMETER)["daten"] == ["fenster"]
+
+@pytest.mark.asyncio
+async def test_messwerte_zaehlen_bytes_und_cache_treffer(cache):
+    messwerte = Messwerte()
+    daten = [{"startDate": "2024-06-01"}]
+
+    await fetch_data(
+        URL, PARAMETER, _session(200, daten, {"ETag": '"abc"'}), cache, messwerte=messwerte
+    )
+    await fetch_data(URL, PARAMETER, _session(304), cache, messwerte=messwerte)
+
+    assert messwerte.bytes_empfangen == len(json.dumps(daten).encode())
+    assert (messwerte.cache_treffer, messwerte.cache_fehlschlaege) == (1, 1)
+    assert messwerte.histogramme["abruf"].anzahl == 2
@@ -0,0 +1,76 @@
+"""Unit Tests für die Kalender der Schulferien und Feiertage."""
+
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+import pytest
+from homeassistant.util import dt as dt_util
+from custom_components.schulferien.calendar import (
+    FEIERTAGE_KALENDER,
+    SchulferienKalender,
+    async_setup_entry,
+)
+from custom_components.schulferien.const import DOMAIN
+from custom_components.schulferien.coordinator import SchulferienCoordinator
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+
+@pytest.fixture
+def kalender():
+    coordinator = SchulferienCoordinator(MagicMock(), "DE", "DE-BY", "DE")
+    coordinator.data["feiertag_index"] = FerienIndex([
+        Zeitraum("Tag der Deutschen Einheit", date(2024, 10, 3), date(2024, 10, 3)),
+        Zeitraum("Allerheiligen", date(2024, 11, 1), date(2024, 11, 1)),
+        Zeitraum("Weihnachten", date(2024, 12, 25), date(2024, 12, 26)),
+    ])
+    return SchulferienKalender(
+        coordinator, FEIERTAGE_KALENDER, "feiertag_index", "calendar.feiertage"
+    )
+
+def _lokal(*args):
+    return dt_util.as_local(datetime(*args))
+
+@pytest.mark.asyncio
+async def test_termine_im_bereich(kalender):
+    termine = await kalender.async_get_events(
+        MagicMock(), _lokal(2024, 10, 1), _lokal(2024, 11, 1)
+    )
+
+    assert [(t.summary, t.start, t.end) for t in termine] == [
+        ("Tag der Deutschen Einheit", date(2024, 10, 3), date(2024, 10, 4))
+    ]
+
+@pytest.mark.asyncio
+async def test_mehrtaegiger_termin_am_bereichsanfang(kalender):
+    termine = await kalender.async_get_events(
+        MagicMock(), _lokal(2024, 12, 26), _lokal(2025, 1, 1)
+    )
+
+    assert [t.summary for t in termine] == ["Weihnachten"]
+
+@pytest.mark.parametrize(
+    "heute, erwartet",
+    [
+        (datetime(2024, 10, 3, 12), "Tag der Deutschen Einheit"),
+        (datetime(2024, 10, 4, 12), "Allerheiligen"),
+        (datetime(2024, 12, 27, 12), None),
+    ],
+)
+def test_laufender_oder_naechster_termin(kalender, heute, erwartet):
+    with patch(
+        "custom_components.schulferien.calendar.dt_util.now",
+        return_value=dt_util.as_local(heute),
+    ):
+        termin = kalender.event
+
+    assert (termin.summary if termin else None) == erwartet
+
+@pytest.mark.asyncio
+async def test_kalender_mehrerer_entries_haben_eigene_unique_ids():
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"a": MagicMock(), "b": MagicMock()}}
+    hinzugefuegt = []
+    for entry_id in ("a", "b"):
+        entry = MagicMock()
+        entry.entry_id = entry_id
+        await async_setup_entry(hass, entry, hinzugefuegt.extend)
+
+    assert len({kalender.unique_id for kalender in hinzugefuegt}) == 4
@@ -1,6 +1,6 @@
 """Unit Test für den ConfigFlow der Schulferien-Integration."""
 
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 import pytest
 from custom_components.schulferien.config_flow import SchulferienFlowHandler
 
@@ -17,58 +17,48 @@ async def mock_config_flow(mock_hass):
     flow.hass.config.language = "de"  # Setze die Sprache auf "de"
     return flow
 
+def _flow(hass):
+    """Erstellt einen Flow auf der echten Home Assistant Instanz."""
+    flow = SchulferienFlowHandler()
+    flow.hass = hass
+    return flow
+
 @pytest.mark.asyncio
 async def test_user_step_valid_input(mock_config_flow):
     """Testet die Benutzereingabe mit gültigen Werten."""
-    # Patch die Methode async_create_entry
-    with patch(
-        "homeassistant.config_entries.ConfigFlow.async_create_entry"
-    ) as mock_create_entry:
+    with patch.object(
+        mock_config_flow, '_fetch_supported_countries', return_value={"DE": "Deutschland"}
+    ), patch.object(
+        mock_config_flow, '_fetch_supported_regions', return_value={"BE": "Berlin"}
+    ):
         # Schritt 1: Benutzerformular
-        with patch.object(
-            mock_config_flow, '_fetch_supported_countries', return_value={"DE": "Deutschland"}
-        ):
-            result = await mock_config_flow.async_step_user()
-            assert result["type"] == "form"
-            assert "errors" not in result
-
-            result = await mock_config_flow.async_step_user(
-                {"country": "DE"}
-            )
-            assert result["type"] == "form"
-            assert "errors" not in result
+        result = await mock_config_flow.async_step_user()
+        assert result["type"] == "form"
+        assert not result["errors"]
 
         # Schritt 2: Regionsformular
-        with patch.object(
-            mock_config_flow, '_fetch_supported_regions', return_value={"BE": "Berlin"}
-        ):
-            result = await mock_config_flow.async_step_region()
-            assert result["type"] == "form"
-            assert "errors" not in result
-
-            result = await mock_config_flow.async_step_region(
-                {"region": "BE"}
-            )
-            assert result["type"] == "form"
-            assert "errors" not in result
+        mock_config_flow.supported_countries = {"DE": "Deutschland"}
+        mock_config_flow.supported_regions = {"DE": {"BE": "Berlin"}}
+        result = await mock_config_flow.async_step_user({"country": "DE"})
+        assert result["type"] == "form"
+        assert result["step_id"] == "region"
+        assert not result["errors"]
 
-        # Schritt 3: Abschlussformular
-        result = await mock_config_flow.async_step_finish()
+        # Schritt 3: Auswahl der Region erstellt den Eintrag
+        result = await mock_config_flow.async_step_region({"region": "BE"})
         assert result["type"] == "create_entry"
         assert result["title"] == "Schulferien - Deutschland (Berlin)"
-        mock_create_entry.assert_called_once()
+        assert result["data"]["region"] == "BE"
 
 @pytest.mark.asyncio
 async def test_user_step_invalid_region(mock_config_flow):
     """Testet die Benutzereingabe mit ungültiger Region."""
     with patch.object(
         mock_config_flow, '_fetch_supported_countries', return_value={"DE": "Deutschland"}
-    ):
-        await mock_config_flow.async_step_user({"country": "DE"})
-
-    with patch.object(
+    ), patch.object(
         mock_config_flow, '_fetch_supported_regions', return_value={"BE": "Berlin"}
     ):
+        await mock_config_flow.async_step_user({"country": "DE"})
         result = await mock_config_flow.async_step_region({"region": "Ungültig"})
         assert result["type"] == "form"
         assert result["errors"] == {"region": "ungültige_region"}
@@ -79,3 +69,49 @@ async def test_finish_step_missing_input(mock_config_flow):
     result = await mock_config_flow.async_step_finish()
     assert result["type"] == "abort"
     assert result["reason"] == "incomplete_configuration"
+
+async def test_zweiter_flow_nutzt_katalog(hass):
+    """Ein zweiter Flow bekommt Länder und Regionen aus dem Katalog statt von der API."""
+    hass.config.country = None
+    with patch(
+        "custom_components.schulferien.cache.Store.async_load", new=AsyncMock(return_value=None)
+    ), patch(
+        "custom_components.schulferien.katalog.async_lade_laender",
+        new=AsyncMock(return_value={"DE": "Deutschland"}),
+    ) as lade_laender, patch(
+        "custom_components.schulferien.katalog.async_lade_regionen",
+        new=AsyncMock(return_value={"DE-BE": "Berlin"}),
+    ) as lade_regionen:
+        for _ in range(2):
+            flow = _flow(hass)
+            await flow.async_step_user()
+            result = await flow.async_step_user({"country": "DE"})
+            assert result["step_id"] == "region"
+
+    assert lade_laender.await_count == 1
+    assert lade_regionen.await_count == 1
+
+async def test_laenderauswahl_ruft_regionen_vorab_ab(hass):
+    """Schon das Länderformular lädt die Regionen des Home Assistant-Landes vor."""
+    hass.config.country = "DE"
+    with patch(
+        "custom_components.schulferien.cache.Store.async_load", new=AsyncMock(return_value=None)
+    ), patch(
+        "custom_components.schulferien.katalog.async_lade_laender",
+        new=AsyncMock(return_value={"DE": "Deutschland", "AT": "Österreich"}),
+    ), patch(
+        "custom_components.schulferien.katalog.async_lade_regionen",
+        new=AsyncMock(return_value={"DE-BE": "Berlin"}),
+    ) as lade_regionen:
+        flow = _flow(hass)
+        result = await flow.async_step_user()
+        assert result["step_id"] == "user"
+        await hass.async_block_till_done()
+        assert lade_regionen.await_count == 1
+
+        result = await flow.async_step_user({"country": "DE"})
+        assert result["step_id"] == "region"
+        await flow.async_step_user({"country": "AT"})
+
+    # DE kommt aus dem Vorabruf, AT wird erst bei der Auswahl abgerufen
+    assert [aufruf.args[1] for aufruf in lade_regionen.await_args_list] == ["DE", "AT"]
@@ -0,0 +1,589 @@
+"""Unit Tests für den gemeinsamen SchulferienCoordinator."""
+
+import asyncio
+import time
+from datetime import date, datetime
+from unittest.mock import patch, AsyncMock, MagicMock
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+from homeassistant.util import dt as dt_util
+from custom_components.schulferien.const import DOMAIN
+from custom_components.schulferien.cache import AntwortCache
+from custom_components.schulferien.coordinator import (
+    SchulferienCoordinator,
+    async_hole_coordinator,
+    async_gib_coordinator_frei,
+)
+
+FERIEN_JSON = [
+    {"name": [{"text": "Sommerferien"}], "startDate": "2024-07-29", "endDate": "2024-09-09"}
+]
+
+def _entry(entry_id, land="DE", region="DE-BY", optionen=None):
+    entry = MagicMock()
+    entry.entry_id = entry_id
+    entry.data = {"land": land, "region": region}
+    entry.options = optionen or {}
+    return entry
+
+@pytest.fixture
+def hass():
+    hass = MagicMock()
+    hass.data = {}
+    hass.config.language = "de"
+    return hass
+
+@pytest.fixture
+def juni_2024():
+    """Legt den aktuellen Tag auf den 18.06.2024, passend zu FERIEN_JSON."""
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 6, 18, 12)),
+    ):
+        yield
+
+@pytest.fixture(autouse=True)
+def kein_zeitplan():
+    with patch("custom_components.schulferien.coordinator.async_track_time_change"), patch(
+        "custom_components.schulferien.coordinator.async_track_point_in_time"
+    ) as mock_point_in_time:
+        yield mock_point_in_time
+
+def test_entries_teilen_coordinator(hass):
+    """Entries mit gleichem Standort teilen sich einen Coordinator."""
+    erster = async_hole_coordinator(hass, _entry("a"))
+    zweiter = async_hole_coordinator(hass, _entry("b"))
+    anderer = async_hole_coordinator(hass, _entry("c", region="DE-BE"))
+
+    assert erster is zweiter
+    assert anderer is not erster
+    assert erster.schluessel == ("DE", "DE-BY", "DE")
+    assert len(hass.data[DOMAIN]["coordinators"]) == 2
+
+def test_coordinator_wird_freigegeben(hass):
+    """Der Coordinator wird erst mit dem letzten Entry entfernt."""
+    async_hole_coordinator(hass, _entry("a"))
+    async_hole_coordinator(hass, _entry("b"))
+
+    async_gib_coordinator_frei(hass, _entry("a"))
+    assert ("DE", "DE-BY", "DE") in hass.data[DOMAIN]["coordinators"]
+
+    async_gib_coordinator_frei(hass, _entry("b"))
+    assert not hass.data[DOMAIN]["coordinators"]
+
+def test_optionen_mehrerer_entries_werden_zusammengefuehrt(hass):
+    """Die umfassendere Einstellung gilt, unabhängig von der Reihenfolge der Entries."""
+    # Eine längere Vorausschau startet einen Abruf, der hier nicht gebraucht wird
+    hass.async_create_task.side_effect = lambda aufgabe: aufgabe.close()
+    erster = _entry("a", optionen={"vorausschau_jahre": 1, "brueckentage_berechnen": False})
+    zweiter = _entry("b", optionen={
+        "vorausschau_jahre": 3,
+        "brueckentage_berechnen": True,
+        "brueckentage_max_luecke": 2,
+        "brueckentage_nur_schulzeit": True,
+    })
+    coordinator = async_hole_coordinator(hass, erster)
+    async_hole_coordinator(hass, zweiter)
+
+    erwartet = {
+        "vorausschau_jahre": 3,
+        "brueckentage_berechnen": True,
+        "brueckentage_max_luecke": 2,
+        "brueckentage_nur_schulzeit": True,
+    }
+    assert coordinator.optionen == erwartet
+
+    # Eine Änderung am ersten Entry überschreibt die Optionen des zweiten nicht
+    coordinator.async_setze_eintrag_optionen("a", {"vorausschau_jahre": 2})
+    assert coordinator.optionen == erwartet
+
+    async_gib_coordinator_frei(hass, zweiter)
+    assert coordinator.optionen == {"vorausschau_jahre": 2}
+
+@pytest.mark.usefixtures("juni_2024")
+@pytest.mark.asyncio
+async def test_mehrere_regionen_nutzen_landesweiten_abruf(hass):
+    """Regionen desselben Landes teilen sich einen Abruf ohne subdivisionCode."""
+    bayern = async_hole_coordinator(hass, _entry("a"))
+    nrw = async_hole_coordinator(hass, _entry("b", region="DE-NW"))
+    landes_json = [
+        {**FERIEN_JSON[0], "subdivisions": [{"code": "DE-BY"}]},
+        {"name": [{"text": "Herbstferien"}], "startDate": "2024-10-14",
+         "endDate": "2024-10-26", "subdivisions": [{"code": "DE-NW"}]},
+    ]
+
+    with patch(
+        "custom_components.schulferien.coordinator.fetch_data",
+        new=AsyncMock(return_value=landes_json),
+    ) as mock_fetch:
+        await asyncio.gather(bayern.async_refresh(MagicMock()), nrw.async_refresh(MagicMock()))
+
+    # Zwei Endpunkte mit je zwei Jahresabschnitten
+    assert mock_fetch.await_count == 4
+    assert all("subdivisionCode" not in aufruf.args[1] for aufruf in mock_fetch.await_args_list)
+    assert [z.name for z in bayern.data["ferien_index"]] == ["Sommerferien"]
+    assert [z.name for z in nrw.data["ferien_index"]] == ["Herbstferien"]
+
+    async_gib_coordinator_frei(hass, _entry("a"))
+    async_gib_coordinator_frei(hass, _entry("b"))
+    assert not hass.data[DOMAIN]["landesabrufe"]
+
+@pytest.mark.usefixtures("juni_2024")
+@pytest.mark.asyncio
+async def test_landesweiter_abruf_landet_pro_region_im_cache(hass):
+    """Nach einem landesweiten Abruf startet jede Region aus ihrem eigenen Cache-Eintrag."""
+    with patch("custom_components.schulferien.cache.Store"):
+        cache = AntwortCache(MagicMock())
+    bayern = async_hole_coordinator(hass, _entry("a"), cache=cache)
+    nrw = async_hole_coordinator(hass, _entry("b", region="DE-NW"), cache=cache)
+    landes_json = [
+        {**FERIEN_JSON[0], "subdivisions": [{"code": "DE-BY"}]},
+        {"name": [{"text": "Herbstferien"}], "startDate": "2024-10-14",
+         "endDate": "2024-10-26", "subdivisions": [{"code": "DE-NW"}]},
+    ]
+    with patch(
+        "custom_components.schulferien.coordinator.fetch_data",
+        new=AsyncMock(return_value=landes_json),
+    ):
+        await asyncio.gather(bayern.async_refresh(MagicMock()), nrw.async_refresh(MagicMock()))
+
+    neu = SchulferienCoordinator(hass, "DE", "DE-NW", "DE", cache=cache)
+    assert neu.async_lade_aus_cache()
+    assert [z.name for z in neu.data["ferien_index"]] == ["Herbstferien"]
+
+@pytest.mark.usefixtures("juni_2024")
+@pytest.mark.asyncio
+async def test_parallele_refreshes_rufen_api_einmal_ab(hass):
+    """Viele Entitäten lösen zusammen nur einen Abruf pro Endpunkt aus."""
+    coordinator = SchulferienCoordinator(hass, "DE", "DE-BY", "DE")
+    listener = MagicMock()
+    coordinator.async_add_listener(listener)
+
+    with patch(
+        "custom_components.schulferien.coordinator.fetch_data",
+        new=AsyncMock(return_value=FERIEN_JSON),
+    ) as mock_fetch:
+        await asyncio.gather(*(coordinator.async_refresh(MagicMock()) for _ in range(8)))
+
+    assert mock_fetch.await_count == 4
+    assert listener.call_count == 1
+    assert coordinator.data["ferien_index"][0].name == "Sommerferien"
+    assert coordinator.data["feiertag_index"][0].name == "Sommerferien"
+
+def _stub_server(verzoegerungen):
+    """Erstellt einen lokalen Stub-Server mit einer Verzögerung pro Pfad.
+
+    Ein negativer Wert antwortet nach dieser Zeit mit HTTP 404.
+    """
+    def handler_fuer(verzoegerung):
+        async def handler(_request):
+            await asyncio.sleep(abs(verzoegerung))
+            if verzoegerung < 0:
+                return web.Response(status=404)
+            return web.json_response(FERIEN_JSON)
+        return handler
+
+    app = web.Application()
+    for pfad, verzoegerung in verzoegerungen.items():
+        app.router.add_get(pfad, handler_fuer(verzoegerung))
+    return TestServer(app)
+
+@pytest.fixture
+async def langsamer_primaerserver(monkeypatch):
+    """Primäre URLs antworten erst nach 0,4 s mit einem Fehler, Fallbacks sofort."""
+    server = _stub_server({
+        "/SchoolHolidays": -0.4,
+        "/Holidays/SchoolHolidays": 0,
+        "/PublicHolidays": -0.4,
+        "/Holidays/PublicHolidays": 0,
+    })
+    await server.start_server()
+    for konstante, pfad in (
+        ("API_URL_FERIEN", "/SchoolHolidays"),
+        ("API_FALLBACK_FERIEN", "/Holidays/SchoolHolidays"),
+        ("API_URL_FEIERTAGE", "/PublicHolidays"),
+        ("API_FALLBACK_FEIERTAGE", "/Holidays/PublicHolidays"),
+    ):
+        monkeypatch.setattr(
+            f"custom_components.schulferien.coordinator.{konstante}", str(server.make_url(pfad))
+        )
+    yield server
+    await server.close()
+
+@pytest.mark.usefixtures("socket_enabled", "juni_2024")
+@pytest.mark.asyncio
+async def test_hedging_verkuerzt_worst_case(hass, langsamer_primaerserver):
+    """Paralleler Abruf mit Hedging ist deutlich schneller als der sequentielle Abruf."""
+    async with aiohttp.ClientSession() as session:
+        sequentiell = SchulferienCoordinator(
+            hass, "DE", "DE-BY", "DE", hedge_verzoegerung=None
+        )
+        api_parameter = sequentiell.get_api_parameter(date(2024, 6, 18))
+        start = time.perf_counter()
+        assert await sequentiell.hole_ferien_daten(api_parameter, session)
+        assert await sequentiell.hole_feiertags_daten(api_parameter, session)
+        dauer_sequentiell = time.perf_counter() - start
+
+        gehedged = SchulferienCoordinator(hass, "DE", "DE-BY", "DE", hedge_verzoegerung=0.05)
+        start = time.perf_counter()
+        await gehedged.async_refresh(session)
+        dauer_gehedged = time.perf_counter() - start
+
+    assert len(gehedged.data["ferien_index"]) == 1
+    assert len(gehedged.data["feiertag_index"]) == 1
+    assert dauer_sequentiell >= 0.8
+    assert dauer_gehedged < dauer_sequentiell / 2
+    assert gehedged.messwerte.letzte_quelle == "fallback"
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.asyncio
+async def test_schnelle_primaer_url_startet_keinen_fallback(hass, monkeypatch):
+    """Antwortet die primäre URL vor Ablauf der Verzögerung, bleibt der Fallback aus."""
+    aufrufe = []
+
+    async def primaer(_request):
+        aufrufe.append("primaer")
+        return web.json_response(FERIEN_JSON)
+
+    async def fallback(_request):
+        aufrufe.append("fallback")
+        return web.json_response(FERIEN_JSON)
+
+    app = web.Application()
+    app.router.add_get("/primaer", primaer)
+    app.router.add_get("/fallback", fallback)
+    server = TestServer(app)
+    await server.start_server()
+
+    coordinator = SchulferienCoordinator(hass, "DE", "DE-BY", "DE", hedge_verzoegerung=1.0)
+    try:
+        async with aiohttp.ClientSession() as session:
+            daten = await coordinator._hole_daten(
+                [str(server.make_url("/primaer")), str(server.make_url("/fallback"))],
+                {},
+                session,
+            )
+    finally:
+        await server.close()
+
+    assert daten == FERIEN_JSON
+    assert aufrufe == ["primaer"]
+    assert coordinator.messwerte.letzte_quelle == "primaer"
+
+@pytest.mark.usefixtures("juni_2024")
+@pytest.mark.asyncio
+async def test_aktualisierung_wird_gemessen(hass):
+    """Ein Update erfasst Laufzeiten der Phasen und die übernommenen Einträge."""
+    coordinator = SchulferienCoordinator(hass, "DE", "DE-BY", "DE", hedge_verzoegerung=None)
+    coordinator.async_add_listener(MagicMock())
+    with patch(
+        "custom_components.schulferien.coordinator.fetch_data",
+        new=AsyncMock(return_value=FERIEN_JSON),
+    ):
+        await coordinator.async_refresh(MagicMock())
+
+    messwerte = coordinator.messwerte.als_dict()
+    for phase in ("aktualisierung", "parsen", "zustand_schreiben"):
+        assert messwerte["laufzeiten"][phase]["anzahl"] == 1
+    # Je zwei Jahresabschnitte für Ferien und Feiertage, alle von der primären URL
+    assert sum(messwerte["quellen"].values()) == 4
+    assert messwerte["letzte_quelle"] == "primaer"
+    assert messwerte["eintraege_letzte_aktualisierung"] == 2
+
+@pytest.mark.asyncio
+async def test_fehlschlag_behaelt_alte_daten(hass):
+    """Schlägt ein Update fehl, bleiben die letzten Daten gültig und ein Nachholen wird geplant."""
+    coordinator = SchulferienCoordinator(hass, "DE", "DE-BY", "DE")
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 6, 18, 12)),
+    ), patch(
+        "custom_components.schulferien.coordinator.fetch_data",
+        new=AsyncMock(return_value=FERIEN_JSON),
+    ):
+        await coordinator.async_refresh(MagicMock())
+
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 6, 25, 12)),
+    ), patch(
+        "custom_components.schulferien.coordinator.fetch_data",
+        new=AsyncMock(return_value={}),
+    ), patch(
+        "custom_components.schulferien.coordinator.async_call_later"
+    ) as mock_call_later:
+        # Nach sieben Tagen wird das laufende Jahr revalidiert, das schlägt fehl
+        await coordinator.async_refresh(MagicMock())
+        assert coordinator.datenalter == 7
+
+    assert len(coordinator.data["ferien_index"]) == 1
+    mock_call_later.assert_called_once()
+
+@pytest.mark.usefixtures("juni_2024")
+@pytest.mark.asyncio
+async def test_erzwungenes_update_fragt_ganzes_fenster_ab(hass):
+    """Mit erzwingen wird am selben Tag erneut und für alle Jahresabschnitte abgefragt."""
+    coordinator = SchulferienCoordinator(hass, "DE", "DE-BY", "DE", hedge_verzoegerung=None)
+    mock_abruf = AsyncMock(return_value=FERIEN_JSON)
+    with patch("custom_components.schulferien.coordinator.fetch_data", new=mock_abruf):
+        await coordinator.async_refresh(MagicMock())
+        await coordinator.async_refresh(MagicMock())
+        assert mock_abruf.await_count == 4
+
+        await coordinator.async_refresh(MagicMock(), erzwingen=True)
+
+    assert mock_abruf.await_count == 8
+    assert len(coordinator.data["ferien_index"]) == 1
+
+@pytest.mark.usefixtures("socket_enabled", "juni_2024")
+@pytest.mark.asyncio
+async def test_erzwungenes_update_laedt_trotz_etag_vollstaendig(hass, monkeypatch):
+    """Ein erzwungenes Update stellt keine bedingten Anfragen und parst jede Antwort neu."""
+    antworten = []
+
+    async def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            antworten.append(304)
+            return web.Response(status=304)
+        antworten.append(200)
+        return web.json_response(FERIEN_JSON, headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/SchoolHolidays", handler)
+    app.router.add_get("/PublicHolidays", handler)
+    server = TestServer(app)
+    await server.start_server()
+    monkeypatch.setattr(
+        "custom_components.schulferien.coordinator.API_URL_FERIEN",
+        str(server.make_url("/SchoolHolidays")),
+    )
+    monkeypatch.setattr(
+        "custom_components.schulferien.coordinator.API_URL_FEIERTAGE",
+        str(server.make_url("/PublicHolidays")),
+    )
+    with patch("custom_components.schulferien.cache.Store"):
+        cache = AntwortCache(MagicMock())
+    erster, coordinator = (
+        SchulferienCoordinator(hass, "DE", "DE-BY", "DE", hedge_verzoegerung=None, cache=cache)
+        for _ in range(2)
+    )
+    try:
+        async with aiohttp.ClientSession() as session:
+            await erster.async_refresh(session)
+            # Ohne erzwingen revalidiert der zweite Coordinator per If-None-Match
+            await coordinator.async_refresh(session)
+            assert antworten == [200] * 4 + [304] * 4
+
+            await coordinator.async_refresh(session, erzwingen=True)
+    finally:
+        await server.close()
+
+    assert antworten[8:] == [200] * 4
+    assert coordinator.messwerte.bytes_letzte_aktualisierung > 0
+    assert coordinator.messwerte.cache_fehlschlaege == 4
+    assert len(coordinator.data["ferien_index"]) == 1
+
+@pytest.mark.usefixtures("juni_2024")
+@pytest.mark.asyncio
+async def test_gestoppter_coordinator_plant_nichts_mehr(hass, kein_zeitplan):
+    """Wird der Zeitplan während eines Updates gestoppt, plant das Update nichts mehr ein."""
+    coordinator = SchulferienCoordinator(hass, "DE", "DE-BY", "DE", hedge_verzoegerung=None)
+
+    async def abruf(*_args, **_kwargs):
+        coordinator.async_stoppe_zeitplan()
+        return {}
+
+    with patch("custom_components.schulferien.coordinator.fetch_data", new=abruf), patch(
+        "custom_components.schulferien.coordinator.async_call_later"
+    ) as mock_call_later:
+        await coordinator.async_refresh(MagicMock())
+
+    mock_call_later.assert_not_called()
+    kein_zeitplan.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_tageswechsel_wird_zum_periodenrand_geplant(hass, kein_zeitplan):
+    """Nach einem Update wird genau die nächste Mitternacht an einem Periodenrand geplant."""
+    coordinator = SchulferienCoordinator(hass, "DE", "DE-BY", "DE")
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 6, 18, 12)),
+    ), patch(
+        "custom_components.schulferien.coordinator.fetch_data",
+        new=AsyncMock(return_value=FERIEN_JSON),
+    ):
+        await coordinator.async_refresh(MagicMock())
+
+    assert coordinator.naechster_wechsel(date(2024, 6, 18)) == date(2024, 7, 28)
+    assert coordinator.naechster_wechsel(date(2024, 7, 28)) == date(2024, 7, 29)
+    assert coordinator.naechster_wechsel(date(2024, 9, 9)) == date(2024, 9, 10)
+    assert coordinator.naechster_wechsel(date(2024, 9, 10)) is None
+
+    _, callback, zeitpunkt = kein_zeitplan.call_args.args
+    assert zeitpunkt == dt_util.start_of_local_day(date(2024, 7, 28))
+
+    listener = MagicMock()
+    coordinator.async_add_listener(listener)
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 7, 28)),
+    ):
+        callback(zeitpunkt)
+    listener.assert_called_once()
+    assert kein_zeitplan.call_args.args[2] == dt_util.start_of_local_day(date(2024, 7, 29))
+
+@pytest.mark.asyncio
+async def test_brueckentage_werden_ohne_neuen_abruf_ersetzt(hass):
+    """Geänderte Brückentage ersetzen die alten im Index, ohne die API abzufragen."""
+    coordinator = SchulferienCoordinator(
+        hass, "DE", "DE-BY", "DE", brueckentage=[date(2024, 5, 10)]
+    )
+    abruf = AsyncMock(return_value=FERIEN_JSON)
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 5, 1, 12)),
+    ), patch("custom_components.schulferien.coordinator.fetch_data", new=abruf):
+        await coordinator.async_refresh(MagicMock())
+        aufrufe = abruf.await_count
+        version = coordinator.datenversion
+        listener = MagicMock()
+        coordinator.async_add_listener(listener)
+
+        coordinator.async_setze_brueckentage([date(2024, 10, 4)])
+
+    assert abruf.await_count == aufrufe
+    assert coordinator.datenversion == version + 1
+    listener.assert_called_once()
+    index = coordinator.data["ferien_index"]
+    assert not index.enthaelt(date(2024, 5, 10))
+    assert index.finde(date(2024, 10, 4)).name == "Brückentag"
+    assert index.finde(date(2024, 8, 1)).name == "Sommerferien"
+    assert date(2024, 10, 5) in coordinator.data["wechsel_tage"]
+
+    coordinator.async_setze_brueckentage([date(2024, 10, 4)])
+    assert coordinator.datenversion == version + 1
+
+FEIERTAGE_JSON = [
+    {
+        "name": [{"text": "Tag der Deutschen Einheit"}],
+        "startDate": "2024-10-03",
+        "endDate": "2024-10-03",
+    }
+]
+
+@pytest.mark.asyncio
+async def test_berechnete_brueckentage_folgen_den_optionen(hass):
+    """Berechnete Brückentage werden getrennt markiert und bei Optionsänderung neu berechnet."""
+    coordinator = SchulferienCoordinator(
+        hass, "DE", "DE-BY", "DE", optionen={"brueckentage_berechnen": True}
+    )
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 6, 18, 12)),
+    ), patch(
+        "custom_components.schulferien.coordinator.fetch_data",
+        new=AsyncMock(side_effect=lambda url, *_args, **_kwargs: (
+            FEIERTAGE_JSON if "Public" in url else FERIEN_JSON
+        )),
+    ):
+        await coordinator.async_refresh(MagicMock())
+        assert coordinator.data["berechnete_brueckentage"] == [date(2024, 10, 4)]
+        assert coordinator.data["ferien_index"].finde(date(2024, 10, 4)).name == (
+            "Brückentag (berechnet)"
+        )
+        assert coordinator.data["tageskalender"].ist_frei(date(2024, 10, 4))
+
+        coordinator.async_setze_optionen({"brueckentage_berechnen": False})
+
+    assert coordinator.data["berechnete_brueckentage"] == []
+    assert not coordinator.data["ferien_index"].enthaelt(date(2024, 10, 4))
+    assert len(coordinator.data["ferien_index"]) == 1
+
+def _zeitraeume(abruf):
+    """Gibt die abgefragten Zeitfenster (validFrom, validTo) zurück."""
+    return {
+        (aufruf.args[1]["validFrom"], aufruf.args[1]["validTo"]) for aufruf in abruf.await_args_list
+    }
+
+@pytest.mark.asyncio
+async def test_folgetag_ohne_neues_jahr_fragt_nichts_ab(hass):
+    """Solange kein neues Jahr ins Fenster rückt, bleibt der Folgetag ohne Abfrage."""
+    coordinator = SchulferienCoordinator(hass, "DE", "DE-BY", "DE")
+    abruf = AsyncMock(return_value=FERIEN_JSON)
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 6, 18, 12)),
+    ), patch("custom_components.schulferien.coordinator.fetch_data", new=abruf):
+        await coordinator.async_refresh(MagicMock())
+
+    assert _zeitraeume(abruf) == {("2024-01-01", "2024-12-31"), ("2025-01-01", "2025-12-31")}
+
+    abruf.reset_mock()
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 6, 19, 12)),
+    ), patch("custom_components.schulferien.coordinator.fetch_data", new=abruf):
+        await coordinator.async_refresh(MagicMock())
+
+    assert abruf.await_count == 0
+    assert coordinator.data["letztes_update"].date() == date(2024, 6, 19)
+    assert coordinator.data["ferien_index"].finde(date(2024, 8, 1)).name == "Sommerferien"
+
+@pytest.mark.asyncio
+async def test_vorausschau_laedt_jahresabschnitte_begrenzt_parallel(hass):
+    """Mehrere Jahre werden abschnittsweise, aber höchstens zu zweit gleichzeitig abgefragt."""
+    coordinator = SchulferienCoordinator(
+        hass, "DE", "DE-BY", "DE", optionen={"vorausschau_jahre": 3}
+    )
+    laufend = []
+    hoechstens = 0
+
+    async def abruf(_url, api_parameter, *_args, **_kwargs):
+        nonlocal hoechstens
+        laufend.append(api_parameter["validFrom"])
+        hoechstens = max(hoechstens, len(laufend))
+        await asyncio.sleep(0.01)
+        laufend.remove(api_parameter["validFrom"])
+        jahr = api_parameter["validFrom"][:4]
+        return [{"name": [{"text": f"Sommerferien {jahr}"}],
+                 "startDate": f"{jahr}-08-01", "endDate": f"{jahr}-09-10"}]
+
+    mock_abruf = AsyncMock(side_effect=abruf)
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 6, 18, 12)),
+    ), patch("custom_components.schulferien.coordinator.fetch_data", new=mock_abruf):
+        await coordinator.async_refresh(MagicMock())
+
+    assert mock_abruf.await_count == 8
+    assert hoechstens == 2
+    assert coordinator.abruf_fenster(date(2024, 6, 18))[1] == date(2027, 6, 18)
+    assert coordinator.data["ferien_index"].finde(date(2026, 8, 3)).name == "Sommerferien 2026"
+    # Der letzte Abschnitt reicht bis zum Jahresende, auch wenn das Fenster früher endet
+    assert [z.name for z in coordinator.data["ferien_index"]][-1] == "Sommerferien 2027"
+
+    # Eine längere Vorausschau fragt nur die neuen Jahre ab
+    mock_abruf.reset_mock()
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 6, 18, 13)),
+    ), patch("custom_components.schulferien.coordinator.fetch_data", new=mock_abruf):
+        coordinator.async_setze_optionen({"vorausschau_jahre": 4})
+        hass.async_create_task.assert_called_once()
+        hass.async_create_task.call_args.args[0].close()
+        await coordinator.async_refresh(MagicMock())
+
+    assert _zeitraeume(mock_abruf) == {("2028-01-01", "2028-12-31")}
+
+    # Eine kürzere Vorausschau verwirft die überzähligen Jahre ohne Abfrage
+    with patch(
+        "custom_components.schulferien.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2024, 6, 18, 14)),
+    ):
+        coordinator.async_setze_optionen({"vorausschau_jahre": 1})
+
+    assert [z.name for z in coordinator.data["ferien_index"]] == [
+        "Sommerferien 2024", "Sommerferien 2025"
+    ]
@@ -0,0 +1,76 @@
+"""Unit Tests für den Datenbestand des gleitenden Abrufs."""
+
+from datetime import date, timedelta
+import pytest
+from custom_components.schulferien.datenbestand import Datenbestand, jahresabschnitte
+
+HEUTE = date(2024, 6, 18)
+BEGINN, ENDE = HEUTE - timedelta(days=30), HEUTE + timedelta(days=365)
+
+def _eintrag(kennung, start, ende):
+    return {"id": kennung, "startDate": start, "endDate": ende, "name": [{"text": kennung}]}
+
+PFINGSTEN = _eintrag("pfingsten", "2024-05-21", "2024-06-01")
+SOMMER = _eintrag("sommer", "2024-07-29", "2024-09-09")
+
+@pytest.fixture
+def bestand():
+    bestand = Datenbestand()
+    bestand.uebernehme([PFINGSTEN, SOMMER], BEGINN, ENDE, HEUTE)
+    return bestand
+
+def _jahr(jahr):
+    return (date(jahr, 1, 1), date(jahr, 12, 31))
+
+def test_jahresabschnitte_umfassen_ganze_kalenderjahre():
+    assert jahresabschnitte(BEGINN, ENDE) == [_jahr(2024), _jahr(2025)]
+    assert jahresabschnitte(HEUTE, HEUTE + timedelta(days=3 * 365)) == [
+        _jahr(2024), _jahr(2025), _jahr(2026), _jahr(2027)
+    ]
+
+def test_leerer_bestand_fragt_alle_jahre_des_fensters_ab():
+    assert Datenbestand().plane(BEGINN, ENDE, HEUTE) == [_jahr(2024), _jahr(2025)]
+
+def test_folgetage_fragen_nur_neue_jahre_ab(bestand):
+    morgen = HEUTE + timedelta(days=1)
+    assert bestand.plane(BEGINN, ENDE, HEUTE) == []
+    assert bestand.plane(BEGINN + timedelta(days=1), ENDE + timedelta(days=1), morgen) == [
+        _jahr(2025)
+    ]
+
+def test_revalidierung_des_nahbereichs(bestand):
+    tag = date(2024, 11, 20)
+    bestand.uebernehme([], *_jahr(2025), HEUTE)
+    beginn, ende = tag - timedelta(days=30), tag + timedelta(days=365)
+
+    assert bestand.plane(beginn, ende, tag) == [_jahr(2024), _jahr(2025)]
+    sechs_tage = timedelta(days=6)
+    assert bestand.plane(BEGINN + sechs_tage, ENDE + sechs_tage, HEUTE + sechs_tage) == []
+
+def test_kuerzerer_horizont_verwirft_spaetere_eintraege(bestand):
+    bestand.verwerfe_nach(date(2024, 7, 1))
+
+    assert bestand.eintraege() == [PFINGSTEN]
+    assert bestand.bis == date(2024, 7, 1)
+
+def test_antwort_ersetzt_ueberlappende_eintraege(bestand):
+    verschoben = _eintrag("sommer-neu", "2024-07-30", "2024-09-10")
+    bestand.uebernehme([verschoben], date(2024, 7, 1), date(2024, 8, 31), HEUTE)
+
+    assert bestand.eintraege() == [PFINGSTEN, verschoben]
+
+def test_abgelaufene_eintraege_werden_verworfen(bestand):
+    bestand.verwerfe_vor(date(2024, 6, 2))
+
+    assert bestand.eintraege() == [SOMMER]
+    assert bestand.von == date(2024, 6, 2)
+
+def test_luecke_verwirft_alten_bestand(bestand):
+    spaeter = ENDE + timedelta(days=400)
+    assert bestand.plane(spaeter, spaeter + timedelta(days=395), spaeter) == [
+        _jahr(2026), _jahr(2027)
+    ]
+    bestand.uebernehme([], *_jahr(2026), spaeter)
+
+    assert len(bestand) == 0
+    assert (bestand.von, bestand.bis) == _jahr(2026)
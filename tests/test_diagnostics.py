@@ -0,0 +1,64 @@
+"""Unit Tests für Diagnose-Download und Diagnose-Sensoren."""
+
+from datetime import date
+from unittest.mock import MagicMock
+import pytest
+from homeassistant.const import EntityCategory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from custom_components.schulferien.const import DOMAIN, ICS_TOKEN
+from custom_components.schulferien.coordinator import SchulferienCoordinator
+from custom_components.schulferien.diagnose_sensor import erstelle_diagnose_sensoren
+from custom_components.schulferien.diagnostics import async_get_config_entry_diagnostics
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+
+def _coordinator():
+    coordinator = SchulferienCoordinator(MagicMock(), "DE", "DE-BY", "DE")
+    coordinator.data["ferien_index"] = FerienIndex([
+        Zeitraum("Herbstferien", date(2024, 10, 28), date(2024, 10, 31)),
+    ])
+    messwerte = coordinator.messwerte
+    messwerte.histogramme["abruf"].erfasse(0.12)
+    messwerte.zaehle_bytes(2048)
+    messwerte.melde_cache(treffer=True)
+    messwerte.melde_cache(treffer=False)
+    messwerte.melde_quelle("https://openholidaysapi.org/Holidays/SchoolHolidays", primaer=False)
+    return coordinator
+
+@pytest.mark.asyncio
+async def test_diagnose_enthaelt_messwerte(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN, title="Schulferien - Bayern", data={"land": "DE", ICS_TOKEN: "geheim"}
+    )
+    coordinator = _coordinator()
+    coordinator.hass = hass
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    diagnose = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnose["eintrag"]["daten"] == {"land": "DE", ICS_TOKEN: "**REDACTED**"}
+    assert diagnose["coordinator"]["schluessel"] == ["DE", "DE-BY", "DE"]
+    assert diagnose["coordinator"]["ferien"] == 1
+    assert diagnose["coordinator"]["letztes_update"] is None
+    messwerte = diagnose["messwerte"]
+    assert messwerte["laufzeiten"]["abruf"]["eimer"]["<=500"] == 1
+    assert messwerte["bytes_empfangen"] == 2048
+    assert messwerte["cache_trefferquote"] == 50.0
+    assert messwerte["letzte_quelle"] == "fallback"
+
+def test_diagnose_sensoren():
+    sensoren = {
+        sensor.entity_description.key: sensor
+        for sensor in erstelle_diagnose_sensoren(_coordinator(), "a")
+    }
+
+    assert all(
+        sensor.entity_description.entity_category == EntityCategory.DIAGNOSTIC
+        for sensor in sensoren.values()
+    )
+    assert sensoren["abrufdauer"].native_value == pytest.approx(120.0)
+    assert sensoren["abrufdauer"].extra_state_attributes["anzahl"] == 1
+    assert sensoren["parsedauer"].native_value is None
+    assert sensoren["empfangene_daten"].native_value == 2048
+    assert sensoren["cache_trefferquote"].native_value == 50.0
+    assert sensoren["api_quelle"].native_value == "fallback"
+    assert sensoren["api_quelle"].unique_id == "sensor.schulferien_api_quelle_a"
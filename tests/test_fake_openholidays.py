@@ -0,0 +1,45 @@
+"""Tests für den lokalen OpenHolidays-Ersatz gegen den echten HTTP-Pfad."""
+
+from unittest.mock import patch, MagicMock
+import aiohttp
+import pytest
+from custom_components.schulferien.api_utils import fetch_data
+from custom_components.schulferien.cache import AntwortCache
+from .fake_openholidays import FakeOpenHolidays, Verhalten
+
+PARAMETER = {
+    "countryIsoCode": "DE",
+    "subdivisionCode": "DE-BY",
+    "validFrom": "2024-01-01",
+    "validTo": "2024-12-31",
+}
+
+@pytest.fixture
+def cache():
+    with patch("custom_components.schulferien.cache.Store"):
+        yield AntwortCache(MagicMock())
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_region_wird_gefiltert_und_304_aus_cache_bedient(cache):
+    async with FakeOpenHolidays() as fake, aiohttp.ClientSession() as session:
+        url = fake.url("/SchoolHolidays")
+        erste = await fetch_data(url, PARAMETER, session, cache)
+        zweite = await fetch_data(url, PARAMETER, session, cache)
+
+    assert erste and zweite == erste
+    assert all(eintrag["subdivisions"][0]["code"] == "DE-BY" for eintrag in erste)
+    assert fake.status == {200: 1, 304: 1}
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_fehlerquote_und_latenz_sind_reproduzierbar():
+    async def lauf():
+        async with FakeOpenHolidays(seed=7) as fake, aiohttp.ClientSession() as session:
+            fake.verhalten["/PublicHolidays"] = Verhalten(fehlerquote=0.5, fehlerstatus=500)
+            for _ in range(20):
+                async with session.get(fake.url("/PublicHolidays")) as response:
+                    await response.read()
+        return fake.status
+
+    erster = await lauf()
+    assert erster == await lauf()
+    assert erster[500] and erster[200]
@@ -1,9 +1,11 @@
 """Unit Tests für FeiertagSensor & FeiertagMorgenSensor."""
 
-from unittest.mock import patch, AsyncMock
-from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from datetime import date, datetime
 import pytest
-from homeassistant.core import HomeAssistant
+from custom_components.schulferien.coordinator import SchulferienCoordinator
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+from custom_components.schulferien.tageskalender import Tageskalender
 from custom_components.schulferien.feiertag_sensor import FeiertagSensor, FeiertagMorgenSensor
 
 @pytest.fixture
@@ -11,81 +13,88 @@ def mock_config():
     return {
         "name": "Feiertag Sensor",
         "unique_id": "sensor.feiertag",
-        "land": "DE",
-        "region": "DE-BY",
         "land_name": "Deutschland",
         "region_name": "Bayern",
     }
 
 @pytest.fixture
-def hass():
-    return HomeAssistant()
+def coordinator():
+    return SchulferienCoordinator(MagicMock(), "DE", "DE-BY", "DE")
 
 @pytest.fixture
-def mock_sensor(hass, mock_config):
-    return FeiertagSensor(hass, mock_config)
+def mock_sensor(coordinator, mock_config):
+    return FeiertagSensor(coordinator, mock_config)
 
 @pytest.fixture
-def morgen_sensor(mock_sensor):
-    return FeiertagMorgenSensor(mock_sensor)
-
-@pytest.mark.asyncio
-async def test_initial_attributes(mock_sensor, morgen_sensor):
-    await mock_sensor.async_added_to_hass()
+def morgen_sensor(coordinator):
+    return FeiertagMorgenSensor(coordinator)
 
+def test_initial_attributes(mock_sensor, morgen_sensor):
     assert mock_sensor.name == "Feiertag Sensor"
     assert mock_sensor.unique_id == "sensor.feiertag"
     assert mock_sensor.native_value == "kein_feiertag"
     assert morgen_sensor.native_value == "kein_feiertag"
 
-@pytest.mark.asyncio
 @pytest.mark.parametrize(
-    "mock_data, today, tomorrow_state",
+    "mock_data, today, today_state, tomorrow_state",
     [
         (
             [
-                {
-                    "name": "Morgen-Feiertag",
-                    "start_datum": datetime(2024, 6, 19).date(),
-                    "end_datum": datetime(2024, 6, 19).date()
-                }
+                Zeitraum("Morgen-Feiertag", date(2024, 6, 19), date(2024, 6, 19))
+            ],
+            datetime(2024, 6, 18),
+            "kein_feiertag",
+            "feiertag",
+        ),
+        (
+            [
+                Zeitraum("Heute-Feiertag", date(2024, 6, 18), date(2024, 6, 18))
             ],
             datetime(2024, 6, 18),
             "feiertag",
+            "kein_feiertag",
         ),
         (
             [
-                {
-                    "name": "Nächster Feiertag",
-                    "start_datum": datetime(2024, 6, 25).date(),
-                    "end_datum": datetime(2024, 6, 25).date()
-                }
+                Zeitraum("Nächster Feiertag", date(2024, 6, 25), date(2024, 6, 25))
             ],
             datetime(2024, 6, 18),
             "kein_feiertag",
+            "kein_feiertag",
         )
     ],
 )
-async def test_feiertag_morgen_sensor(mock_sensor, morgen_sensor, mock_data, today, tomorrow_state):
-    with patch("custom_components.schulferien.api_utils.fetch_data", new=AsyncMock(return_value=mock_data)), \
-         patch("custom_components.schulferien.api_utils.parse_daten", return_value=mock_data), \
-         patch("custom_components.schulferien.feiertag_sensor.datetime") as mock_dt:
+def test_feiertag_morgen_sensor(
+    coordinator, mock_sensor, morgen_sensor, mock_data, today, today_state, tomorrow_state
+):
+    coordinator.data["feiertag_index"] = FerienIndex(mock_data)
+    coordinator.data["tageskalender"] = Tageskalender(
+        FerienIndex(), coordinator.data["feiertag_index"], *coordinator.abruf_fenster(today.date())
+    )
+    mock_sensor.verarbeite_feiertags_daten(coordinator.data["feiertag_index"], today.date())
 
+    with patch("custom_components.schulferien.feiertag_sensor.dt_util") as mock_dt:
         mock_dt.now.return_value = today
-        mock_dt.now().date.return_value = today.date()
+        assert mock_sensor.native_value == today_state
+        assert morgen_sensor.native_value == tomorrow_state
 
-        await mock_sensor.async_update()
+def test_attribute_werden_pro_datenstand_und_tag_gemerkt(coordinator, mock_sensor):
+    """Attribute werden nur bei neuem Datenstand oder neuem Tag neu aufgebaut."""
+    coordinator.data["feiertag_index"] = FerienIndex([
+        Zeitraum("Heute-Feiertag", datetime(2024, 6, 18).date(), datetime(2024, 6, 18).date())
+    ])
 
-        assert morgen_sensor.native_value == tomorrow_state
+    with patch("custom_components.schulferien.attribute.dt_util") as mock_dt:
+        mock_dt.now.return_value = datetime(2024, 6, 18)
+        erste = mock_sensor.extra_state_attributes
+        assert mock_sensor.extra_state_attributes is erste
+        assert erste["Name Feiertag"] == "Heute-Feiertag"
+        assert erste["Datum"] == "18.06.2024"
 
-@pytest.mark.asyncio
-async def test_update_error_handling(mock_sensor, morgen_sensor):
-    with patch("custom_components.schulferien.api_utils.fetch_data", new=AsyncMock(side_effect=Exception("API-Fehler"))):
-        await mock_sensor.async_update()
-        assert mock_sensor.native_value == "kein_feiertag"
-        assert morgen_sensor.native_value == "kein_feiertag"
+        coordinator.datenversion += 1
+        assert mock_sensor.extra_state_attributes is not erste
 
-    with patch("custom_components.schulferien.api_utils.fetch_data", new=AsyncMock(return_value=None)):
-        await mock_sensor.async_update()
-        assert mock_sensor.native_value == "kein_feiertag"
-        assert morgen_sensor.native_value == "kein_feiertag"
+        gemerkt = mock_sensor.extra_state_attributes
+        mock_dt.now.return_value = datetime(2024, 6, 19)
+        assert mock_sensor.extra_state_attributes is not gemerkt
+        assert mock_sensor.extra_state_attributes["Name Feiertag"] is None
@@ -0,0 +1,111 @@
+"""Unit Tests für den sortierten FerienIndex."""
+
+from datetime import date
+import pytest
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+
+def _zeitraum(name, start, ende):
+    return Zeitraum(name, start, ende)
+
+@pytest.fixture
+def index():
+    return FerienIndex([
+        _zeitraum("Sommerferien", date(2024, 7, 29), date(2024, 9, 9)),
+        _zeitraum("Pfingstferien", date(2024, 5, 21), date(2024, 6, 1)),
+        _zeitraum("Brückentag", date(2024, 8, 16), date(2024, 8, 16)),
+        _zeitraum("Herbstferien", date(2024, 10, 28), date(2024, 10, 31)),
+    ])
+
+def test_zeitraeume_sind_sortiert(index):
+    assert [z.name for z in index] == [
+        "Pfingstferien", "Sommerferien", "Brückentag", "Herbstferien"
+    ]
+
+@pytest.mark.parametrize(
+    "datum, erwartet",
+    [
+        (date(2024, 5, 20), None),
+        (date(2024, 5, 21), "Pfingstferien"),
+        (date(2024, 6, 1), "Pfingstferien"),
+        (date(2024, 8, 16), "Sommerferien"),
+        (date(2024, 8, 17), "Sommerferien"),
+        (date(2024, 9, 10), None),
+        (date(2024, 12, 24), None),
+    ],
+)
+def test_finde(index, datum, erwartet):
+    treffer = index.finde(datum)
+    assert (treffer.name if treffer else None) == erwartet
+    assert index.enthaelt(datum) is (erwartet is not None)
+
+def test_ueberlappung_nach_langem_zeitraum():
+    """Ein kurzer Zeitraum innerhalb eines langen verdeckt das Ende nicht."""
+    index = FerienIndex([
+        _zeitraum("Lang", date(2024, 1, 1), date(2024, 12, 31)),
+        _zeitraum("Kurz", date(2024, 3, 1), date(2024, 3, 2)),
+    ])
+    assert index.finde(date(2024, 6, 1)).name == "Lang"
+    assert index.enthaelt(date(2024, 6, 1))
+
+@pytest.mark.parametrize(
+    "datum, erwartet",
+    [
+        (date(2024, 1, 1), "Pfingstferien"),
+        (date(2024, 5, 21), "Sommerferien"),
+        (date(2024, 8, 1), "Brückentag"),
+        (date(2024, 10, 28), None),
+    ],
+)
+def test_naechster_nach(index, datum, erwartet):
+    treffer = index.naechster_nach(datum)
+    assert (treffer.name if treffer else None) == erwartet
+
+def test_leerer_index():
+    index = FerienIndex()
+    assert len(index) == 0
+    assert index.finde(date(2024, 1, 1)) is None
+    assert not index.enthaelt(date(2024, 1, 1))
+    assert index.naechster_nach(date(2024, 1, 1)) is None
+
+def test_spalten_und_namenstabelle():
+    """Gleiche Namen werden nur einmal gespeichert, Positionen liefern Zeiträume."""
+    index = FerienIndex([
+        _zeitraum("Brückentag", date(2024, 10, 4), date(2024, 10, 4)),
+        _zeitraum("Brückentag", date(2024, 5, 10), date(2024, 5, 10)),
+    ])
+
+    assert index[0] == _zeitraum("Brückentag", date(2024, 5, 10), date(2024, 5, 10))
+    assert index[-1].start_datum == date(2024, 10, 4)
+    assert list(index.intervalle()) == [
+        (date(2024, 5, 10).toordinal(), date(2024, 5, 10).toordinal(), "Brückentag"),
+        (date(2024, 10, 4).toordinal(), date(2024, 10, 4).toordinal(), "Brückentag"),
+    ]
+    assert index[0].name is index[1].name
+    with pytest.raises(IndexError):
+        index[2]
+
+@pytest.mark.parametrize(
+    "start, ende, erwartet",
+    [
+        (date(2024, 1, 1), date(2024, 5, 20), []),
+        (date(2024, 6, 1), date(2024, 6, 30), ["Pfingstferien"]),
+        (date(2024, 8, 17), date(2024, 8, 31), ["Sommerferien"]),
+        (date(2024, 8, 1), date(2024, 10, 28), ["Sommerferien", "Brückentag", "Herbstferien"]),
+        (date(2024, 11, 1), date(2024, 12, 31), []),
+    ],
+)
+def test_im_bereich(index, start, ende, erwartet):
+    assert [z.name for z in index.im_bereich(start, ende)] == erwartet
+
+def test_im_bereich_entspricht_vollstaendiger_suche():
+    zeitraeume = [
+        _zeitraum(f"Z{nummer}", date.fromordinal(738000 + nummer * 3),
+                  date.fromordinal(738000 + nummer * 3 + nummer % 17))
+        for nummer in range(200)
+    ]
+    index = FerienIndex(zeitraeume)
+    for start_ordinal in range(737990, 738650, 7):
+        start, ende = date.fromordinal(start_ordinal), date.fromordinal(start_ordinal + 30)
+        assert index.im_bereich(start, ende) == [
+            z for z in index if z.start_datum <= ende and z.end_datum >= start
+        ]
@@ -0,0 +1,132 @@
+"""Unit Tests für den iCalendar-Feed."""
+
+from datetime import date, datetime, timezone
+from unittest.mock import MagicMock
+import pytest
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from custom_components.schulferien.const import DOMAIN, ICS_TOKEN
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+from custom_components.schulferien.ics import (
+    IcsFeed,
+    _falte,
+    async_registriere_ics_view,
+    async_sichere_ics_token,
+    erzeuge_termin,
+    etag_passt,
+    ics_pfad,
+)
+
+def _coordinator(ferien, feiertage=()):
+    coordinator = MagicMock()
+    coordinator.schluessel = ("DE", "DE-BY", "DE")
+    coordinator.datenversion = 1
+    coordinator.data = {
+        "ferien_index": FerienIndex(ferien), "feiertag_index": FerienIndex(feiertage)
+    }
+    return coordinator
+
+SOMMER = Zeitraum("Sommerferien", date(2024, 7, 29), date(2024, 9, 9))
+EINHEIT = Zeitraum("Tag der Deutschen Einheit", date(2024, 10, 3), date(2024, 10, 3))
+BRUECKE = Zeitraum("Brückentag", date(2024, 10, 4), date(2024, 10, 4))
+
+def test_termin_ist_ganztaegig_mit_exklusivem_ende():
+    termin = erzeuge_termin(
+        Zeitraum("Herbst, Buß; Bettag", date(2024, 10, 28), date(2024, 10, 31)),
+        "Schulferien", "DE-BY", datetime(2024, 6, 18, 3, tzinfo=timezone.utc),
+    )
+
+    assert termin.endswith("END:VEVENT\r\n")
+    assert "DTSTART;VALUE=DATE:20241028\r\n" in termin
+    assert "DTEND;VALUE=DATE:20241101\r\n" in termin
+    assert "DTSTAMP:20240618T030000Z\r\n" in termin
+    assert "SUMMARY:Herbst\\, Buß\\; Bettag\r\n" in termin
+
+def test_lange_zeilen_werden_nach_75_oktetten_gefaltet():
+    zeile = "SUMMARY:" + "ä" * 60
+    gefaltet = _falte(zeile)
+
+    assert all(len(teil.encode()) <= 75 for teil in gefaltet.split("\r\n"))
+    assert gefaltet.replace("\r\n ", "") == zeile
+
+def test_feed_wird_nur_bei_neuer_datenversion_erzeugt():
+    coordinator = _coordinator([SOMMER, BRUECKE], [EINHEIT])
+    feed = IcsFeed("Schulferien - Bayern", "DE-BY")
+
+    assert feed.aktualisiere(coordinator)
+    body, etag = feed.body, feed.etag
+    assert body.count(b"BEGIN:VEVENT") == 3
+    assert b"CATEGORIES:Br\xc3\xbcckentag" in body
+    assert not feed.aktualisiere(coordinator)
+
+    # Neue Version mit denselben Zeiträumen: gleicher Inhalt, gleicher ETag
+    coordinator.datenversion = 2
+    assert feed.aktualisiere(coordinator)
+    assert (feed.body, feed.etag) == (body, etag)
+
+    coordinator.datenversion = 3
+    coordinator.data["ferien_index"] = FerienIndex([SOMMER])
+    feed.aktualisiere(coordinator)
+    assert feed.etag != etag
+    assert feed.body.count(b"BEGIN:VEVENT") == 2
+
+def test_etag_vergleich():
+    assert etag_passt('"abc"', '"abc"')
+    assert etag_passt('"x", W/"abc"', '"abc"')
+    assert etag_passt("*", '"abc"')
+    assert not etag_passt('"abd"', '"abc"')
+    assert not etag_passt(None, '"abc"')
+
+@pytest.mark.asyncio
+async def test_view_liefert_feed_und_304(hass, hass_client_no_auth):
+    assert await async_setup_component(hass, "http", {})
+    entry = MockConfigEntry(
+        domain=DOMAIN, title="Schulferien - Bayern", data={ICS_TOKEN: "geheim"}
+    )
+    entry.add_to_hass(hass)
+    hass.data[DOMAIN] = {entry.entry_id: _coordinator([SOMMER], [EINHEIT])}
+    async_registriere_ics_view(hass)
+    client = await hass_client_no_auth()
+
+    antwort = await client.get(f"/api/schulferien/{entry.entry_id}/geheim.ics")
+    assert antwort.status == 200
+    assert antwort.content_type == "text/calendar"
+    assert "X-WR-CALNAME:Schulferien - Bayern" in await antwort.text()
+    etag = antwort.headers["ETag"]
+
+    antwort = await client.get(
+        f"/api/schulferien/{entry.entry_id}/geheim.ics", headers={"If-None-Match": etag}
+    )
+    assert antwort.status == 304
+    assert antwort.headers["ETag"] == etag
+
+    antwort = await client.get("/api/schulferien/unbekannt/geheim.ics")
+    assert antwort.status == 404
+
+@pytest.mark.asyncio
+async def test_view_verlangt_token(hass, hass_client_no_auth):
+    """Die Entry-ID allein oder mit falschem Token liefert keinen Feed."""
+    assert await async_setup_component(hass, "http", {})
+    entry = MockConfigEntry(domain=DOMAIN, title="Schulferien - Bayern", data={})
+    entry.add_to_hass(hass)
+    hass.data[DOMAIN] = {entry.entry_id: _coordinator([SOMMER])}
+    async_registriere_ics_view(hass)
+    client = await hass_client_no_auth()
+
+    # Entries ohne Token liefern nie einen Feed
+    assert (await client.get(f"/api/schulferien/{entry.entry_id}/.ics")).status == 404
+
+    async_sichere_ics_token(hass, entry)
+    token = entry.data[ICS_TOKEN]
+    async_sichere_ics_token(hass, entry)
+    assert entry.data[ICS_TOKEN] == token
+    assert len(token) >= 32
+
+    for pfad in (
+        f"/api/schulferien/{entry.entry_id}.ics",
+        f"/api/schulferien/{entry.entry_id}/falsch.ics",
+    ):
+        assert (await client.get(pfad)).status == 404
+    antwort = await client.get(ics_pfad(entry))
+    assert antwort.status == 200
+    assert antwort.headers["Cache-Control"].startswith("private")
@@ -0,0 +1,84 @@
+"""Unit Tests für den Katalog der Länder und Regionen."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+import aiohttp
+import pytest
+from homeassistant.util import dt as dt_util
+from custom_components.schulferien import katalog as katalog_modul
+from custom_components.schulferien.katalog import (
+    KatalogCache,
+    async_lade_laender,
+    async_lade_regionen,
+    regionen_schluessel,
+)
+from .fake_openholidays import FakeOpenHolidays
+
+SCHLUESSEL = regionen_schluessel("DE", "DE")
+REGIONEN = {"DE-BY": "Bayern"}
+
+@pytest.fixture
+def katalog(hass):
+    with patch("custom_components.schulferien.cache.Store"):
+        yield KatalogCache(hass)
+
+def _abruf(*antworten):
+    """Erstellt eine Abruf-Funktion, die die Antworten nacheinander liefert."""
+    aufrufe = []
+
+    async def abrufen():
+        aufrufe.append(1)
+        await asyncio.sleep(0)
+        return antworten[len(aufrufe) - 1]
+
+    return abrufen, aufrufe
+
+async def test_gleichzeitige_flows_teilen_einen_abruf(katalog):
+    abrufen, aufrufe = _abruf(REGIONEN)
+
+    ergebnisse = await asyncio.gather(
+        katalog.async_hole(SCHLUESSEL, abrufen), katalog.async_hole(SCHLUESSEL, abrufen)
+    )
+    nochmal = await katalog.async_hole(SCHLUESSEL, abrufen)
+
+    assert ergebnisse == [REGIONEN, REGIONEN]
+    assert nochmal == REGIONEN
+    assert len(aufrufe) == 1
+
+async def test_abgelaufene_liste_wird_erneuert_und_bei_fehler_weiterverwendet(katalog):
+    abrufen, aufrufe = _abruf(REGIONEN, {}, {"DE-NW": "Nordrhein-Westfalen"})
+    await katalog.async_hole(SCHLUESSEL, abrufen)
+    spaeter = dt_util.now() + timedelta(days=8)
+
+    with patch("custom_components.schulferien.katalog.dt_util.now", return_value=spaeter):
+        assert katalog.hole(SCHLUESSEL) is None
+        assert await katalog.async_hole(SCHLUESSEL, abrufen) == REGIONEN
+        assert await katalog.async_hole(SCHLUESSEL, abrufen) == {"DE-NW": "Nordrhein-Westfalen"}
+
+    assert len(aufrufe) == 3
+
+async def test_vorabruf_wird_vom_regionsschritt_uebernommen(katalog, hass):
+    abrufen, aufrufe = _abruf(REGIONEN)
+
+    katalog.starte_vorabruf(SCHLUESSEL, abrufen)
+    katalog.starte_vorabruf(SCHLUESSEL, abrufen)
+    assert await katalog.async_hole(SCHLUESSEL, abrufen) == REGIONEN
+    await hass.async_block_till_done()
+    katalog.starte_vorabruf(SCHLUESSEL, abrufen)
+
+    assert len(aufrufe) == 1
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_listen_von_der_api(monkeypatch):
+    async with FakeOpenHolidays() as fake, aiohttp.ClientSession() as session:
+        for konstante, url in fake.konstanten().items():
+            if hasattr(katalog_modul, konstante):
+                monkeypatch.setattr(katalog_modul, konstante, url)
+        laender = await async_lade_laender(session, "DE")
+        regionen = await async_lade_regionen(session, "DE", "DE")
+
+    assert laender == {"DE": "Deutschland", "AT": "Österreich"}
+    assert regionen["DE-BY"] == "Bayern"
+    assert len(regionen) == 16
+    assert fake.anfragen == {"/Countries": 1, "/Subdivisions": 1}
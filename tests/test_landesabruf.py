@@ -0,0 +1,68 @@
+"""Unit Tests für den landesweiten Abruf und die Verteilung auf Regionen."""
+
+import asyncio
+from datetime import date
+import pytest
+from custom_components.schulferien.landesabruf import LandesAbruf, verteile_auf_regionen
+
+BUNDESWEIT = {"name": [{"text": "Neujahr"}], "nationwide": True}
+BAYERN = {"name": [{"text": "Pfingstferien"}], "subdivisions": [{"code": "DE-BY"}]}
+ZWEI_LAENDER = {
+    "name": [{"text": "Sommerferien"}],
+    "subdivisions": [{"code": "DE-BY"}, {"code": "DE-NW"}],
+}
+KANTON = {"name": [{"text": "Herbstferien"}], "subdivisions": [{"code": "CH-BE"}]}
+
+def test_verteilung_nach_unterteilung():
+    """Landesweite Einträge gehen an alle Regionen, regionale nur an ihre."""
+    verteilung = verteile_auf_regionen(
+        [BUNDESWEIT, BAYERN, ZWEI_LAENDER], ["DE-BY", "DE-NW", "DE-HE"]
+    )
+
+    assert verteilung["DE-BY"] == [BUNDESWEIT, BAYERN, ZWEI_LAENDER]
+    assert verteilung["DE-NW"] == [BUNDESWEIT, ZWEI_LAENDER]
+    assert verteilung["DE-HE"] == [BUNDESWEIT]
+
+def test_verteilung_uebergeordnete_unterteilung():
+    """Einträge einer übergeordneten Unterteilung gelten auch für die untergeordnete."""
+    verteilung = verteile_auf_regionen([KANTON], ["CH-BE-BI", "CH-ZH"])
+
+    assert verteilung == {"CH-BE-BI": [KANTON], "CH-ZH": []}
+
+@pytest.mark.asyncio
+async def test_gleichzeitige_regionen_teilen_einen_abruf():
+    """Mehrere Regionen warten auf denselben Abruf und erhalten ihren Anteil."""
+    abruf = LandesAbruf("DE", "DE")
+    aufrufe = []
+
+    async def abrufen():
+        aufrufe.append(1)
+        await asyncio.sleep(0.01)
+        return [BAYERN, ZWEI_LAENDER], [BUNDESWEIT]
+
+    heute = date(2024, 6, 18)
+    regionen = ["DE-BY", "DE-NW"]
+    bayern, nrw = await asyncio.gather(
+        abruf.async_hole(heute, "DE-BY", regionen, abrufen),
+        abruf.async_hole(heute, "DE-NW", regionen, abrufen),
+    )
+    hessen = await abruf.async_hole(heute, "DE-HE", regionen, abrufen)
+
+    assert len(aufrufe) == 1
+    assert bayern == ([BAYERN, ZWEI_LAENDER], [BUNDESWEIT])
+    assert nrw == ([ZWEI_LAENDER], [BUNDESWEIT])
+    assert hessen == ([], [BUNDESWEIT])
+
+@pytest.mark.asyncio
+async def test_unvollstaendiger_abruf_wird_wiederholt():
+    """Fehlt ein Datensatz, fragt der nächste Aufruf am selben Tag erneut an."""
+    abruf = LandesAbruf("DE", "DE")
+    antworten = [(None, [BUNDESWEIT]), ([BAYERN], [BUNDESWEIT])]
+
+    async def abrufen():
+        return antworten.pop(0)
+
+    heute = date(2024, 6, 18)
+    assert await abruf.async_hole(heute, "DE-BY", ["DE-BY"], abrufen) == (None, [BUNDESWEIT])
+    assert await abruf.async_hole(heute, "DE-BY", ["DE-BY"], abrufen) == ([BAYERN], [BUNDESWEIT])
+    assert not antworten
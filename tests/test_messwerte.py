@@ -0,0 +1,51 @@
+"""Unit Tests für die Laufzeitmessungen."""
+
+from unittest.mock import patch
+from custom_components.schulferien.messwerte import Histogramm, Messwerte
+
+def test_histogramm_verteilt_auf_eimer():
+    histogramm = Histogramm(grenzen=(1, 10))
+
+    for sekunden in (0.0005, 0.001, 0.005, 0.5):
+        histogramm.erfasse(sekunden)
+
+    werte = histogramm.als_dict()
+    assert werte["eimer"] == {"<=1": 2, "<=10": 1, "inf": 1}
+    assert werte["anzahl"] == 4
+    assert werte["letzte_ms"] == 500.0
+    assert werte["maximum_ms"] == 500.0
+    assert werte["mittel_ms"] == 126.625
+
+def test_messe_erfasst_auch_bei_fehlern():
+    messwerte = Messwerte()
+
+    with patch(
+        "custom_components.schulferien.messwerte.time.perf_counter", side_effect=[1.0, 1.25]
+    ):
+        try:
+            with messwerte.messe("parsen"):
+                raise ValueError
+        except ValueError:
+            pass
+
+    assert messwerte.histogramme["parsen"].letzte_ms == 250.0
+
+def test_zaehler_und_quellen():
+    messwerte = Messwerte()
+    messwerte.zaehle_bytes(100)
+    messwerte.beginne_aktualisierung()
+    messwerte.zaehle_bytes(50)
+    messwerte.zaehle_eintraege(3)
+    messwerte.melde_cache(treffer=True)
+    messwerte.melde_cache(treffer=False)
+    messwerte.melde_cache(treffer=True)
+    messwerte.melde_quelle("https://a", primaer=True)
+    messwerte.melde_quelle("https://b", primaer=False)
+
+    werte = messwerte.als_dict()
+    assert werte["bytes_empfangen"] == 150
+    assert werte["bytes_letzte_aktualisierung"] == 50
+    assert werte["eintraege_letzte_aktualisierung"] == 3
+    assert werte["cache_trefferquote"] == 66.7
+    assert werte["letzte_quelle"] == "fallback"
+    assert werte["quellen"] == {"https://a": 1, "https://b": 1}
@@ -1,9 +1,11 @@
 """Unit Tests für SchulferienSensor & SchulferienMorgenSensor."""
 
-from unittest.mock import patch, AsyncMock
-from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from datetime import date, datetime
 import pytest
-from homeassistant.core import HomeAssistant
+from custom_components.schulferien.coordinator import SchulferienCoordinator
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+from custom_components.schulferien.tageskalender import Tageskalender
 from custom_components.schulferien.schulferien_sensor import SchulferienSensor, SchulferienMorgenSensor
 
 @pytest.fixture
@@ -11,44 +13,34 @@ def mock_config():
     return {
         "name": "Schulferien Sensor",
         "unique_id": "sensor.schulferien",
-        "land": "DE",
-        "region": "DE-BY",
         "land_name": "Deutschland",
         "region_name": "Bayern",
-        "brueckentage": [],
     }
 
 @pytest.fixture
-def hass():
-    return HomeAssistant()
+def coordinator():
+    return SchulferienCoordinator(MagicMock(), "DE", "DE-BY", "DE")
 
 @pytest.fixture
-def mock_sensor(hass, mock_config):
-    return SchulferienSensor(hass, mock_config)
+def mock_sensor(coordinator, mock_config):
+    return SchulferienSensor(coordinator, mock_config)
 
 @pytest.fixture
-def morgen_sensor(mock_sensor):
-    return SchulferienMorgenSensor(mock_sensor)
+def morgen_sensor(coordinator):
+    return SchulferienMorgenSensor(coordinator)
 
-@pytest.mark.asyncio
-async def test_initial_attributes(mock_sensor, morgen_sensor):
-    await mock_sensor.async_added_to_hass()
+def test_initial_attributes(mock_sensor, morgen_sensor):
     assert mock_sensor.name == "Schulferien Sensor"
     assert mock_sensor.unique_id == "sensor.schulferien"
     assert mock_sensor.native_value == "kein_ferientag"
     assert morgen_sensor.native_value == "kein_ferientag"
 
-@pytest.mark.asyncio
 @pytest.mark.parametrize(
     "mock_data, today, expected_today, expected_morgen",
     [
         (
             [
-                {
-                    "name": "Pfingstferien",
-                    "start_datum": datetime(2024, 6, 18).date(),
-                    "end_datum": datetime(2024, 6, 20).date()
-                },
+                Zeitraum("Pfingstferien", date(2024, 6, 18), date(2024, 6, 20)),
             ],
             datetime(2024, 6, 18),
             "ferientag",
@@ -56,11 +48,7 @@ async def test_initial_attributes(mock_sensor, morgen_sensor):
         ),
         (
             [
-                {
-                    "name": "Sommerferien",
-                    "start_datum": datetime(2024, 6, 25).date(),
-                    "end_datum": datetime(2024, 9, 1).date()
-                },
+                Zeitraum("Sommerferien", datetime(2024, 6, 25).date(), datetime(2024, 9, 1).date()),
             ],
             datetime(2024, 6, 18),
             "kein_ferientag",
@@ -68,11 +56,7 @@ async def test_initial_attributes(mock_sensor, morgen_sensor):
         ),
         (
             [
-                {
-                    "name": "Kurzferien",
-                    "start_datum": datetime(2024, 6, 19).date(),
-                    "end_datum": datetime(2024, 6, 21).date()
-                },
+                Zeitraum("Kurzferien", datetime(2024, 6, 19).date(), datetime(2024, 6, 21).date()),
             ],
             datetime(2024, 6, 18),
             "kein_ferientag",
@@ -80,27 +64,34 @@ async def test_initial_attributes(mock_sensor, morgen_sensor):
         ),
     ]
 )
-async def test_update(mock_sensor, morgen_sensor, mock_data, today, expected_today, expected_morgen):
-    with patch("custom_components.schulferien.api_utils.fetch_data", new=AsyncMock(return_value=mock_data)), \
-         patch("custom_components.schulferien.api_utils.parse_daten", return_value=mock_data), \
-         patch("custom_components.schulferien.schulferien_sensor.datetime") as mock_dt:
+def test_update(
+    coordinator, mock_sensor, morgen_sensor, mock_data, today, expected_today, expected_morgen
+):
+    coordinator.data["ferien_index"] = FerienIndex(mock_data)
+    coordinator.data["tageskalender"] = Tageskalender(
+        coordinator.data["ferien_index"], FerienIndex(), *coordinator.abruf_fenster(today.date())
+    )
+    mock_sensor.verarbeite_ferien_daten(coordinator.data["ferien_index"], today.date())
 
+    with patch("custom_components.schulferien.schulferien_sensor.dt_util") as mock_dt:
         mock_dt.now.return_value = today
-        mock_dt.now().date.return_value = today.date()
-
-        await mock_sensor.async_update()
-
         assert mock_sensor.native_value == expected_today
         assert morgen_sensor.native_value == expected_morgen
 
-@pytest.mark.asyncio
-async def test_update_error_handling(mock_sensor, morgen_sensor):
-    with patch("custom_components.schulferien.api_utils.fetch_data", new=AsyncMock(side_effect=Exception("API-Fail"))):
-        await mock_sensor.async_update()
-        assert mock_sensor.native_value == "kein_ferientag"
-        assert morgen_sensor.native_value == "kein_ferientag"
+def test_attribute_naechste_ferien(coordinator, mock_sensor):
+    ferien_liste = [
+        Zeitraum("Sommerferien", datetime(2024, 7, 29).date(), datetime(2024, 9, 9).date()),
+    ]
+    coordinator.data["ferien_index"] = FerienIndex(ferien_liste)
+    mock_sensor.verarbeite_ferien_daten(
+        coordinator.data["ferien_index"], datetime(2024, 6, 18).date()
+    )
+
+    with patch("custom_components.schulferien.schulferien_sensor.dt_util") as mock_dt:
+        mock_dt.now.return_value = datetime(2024, 6, 18)
+        attribute = mock_sensor.extra_state_attributes
 
-    with patch("custom_components.schulferien.api_utils.fetch_data", new=AsyncMock(return_value=None)):
-        await mock_sensor.async_update()
-        assert mock_sensor.native_value == "kein_ferientag"
-        assert morgen_sensor.native_value == "kein_ferientag"
+    assert attribute["Name der Ferien"] == "Sommerferien"
+    assert attribute["Beginn"] == "29.07.2024"
+    assert attribute["Ende"] == "09.09.2024"
+    assert attribute["Region"] == "Bayern"
@@ -0,0 +1,98 @@
+"""Unit Tests für die Dienste der Schulferien-Integration."""
+
+import pstats
+import tracemalloc
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from custom_components.schulferien.const import DOMAIN
+from custom_components.schulferien.coordinator import SchulferienCoordinator
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+from custom_components.schulferien.services import async_entferne_dienste, async_registriere_dienste
+from custom_components.schulferien.tageskalender import Tageskalender
+
+def _coordinator():
+    coordinator = SchulferienCoordinator(MagicMock(), "DE", "DE-BY", "DE")
+    coordinator.data["ferien_index"] = FerienIndex([
+        Zeitraum("Herbstferien", date(2024, 10, 28), date(2024, 10, 31)),
+        Zeitraum("Brückentag", date(2024, 10, 4), date(2024, 10, 4)),
+    ])
+    coordinator.data["feiertag_index"] = FerienIndex([
+        Zeitraum("Tag der Deutschen Einheit", date(2024, 10, 3), date(2024, 10, 3)),
+    ])
+    coordinator.data["tageskalender"] = Tageskalender(
+        coordinator.data["ferien_index"], coordinator.data["feiertag_index"],
+        date(2024, 9, 1), date(2024, 12, 31),
+    )
+    return coordinator
+
+@pytest.fixture
+def dienste(hass):
+    coordinator = _coordinator()
+    hass.data[DOMAIN] = {
+        "coordinators": {coordinator.schluessel: coordinator}, "eintrag": coordinator
+    }
+    async_registriere_dienste(hass)
+    yield hass
+    hass.data[DOMAIN]["coordinators"].clear()
+    async_entferne_dienste(hass)
+
+async def _rufe(hass, dienst, **daten):
+    return await hass.services.async_call(
+        DOMAIN, dienst, daten, blocking=True, return_response=True
+    )
+
+@pytest.mark.asyncio
+async def test_tag_abfragen(dienste):
+    antwort = await _rufe(dienste, "query_day", datum="2024-10-04")
+
+    assert antwort == {
+        "datum": "2024-10-04",
+        "schulferien": True,
+        "feiertag": False,
+        "brueckentag": True,
+        "wochenende": False,
+        "frei": True,
+        "ferien_name": "Brückentag",
+        "feiertag_name": None,
+    }
+
+@pytest.mark.asyncio
+async def test_schultage_zaehlen(dienste):
+    antwort = await _rufe(
+        dienste, "count_school_days", entry_id="eintrag", von="2024-10-01", bis="2024-10-31"
+    )
+
+    # 23 Werktage, davon Feiertag, Brückentag und vier Herbstferientage frei
+    assert antwort == {"von": "2024-10-01", "bis": "2024-10-31", "schultage": 17, "freie_tage": 14}
+
+@pytest.mark.asyncio
+async def test_naechster_schultag(dienste):
+    antwort = await _rufe(dienste, "next_school_day", datum="2024-10-02")
+
+    assert antwort == {"datum": "2024-10-07"}
+
+@pytest.mark.asyncio
+async def test_ungueltige_aufrufe(dienste):
+    with pytest.raises(ServiceValidationError):
+        await _rufe(dienste, "count_school_days", von="2024-01-01", bis="2024-10-31")
+    with pytest.raises(ServiceValidationError):
+        await _rufe(dienste, "count_school_days", von="2024-10-31", bis="2024-10-01")
+    with pytest.raises(ServiceValidationError):
+        await _rufe(dienste, "query_day", entry_id="unbekannt")
+
+@pytest.mark.asyncio
+async def test_profile_refresh_schreibt_profil(dienste, tmp_path):
+    dienste.config.config_dir = str(tmp_path)
+    coordinator = dienste.data[DOMAIN]["eintrag"]
+    coordinator.async_refresh = AsyncMock()
+
+    antwort = await _rufe(dienste, "profile_refresh", allokationen=5)
+
+    coordinator.async_refresh.assert_awaited_once_with(erzwingen=True)
+    assert pstats.Stats(antwort["profil"]).total_calls > 0
+    with open(antwort["allokationen"], encoding="utf-8") as datei:
+        assert datei.readline() == "Standort: ('DE', 'DE-BY', 'DE')\n"
+    assert len(antwort["groesste_allokationen"]) <= 5
+    assert not tracemalloc.is_tracing()
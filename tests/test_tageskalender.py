@@ -0,0 +1,135 @@
+"""Unit Tests für den Tageskalender mit Statusbits."""
+
+from datetime import date
+import pytest
+from custom_components.schulferien.ferien_index import FerienIndex, Zeitraum
+from custom_components.schulferien.tageskalender import (
+    Tageskalender,
+    SCHULFERIEN,
+    FEIERTAG,
+    BRUECKENTAG,
+    WOCHENENDE,
+)
+
+def _zeitraum(name, start, ende):
+    return Zeitraum(name, start, ende)
+
+FERIEN = FerienIndex([
+    _zeitraum("Pfingstferien", date(2024, 5, 21), date(2024, 6, 1)),
+    _zeitraum("Brückentag", date(2024, 10, 4), date(2024, 10, 4)),
+])
+FEIERTAGE = FerienIndex([
+    _zeitraum("Tag der Deutschen Einheit", date(2024, 10, 3), date(2024, 10, 3)),
+])
+
+@pytest.fixture
+def kalender():
+    return Tageskalender(FERIEN, FEIERTAGE, date(2024, 5, 1), date(2024, 10, 31))
+
+def test_laenge(kalender):
+    assert len(kalender) == 184
+
+@pytest.mark.parametrize(
+    "datum, erwartet",
+    [
+        (date(2024, 5, 20), 0),
+        (date(2024, 5, 21), SCHULFERIEN),
+        (date(2024, 6, 1), SCHULFERIEN | WOCHENENDE),
+        (date(2024, 6, 2), WOCHENENDE),
+        (date(2024, 10, 3), FEIERTAG),
+        (date(2024, 10, 4), SCHULFERIEN | BRUECKENTAG),
+        (date(2024, 10, 5), WOCHENENDE),
+    ],
+)
+def test_status(kalender, datum, erwartet):
+    assert kalender.status(datum) == erwartet
+
+def test_ausserhalb_des_fensters_wie_innerhalb(kalender):
+    """Außerhalb des Fensters liefert der Rückgriff auf die Indizes dieselben Bits."""
+    ohne_fenster = Tageskalender(FERIEN, FEIERTAGE)
+    for datum in (date(2024, 5, 21), date(2024, 6, 1), date(2024, 10, 3), date(2024, 10, 7)):
+        assert ohne_fenster.status(datum) == kalender.status(datum)
+
+def test_ist_frei(kalender):
+    assert kalender.ist_frei(date(2024, 10, 3))
+    assert kalender.ist_frei(date(2024, 10, 5))
+    assert not kalender.ist_frei(date(2024, 10, 7))
+
+FEIERTAGE_2025 = FerienIndex([
+    _zeitraum("Tag der Arbeit", date(2025, 5, 1), date(2025, 5, 1)),
+    _zeitraum("Christi Himmelfahrt", date(2025, 5, 29), date(2025, 5, 29)),
+    _zeitraum("Pfingstmontag", date(2025, 6, 9), date(2025, 6, 9)),
+    _zeitraum("Tag der Deutschen Einheit", date(2025, 10, 3), date(2025, 10, 3)),
+])
+PFINGSTFERIEN_2025 = FerienIndex([
+    _zeitraum("Pfingstferien", date(2025, 5, 26), date(2025, 6, 6)),
+])
+
+def test_brueckentage_freitag_nach_donnerstag():
+    """Freitage nach Feiertagen am Donnerstag werden Brückentage, Montagsfeiertage nicht."""
+    kalender = Tageskalender(FerienIndex(), FEIERTAGE_2025, date(2025, 4, 1), date(2025, 10, 31))
+
+    assert kalender.berechne_brueckentage() == [date(2025, 5, 2), date(2025, 5, 30)]
+
+def test_brueckentage_montag_vor_dienstag_und_laengere_luecken():
+    feiertage = FerienIndex([
+        _zeitraum("Tag der Deutschen Einheit", date(2023, 10, 3), date(2023, 10, 3)),
+        _zeitraum("Tag der Arbeit", date(2024, 5, 1), date(2024, 5, 1)),
+    ])
+    kalender = Tageskalender(FerienIndex(), feiertage, date(2023, 9, 1), date(2024, 5, 31))
+
+    assert kalender.berechne_brueckentage() == [date(2023, 10, 2)]
+    assert kalender.berechne_brueckentage(max_luecke=2) == [
+        date(2023, 10, 2),
+        date(2024, 4, 29), date(2024, 4, 30), date(2024, 5, 2), date(2024, 5, 3),
+    ]
+
+def test_brueckentage_nur_in_der_schulzeit():
+    kalender = Tageskalender(
+        PFINGSTFERIEN_2025, FEIERTAGE_2025, date(2025, 4, 1), date(2025, 10, 31)
+    )
+
+    assert kalender.berechne_brueckentage() == [date(2025, 5, 2), date(2025, 5, 30)]
+    assert kalender.berechne_brueckentage(nur_schulzeit=True) == [date(2025, 5, 2)]
+
+def test_berechnete_brueckentage_werden_markiert():
+    ferien = FerienIndex([
+        _zeitraum("Brückentag (berechnet)", date(2024, 10, 4), date(2024, 10, 4))
+    ])
+    kalender = Tageskalender(ferien, FEIERTAGE, date(2024, 10, 1), date(2024, 10, 31))
+
+    assert kalender.status(date(2024, 10, 4)) == SCHULFERIEN | BRUECKENTAG
+
+def test_schultage_entsprechen_zaehlung_pro_tag(kalender):
+    for von_ordinal in range(date(2024, 5, 1).toordinal(), date(2024, 10, 31).toordinal(), 9):
+        von = date.fromordinal(von_ordinal)
+        for laenge in (0, 1, 6, 30, 100):
+            bis = date.fromordinal(min(von_ordinal + laenge, date(2024, 10, 31).toordinal()))
+            erwartet = sum(
+                not kalender.ist_frei(date.fromordinal(tag))
+                for tag in range(von_ordinal, bis.toordinal() + 1)
+            )
+            assert kalender.schultage(von, bis) == erwartet
+
+def test_schultage_um_den_brueckentag(kalender):
+    # Mo, Di, Mi Schule, Do Feiertag, Fr Brückentag
+    assert kalender.schultage(date(2024, 9, 30), date(2024, 10, 6)) == 3
+    assert kalender.schultage(date(2024, 10, 6), date(2024, 9, 30)) == 0
+
+@pytest.mark.parametrize(
+    "datum, erwartet",
+    [
+        (date(2024, 10, 2), date(2024, 10, 7)),
+        (date(2024, 5, 20), date(2024, 6, 3)),
+        (date(2024, 6, 3), date(2024, 6, 4)),
+        (date(2024, 10, 31), None),
+    ],
+)
+def test_naechster_schultag(kalender, datum, erwartet):
+    assert kalender.naechster_schultag(datum) == erwartet
+
+def test_abfragen_ausserhalb_des_zeitraums(kalender):
+    with pytest.raises(ValueError):
+        kalender.schultage(date(2024, 4, 1), date(2024, 5, 10))
+    with pytest.raises(ValueError):
+        kalender.naechster_schultag(date(2024, 11, 1))